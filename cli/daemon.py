@@ -0,0 +1,39 @@
+import argparse, sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.service.daemon import SolverDaemon
+from src.service.server import make_server
+
+def main():
+    ap = argparse.ArgumentParser(description="Long-lived solver daemon with warm worker processes")
+    ap.add_argument("--socket", help="serve JSON lines on this Unix socket path (instead of HTTP)")
+    ap.add_argument("--host", default="127.0.0.1", help="HTTP bind address (default: 127.0.0.1)")
+    ap.add_argument("--port", type=int, default=8765, help="HTTP port (default: 8765)")
+    ap.add_argument("--workers", type=int, default=2, help="number of warm worker processes (default: 2)")
+    ap.add_argument("--max-queue", type=int, default=64, help="max pending jobs before rejecting (default: 64)")
+    ap.add_argument("--max-job-events", type=int, default=1024, help="events buffered per job for a slow client; ticks beyond it are dropped (default: 1024)")
+    ap.add_argument("--containers-dir", default="data/containers/v1", help="directory indexed for solve-by-cid requests")
+    args = ap.parse_args()
+
+    if args.socket and not hasattr(__import__("socket"), "AF_UNIX"):
+        print("Unix sockets are not available on this platform; use --host/--port", file=sys.stderr)
+        sys.exit(2)
+
+    daemon = SolverDaemon(workers=args.workers, max_queue=args.max_queue,
+                          containers_dir=args.containers_dir, max_job_events=args.max_job_events).start()
+    server = make_server(daemon, unix_path=args.socket, host=args.host, port=args.port)
+    where = args.socket or f"http://{args.host}:{server.server_address[1]}"
+    print(f"[INFO] ballpuzzle-daemon listening on {where} with {args.workers} workers", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        daemon.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse, json, sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.io.container import load_container
+from src.solver.estimate import estimate_tree
+from src.io.inventory import resolve_inventory
+
+def _fmt_seconds(s: float) -> str:
+    if s < 120:
+        return f"{s:.1f}s"
+    if s < 7200:
+        return f"{s / 60:.1f}min"
+    if s < 172800:
+        return f"{s / 3600:.1f}h"
+    return f"{s / 86400:.1f}d"
+
+def main():
+    ap = argparse.ArgumentParser(description="Estimate DFS search-tree size and run time from random probes (Knuth/Purdom estimator)")
+    ap.add_argument("containers", nargs="+", help="container json paths")
+    ap.add_argument("--inventory", help="path to inventory JSON (with {\"pieces\":{...}})")
+    ap.add_argument("--pieces", help="inline pieces, e.g. A=1,B=2 (takes precedence over --inventory)")
+    ap.add_argument("--probes", type=int, default=1000, help="random probes per container (default: 1000)")
+    ap.add_argument("--batch", type=int, default=50, help="probes per worker task (default: 50)")
+    ap.add_argument("--workers", type=int, default=0, help="worker processes (default: one per CPU; 1 = no pool)")
+    ap.add_argument("--width", type=int, default=1, help="children followed per level; >1 is Purdom's partial backtracking (default: 1)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--calibrate-s", type=float, default=3.0, help="seconds of real DFS used to measure nodes/s (default: 3; 0 = skip)")
+    ap.add_argument("--nodes-per-second", type=float, default=None, help="use this rate instead of calibrating")
+    ap.add_argument("--hole-pruning", choices=["none", "single_component", "lt4", "shape"], default="none", help="as for cli.solve")
+    ap.add_argument("--colour-pruning", action="store_true", help="as for cli.solve")
+    ap.add_argument("--mrv-window", type=int, default=0, help="as for cli.solve")
+    ap.add_argument("--cell-order", choices=["lex", "bfs", "morton", "hilbert", "boundary"], default="lex", help="as for cli.solve")
+    ap.add_argument("--json", action="store_true", help="print one JSON line per container")
+    args = ap.parse_args()
+
+    try:
+        pieces = resolve_inventory(args.pieces, args.inventory)
+    except Exception as e:
+        print(f"Error parsing inventory: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    options = {"hole_pruning": args.hole_pruning, "colour_pruning": args.colour_pruning,
+               "mrv_window": args.mrv_window, "cell_order": args.cell_order}
+    for path in args.containers:
+        container = load_container(path)
+        res = estimate_tree(container, pieces, options, probes=args.probes, batch=args.batch,
+                            workers=args.workers, width=args.width, seed=args.seed,
+                            calibrate_s=args.calibrate_s, nodes_per_second=args.nodes_per_second)
+        if args.json:
+            print(json.dumps({"container": path, **res}))
+            continue
+        n, s = res["nodes"], res["solutions"]
+        print(f"{path}: {res['probes']} probes in {res['probe_seconds']}s (mean depth {res['mean_probe_depth']}, max {res['max_probe_depth']})")
+        print(f"  nodes      {n['mean']:.4g}  95% CI [{n['ci95_low']:.4g}, {n['ci95_high']:.4g}]")
+        print(f"  solutions  {s['mean']:.4g}  95% CI [{s['ci95_low']:.4g}, {s['ci95_high']:.4g}]  ({res['probes_reaching_solution']} probes reached one)")
+        if "seconds" in res:
+            t = res["seconds"]
+            print(f"  time       {_fmt_seconds(t['mean'])}  95% CI [{_fmt_seconds(t['ci95_low'])}, {_fmt_seconds(t['ci95_high'])}] at {res['nodes_per_second']:.0f} nodes/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import argparse, json, sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.io.container import load_container
+from src.solver.preflight import preflight
+from src.io.inventory import resolve_inventory
+
+def main():
+    ap = argparse.ArgumentParser(description="Static infeasibility checks for containers and an inventory (no search)")
+    ap.add_argument("containers", nargs="+", help="container json paths")
+    ap.add_argument("--inventory", help="path to inventory JSON (with {\"pieces\":{...}})")
+    ap.add_argument("--pieces", help="inline pieces, e.g. A=1,B=2 (takes precedence over --inventory)")
+    ap.add_argument("--json", action="store_true", help="print one JSON line per container")
+    args = ap.parse_args()
+
+    try:
+        pieces = resolve_inventory(args.pieces, args.inventory)
+    except Exception as e:
+        print(f"Error parsing inventory: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    infeasible = 0
+    for path in args.containers:
+        container = load_container(path)
+        res = preflight(container["coordinates"], pieces)
+        infeasible += not res.feasible
+        if args.json:
+            print(json.dumps({"container": path, **res.to_dict()}))
+        elif res.feasible:
+            print(f"{path}: no proof of infeasibility ({', '.join(res.checks)}; {res.elapsed_ms:.1f} ms)")
+        else:
+            print(f"{path}: INFEASIBLE {res.reason}: {res.detail} ({res.elapsed_ms:.1f} ms)")
+    sys.exit(1 if infeasible else 0)
+
+if __name__ == "__main__":
+    main()
@@ -2,76 +2,49 @@ import argparse, time, json, sys
 from pathlib import Path
 import os
 
+_T_IMPORT0 = time.perf_counter()
+
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from src.solver.registry import get_engine
+from src.solver.registry import get_engine, available_engines
 from src.io.container import load_container
 from src.io.snapshot import open_eventlog, write_event
 from src.io.solution import write_solution
-from src.io.schema import load_schema
-from jsonschema import validate
-
-def _parse_inline_pieces(s: str) -> dict[str, int]:
-    """
-    Parse --pieces like: A=1,B=2,C=0
-    Returns dict with non-negative ints. Ignores empty segments.
-    Raises ValueError on bad tokens.
-    """
-    result: dict[str,int] = {}
-    if not s:
-        return result
-    for tok in s.split(","):
-        tok = tok.strip()
-        if not tok:
-            continue
-        if "=" not in tok:
-            raise ValueError(f"Invalid token '{tok}'. Expected NAME=COUNT.")
-        name, val = tok.split("=", 1)
-        name = name.strip().upper()
-        val = val.strip()
-        if not (len(name) == 1 and name.isalpha()):
-            raise ValueError(f"Invalid piece name '{name}'. Use single letters A..Z.")
-        try:
-            n = int(val)
-        except Exception:
-            raise ValueError(f"Invalid count '{val}' for piece '{name}'. Must be integer.")
-        if n < 0:
-            raise ValueError(f"Negative count '{n}' for piece '{name}'.")
-        result[name] = n
-    return result
-
-def _load_inventory_json(path: str) -> dict[str,int]:
-    """
-    Read inventory JSON file:
-      { "pieces": { "A":1, "B":2, ... } }
-    Validates against inventory.schema.json and returns the inner dict.
-    """
-    schema = load_schema("inventory.schema.json")
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    validate(instance=data, schema=schema)
-    pieces = data.get("pieces", {})
-    # Ensure ints
-    clean = {k: int(v) for k, v in pieces.items()}
-    return clean
-
-def _resolve_inventory(args) -> dict[str,int]:
-    """
-    Precedence: --pieces (inline) > --inventory (file) > default all pieces (A-Y = 1 each).
-    """
-    if args.pieces:
-        return _parse_inline_pieces(args.pieces)
-    if args.inventory:
-        return _load_inventory_json(args.inventory)
-    # Default: all pieces A-Y available once each
-    return {chr(ord('A') + i): 1 for i in range(25)}
+from src.io.inventory import resolve_inventory
+from src.io.schema import validate_instance
+
+class _StartupProfile:
+    """Collects wall-clock timings of CLI startup stages (--startup-profile)."""
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.stages = [("cli imports", time.perf_counter() - _T_IMPORT0)]
+        self._t = time.perf_counter()
+
+    def mark(self, label: str):
+        now = time.perf_counter()
+        self.stages.append((label, now - self._t))
+        self._t = now
+
+    def report(self):
+        if not self.enabled:
+            return
+        total = 0.0
+        for label, dt in self.stages:
+            total += dt
+            print(f"[startup] {label:<24} {dt * 1000:8.1f} ms", file=sys.stderr)
+        print(f"[startup] {'total':<24} {total * 1000:8.1f} ms", file=sys.stderr)
+        heavy = [m for m in ("numpy", "jsonschema") if m in sys.modules]
+        print(f"[startup] heavy modules loaded: {', '.join(heavy) or 'none'}", file=sys.stderr)
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("container", help="path to FCC container json")
-    ap.add_argument("--engine", choices=["dfs", "dlx"], default="dfs", help="solver engine")
-    ap.add_argument("--eventlog", default="events.jsonl")
+    ap.add_argument("--engine", choices=available_engines(), default="dfs", help="solver engine")
+    ap.add_argument("--eventlog", default="events.jsonl", help="JSONL event log; a .gz path writes independently gzipped blocks")
+    ap.add_argument("--eventlog-index-every", type=int, default=1000, metavar="N",
+                    help="write an EVENTLOG.idx offset index every N events and at each solution (0 = no index; default: 1000)")
     ap.add_argument("--solution", default="solutions/solution.json")
     ap.add_argument("--seed", type=int, default=9000)
     ap.add_argument("--max-results", default="1")
@@ -89,9 +62,22 @@ def main():
     # Enhanced DFS engine options
     ap.add_argument("--restart-interval-s", type=float, default=30.0, help="DFS restart interval in seconds (default: 30.0)")
     ap.add_argument("--restart-nodes", type=int, default=100000, help="DFS restart after N nodes explored (default: 100000)")
+    ap.add_argument("--restart-schedule", choices=["fixed", "luby", "geometric"], default=None, help="DFS node-budget restarts that keep a dead-state cache and failure statistics (default: legacy interval/node restarts)")
+    ap.add_argument("--restart-base", type=int, default=1000, help="node budget unit for --restart-schedule (default: 1000)")
+    ap.add_argument("--restart-factor", type=float, default=1.5, help="growth factor for --restart-schedule geometric (default: 1.5)")
     ap.add_argument("--pivot-cycle", action="store_true", help="enable pivot cycling over start piece and orientation")
     ap.add_argument("--mrv-window", type=int, default=0, help="MRV window size for target cell selection (0=disabled, default: 0)")
-    ap.add_argument("--hole-pruning", choices=["none", "single_component", "lt4"], default="none", help="hole pruning mode (default: none)")
+    ap.add_argument("--target-policy", choices=["window", "coverage"], default="window", help="DFS target cell: MRV window over empty neighbours, or exact MRV over feasible-placement counts (default: window)")
+    ap.add_argument("--hole-pruning", choices=["none", "single_component", "lt4", "shape"], default="none", help="hole pruning mode; shape adds lt4 plus a 4/8-cell shape lookup against the remaining pieces (default: none)")
+    ap.add_argument("--colour-pruning", action="store_true", help="DFS/DLX: prune nodes whose empty cells' lattice-colour counts cannot be covered by the remaining pieces")
+    ap.add_argument("--split-components", action="store_true", help="DFS: when the empty cells split into components, solve those of up to --split-max-cells independently")
+    ap.add_argument("--split-max-cells", type=int, default=24, help="largest empty component solved on its own with --split-components (default: 24)")
+    ap.add_argument("--region-memo", action="store_true", help="DFS/DLX: prune remaining regions memoized as unsolvable (canonical under FCC rotations)")
+    ap.add_argument("--region-memo-cells", type=int, default=24, help="consult the region memo once at most this many cells are empty (default: 24)")
+    ap.add_argument("--region-memo-path", default=None, help="SQLite file persisting the region memo across runs (implies --region-memo)")
+    ap.add_argument("--cell-order", choices=["lex", "bfs", "morton", "hilbert", "boundary"], default=None, help="bit order of container cells for DFS/DLX/engine-c masks (default: lex; engine-c keeps input order)")
+    ap.add_argument("--ordering", choices=["lcv", "mincov", "index"], default=None, help="engine-c candidate ordering (default: lcv; index restores the old unscored order, shuffled per --seed)")
+    ap.add_argument("--ordering-compare", action="store_true", help="engine-c: re-run the search with --ordering index and report nodes_by_ordering in the done metrics")
     # Status JSON emission
     ap.add_argument("--status-json", type=str, default=None, help="Path to write periodic status snapshot JSON (includes placement stack).")
     ap.add_argument("--status-interval-ms", type=int, default=1000, help="Interval for status emission in milliseconds (>=50).")
@@ -100,52 +86,107 @@ def main():
     # NEW: inventory inputs
     ap.add_argument("--inventory", help="path to inventory JSON (with {\"pieces\":{...}})")
     ap.add_argument("--pieces", help="inline pieces, e.g. A=1,B=2 (takes precedence over --inventory)")
+    ap.add_argument("--anytime", action="store_true", help="DFS: track the fullest partial packing, emit best_partial events and write it next to the no-solution stub")
+    ap.add_argument("--local-search-s", type=float, default=0.0, help="with --anytime: seconds of remove-k-and-refill local search on the best partial when no solution was found (default: 0)")
+    ap.add_argument("--local-search-k", type=int, default=2, help="placements removed per local search move (default: 2)")
+    ap.add_argument("--no-preflight", action="store_true", help="skip the static infeasibility checks engines run before searching")
+    ap.add_argument("--count-only", action="store_true", help="count all solutions (raw and symmetry-reduced) without writing them; totals are reported in the done event")
+    ap.add_argument("--portfolio", nargs="?", const="", default=None, metavar="CONFIG", help="race diversified engine configurations in parallel, first to --max-results wins (optional JSON list of {engine, options}; default: built-in portfolio)")
+    ap.add_argument("--portfolio-size", type=int, default=0, help="number of portfolio members (default: one per configuration)")
+    ap.add_argument("--portfolio-report", default=None, help="append a JSON line per portfolio race (winner and per-member stats) to this file")
+    ap.add_argument("--startup-profile", action="store_true", help="print startup stage timings to stderr before solving")
+    ap.add_argument("--metrics-prom", default=None, metavar="PATH", help="periodically write solver metrics (nodes/s, RSS, solutions, ...) in Prometheus text format to PATH, e.g. for node_exporter's textfile collector")
+    ap.add_argument("--metrics-jsonl", default=None, metavar="PATH", help="append one JSON line of solver metrics per interval to PATH")
+    ap.add_argument("--metrics-interval-ms", type=int, default=5000, help="interval for --metrics-prom/--metrics-jsonl in milliseconds (default: 5000)")
+    ap.add_argument("--tree-stats", action="store_true", help="DFS/DLX: per-depth node, candidate and prune-reason counts in the done metrics (and DFS tick events); render with ballpuzzle-tree-stats")
+    ap.add_argument("--profile", nargs="?", const="", default=None, metavar="PATH", help="DFS/DLX/engine-c: time search phases, add per-phase totals to the done metrics and write phase x depth collapsed stacks to PATH (default: <container>_<solution>_profile.folded next to the solution)")
     args = ap.parse_args()
+    profile = _StartupProfile(args.startup_profile)
 
     # Ensure solutions directory exists
     solution_path = Path(args.solution)
     solution_path.parent.mkdir(parents=True, exist_ok=True)
 
     container = load_container(args.container)
+    profile.mark("load container")
 
     # Resolve inventory
     try:
-        pieces_used = _resolve_inventory(args)  # dict[str,int]
+        pieces_used = resolve_inventory(args.pieces, args.inventory)  # dict[str,int]
     except Exception as e:
         print(f"Error parsing inventory: {e}", file=sys.stderr)
         sys.exit(2)
+    profile.mark("resolve inventory")
 
     # For now we pass these through; solver engines can ignore them until M4+
     inventory = {"pieces": pieces_used}
     # Load piece library
     from src.pieces.library_fcc_v1 import load_fcc_A_to_Y
     pieces = load_fcc_A_to_Y()
+    profile.mark("piece library")
 
     engine = get_engine(args.engine)
+    profile.mark(f"engine import ({args.engine})")
     meta = {"engine": engine.name, "seed": args.seed,
             "flags": {"mrvPieces": bool(args.mrv_pieces), "supportBias": bool(args.support_bias)}}
     # Build options bundle
-    options = {"seed": args.seed, "flags": meta["flags"], "caps": {"maxNodes": int(args.caps_max_nodes), "maxDepth": int(args.caps_max_depth), "maxRows": int(args.caps_max_rows)}, "max_results": int(args.max_results), "progress_interval_ms": int(args.progress_interval_ms), "time_limit": int(args.time_limit) if args.time_limit > 0 else 0, "hole4": bool(args.hole4), "piece_rotation_interval": float(args.piece_rotation_interval), "restart_interval_s": float(args.restart_interval_s), "restart_nodes": int(args.restart_nodes), "pivot_cycle": bool(args.pivot_cycle), "mrv_window": int(args.mrv_window), "hole_pruning": args.hole_pruning, "status_json": args.status_json, "status_interval_ms": int(args.status_interval_ms), "status_max_stack": int(args.status_max_stack), "status_phase": args.status_phase}
+    options = {"seed": args.seed, "flags": meta["flags"], "caps": {"maxNodes": int(args.caps_max_nodes), "maxDepth": int(args.caps_max_depth), "maxRows": int(args.caps_max_rows)}, "max_results": int(args.max_results), "progress_interval_ms": int(args.progress_interval_ms), "time_limit": int(args.time_limit) if args.time_limit > 0 else 0, "hole4": bool(args.hole4), "piece_rotation_interval": float(args.piece_rotation_interval), "restart_interval_s": float(args.restart_interval_s), "restart_nodes": int(args.restart_nodes), "pivot_cycle": bool(args.pivot_cycle), "restart_schedule": args.restart_schedule, "restart_base": int(args.restart_base), "restart_factor": float(args.restart_factor), "mrv_window": int(args.mrv_window), "target_policy": args.target_policy, "hole_pruning": args.hole_pruning, "status_json": args.status_json, "status_interval_ms": int(args.status_interval_ms), "status_max_stack": int(args.status_max_stack), "status_phase": args.status_phase, "count_only": bool(args.count_only), "anytime": bool(args.anytime), "local_search_s": float(args.local_search_s), "local_search_k": int(args.local_search_k), "preflight": not args.no_preflight, "colour_pruning": bool(args.colour_pruning), "split_components": bool(args.split_components), "split_max_cells": int(args.split_max_cells), "region_memo": bool(args.region_memo), "region_memo_cells": int(args.region_memo_cells), "region_memo_path": args.region_memo_path}
+    if args.cell_order:
+        options["cell_order"] = args.cell_order
+    if args.ordering:
+        options["ordering"] = args.ordering
+    if args.ordering_compare:
+        options["ordering_compare"] = True
+    if args.tree_stats:
+        options["tree_stats"] = True
+    if args.metrics_prom or args.metrics_jsonl:
+        options.update(metrics_prom=args.metrics_prom, metrics_jsonl=args.metrics_jsonl,
+                       metrics_interval_ms=int(args.metrics_interval_ms))
+    if args.profile is not None:
+        options["profile"] = True
+        options["profile_path"] = args.profile or str(solution_path.parent / f"{Path(args.container).stem.replace(' ', '_')}_{solution_path.stem}_profile.folded")
+
+    if args.portfolio is not None:
+        from src.service.portfolio import DEFAULT_PORTFOLIO, build_members, load_portfolio, race
+        configs = load_portfolio(args.portfolio) if args.portfolio else DEFAULT_PORTFOLIO
+        # members share one process each; a single status, profile or metrics file would be clobbered
+        base = {k: v for k, v in options.items()
+                if not k.startswith(("status_", "metrics_")) and k != "profile_path"}
+        members = build_members(configs, args.portfolio_size or len(configs), base)
+        events = race(container, inventory, members, max_results=int(args.max_results))
+        meta["engine"] = "portfolio"
+    else:
+        events = engine.solve(container, inventory, pieces, options)
 
     emitted_solution = False
     solution_count = 0
+    best_partial = None
+
+    profile.report()
 
-    # Schema validation setup
-    from src.io.schema import load_schema
-    from jsonschema import validate as _validate
-    _event_schema = load_schema("snapshot.schema.json")
-    
     def _write(ev, fp):
         ev = {"v": 1, **ev}
-        _validate(instance=ev, schema=_event_schema)
+        validate_instance("snapshot.schema.json", ev)
         write_event(ev, fp)
 
-    with open_eventlog(args.eventlog) as fp:
+    with open_eventlog(args.eventlog, args.eventlog_index_every) as fp:
         import time
         t0 = time.time()
-        for ev in engine.solve(container, inventory, pieces, options):
+        for ev in events:
             ev.setdefault("t_ms", int((time.time()-t0)*1000))
             _write(ev, fp)
+            if ev["type"] == "best_partial":
+                best_partial = ev["partial"]
+            if ev["type"] == "solution" and "member" in ev:
+                winner = members[ev["member"]]
+                meta = {**meta, "engine": winner.engine, "seed": winner.options["seed"]}
+            if ev["type"] == "done" and "portfolio" in ev.get("metrics", {}):
+                report = ev["metrics"]["portfolio"]
+                won = report["winner"]
+                print("[portfolio] winner: " + (f"member {won['member']} ({won['engine']})" if won else "none"), file=sys.stderr)
+                if args.portfolio_report:
+                    with open(args.portfolio_report, "a", encoding="utf-8") as rf:
+                        rf.write(json.dumps({"container": args.container, "cid": container.get("cid_sha256"), **report}) + "\n")
             if ev["type"] == "solution":
                 # Ensure piecesUsed is included exactly as resolved
                 sol = dict(ev["solution"])
@@ -179,8 +220,21 @@ def main():
                 
                 emitted_solution = True
 
+            if ev["type"] == "done" and "profile" in ev.get("metrics", {}):
+                prof = ev["metrics"]["profile"]
+                top = ", ".join(f"{name} {p['ms']:.0f}ms" for name, p in list(prof["phases"].items())[:5])
+                print(f"[profile] {prof['wall_ms']:.0f}ms wall: {top} -> {options['profile_path']}", file=sys.stderr)
+            if ev["type"] == "done" and ev.get("metrics", {}).get("infeasible_reason"):
+                print(f"[preflight] infeasible: {ev['metrics']['infeasible_reason']}: {ev['metrics']['infeasible_detail']}", file=sys.stderr)
+            if ev["type"] == "done" and ev.get("metrics", {}).get("count_only"):
+                m = ev["metrics"]
+                if m.get("complete"):
+                    print(f"[count] solutions: {m['solutions_total']} total, {m['solutions_unique']} unique under {m['symmetry_group_order']} symmetries", file=sys.stderr)
+                else:
+                    print(f"[count] incomplete ({m.get('stopped')})", file=sys.stderr)
+
         # If the engine emitted no 'solution' event, write a stub to avoid missing file
-        if not emitted_solution:
+        if not emitted_solution and not args.count_only:
             from src.io.solution_sig import canonical_state_signature
             from src.solver.symbreak import container_symmetry_group
             cells = sorted(tuple(map(int,c)) for c in container["coordinates"])
@@ -201,5 +255,11 @@ def main():
             stub_path = solution_path.parent / stub_filename
             write_solution(str(stub_path), stub, meta, pieces_used)
 
+            if best_partial is not None:
+                partial_path = solution_path.parent / f"{container_name}_{base_name}_best_partial{extension}"
+                write_solution(str(partial_path), {**best_partial, "sid_state_sha256": "best_partial",
+                                                   "sid_route_sha256": "best_partial"}, meta, best_partial["piecesUsed"])
+                print(f"[anytime] best partial: {best_partial['cellsFilled']}/{best_partial['cellsTotal']} cells -> {partial_path}", file=sys.stderr)
+
 if __name__ == "__main__":
     main()
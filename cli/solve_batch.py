@@ -0,0 +1,102 @@
+import argparse, glob, sys, time
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.solver.registry import available_engines
+from src.io.container import load_container
+from src.service.batch import (BatchJob, ORDERS, expand_matrix, job_id, load_matrix_file,
+                               order_jobs, predicted_difficulty, run_batch)
+from src.io.inventory import resolve_inventory
+
+def _collect_containers(patterns):
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) or ([pattern] if Path(pattern).is_file() else [])
+        if not matches:
+            print(f"[WARN] no containers match {pattern}", file=sys.stderr)
+        paths.extend(m for m in matches if m not in paths)
+    return paths
+
+def main():
+    ap = argparse.ArgumentParser(description="Solve many containers across an engine/option matrix on a process pool")
+    ap.add_argument("containers", nargs="+", help="container paths or globs, e.g. 'data/containers/v1/Shape_*.fcc.json'")
+    ap.add_argument("--engines", default="dfs", help=f"comma-separated engines ({', '.join(available_engines())}; default: dfs)")
+    ap.add_argument("--set", dest="sets", action="append", default=[], metavar="KEY=V1,V2",
+                    help="engine option axis, repeatable; the matrix is the product of all axes")
+    ap.add_argument("--matrix", help="JSON list of {\"engine\": ..., \"options\": {...}} variants (replaces --engines/--set)")
+    ap.add_argument("--results", default="batch_results.jsonl", help="consolidated results file (appended; default: batch_results.jsonl)")
+    ap.add_argument("--workers", type=int, default=2, help="number of worker processes (default: 2)")
+    ap.add_argument("--order", choices=ORDERS, default="largest", help="scheduling order (default: largest)")
+    ap.add_argument("--budget-s", type=float, default=0.0, help="global wall-clock budget in seconds (0 = unlimited)")
+    ap.add_argument("--no-resume", action="store_true", help="re-run jobs already recorded as done")
+    ap.add_argument("--seed", type=int, default=9000)
+    ap.add_argument("--max-results", type=int, default=1)
+    ap.add_argument("--time-limit", type=int, default=0, help="per-job time limit in seconds (0 = unlimited)")
+    ap.add_argument("--inventory", help="path to inventory JSON (with {\"pieces\":{...}})")
+    ap.add_argument("--pieces", help="inline pieces, e.g. A=1,B=2 (takes precedence over --inventory)")
+    args = ap.parse_args()
+
+    try:
+        pieces_used = resolve_inventory(args.pieces, args.inventory)
+    except Exception as e:
+        print(f"Error parsing inventory: {e}", file=sys.stderr)
+        sys.exit(2)
+    inventory = {"pieces": pieces_used}
+
+    base = {"seed": args.seed, "max_results": args.max_results, "time_limit": args.time_limit}
+    try:
+        if args.matrix:
+            variants = load_matrix_file(args.matrix, base)
+        else:
+            variants = expand_matrix([e.strip() for e in args.engines.split(",") if e.strip()], args.sets, base)
+    except (OSError, ValueError) as e:
+        print(f"Error reading matrix: {e}", file=sys.stderr)
+        sys.exit(2)
+    unknown = sorted({e for e, _ in variants} - set(available_engines()))
+    if unknown:
+        print(f"Unknown engine(s): {', '.join(unknown)}; choose from {', '.join(available_engines())}", file=sys.stderr)
+        sys.exit(2)
+
+    library = None
+    if args.order == "difficulty":
+        from src.pieces.library_fcc_v1 import load_fcc_A_to_Y
+        library = load_fcc_A_to_Y()
+
+    jobs = []
+    for path in _collect_containers(args.containers):
+        try:
+            container = load_container(path)
+        except Exception as e:
+            print(f"[WARN] skipping {path}: {e}", file=sys.stderr)
+            continue
+        difficulty = predicted_difficulty(container, library, pieces_used) if library else 0.0
+        for engine, options in variants:
+            jobs.append(BatchJob(id=job_id(container, engine, options, inventory), path=path,
+                                 container=container, engine=engine, options=options,
+                                 inventory=inventory, difficulty=difficulty))
+    if not jobs:
+        print("No jobs to run", file=sys.stderr)
+        sys.exit(2)
+    jobs = order_jobs(jobs, args.order)
+
+    def _report(rec):
+        print(f"[{rec['status']}] {Path(rec['container']).name} {rec['engine']} "
+              f"solutions={rec['solutions_found']} {rec['elapsed_ms'] / 1000:.1f}s"
+              + (f" error={rec['error']}" if rec["error"] else ""), file=sys.stderr)
+
+    t0 = time.time()
+    try:
+        summary = run_batch(jobs, args.results, workers=args.workers, budget_s=args.budget_s,
+                            resume=not args.no_resume, on_record=_report)
+    except KeyboardInterrupt:
+        print("[INFO] interrupted; finished jobs are in the results file and will be skipped on resume", file=sys.stderr)
+        sys.exit(130)
+    print(f"[INFO] {summary['total']} jobs: {summary['done']} done, {summary['skipped']} skipped (already done), "
+          f"{summary['budget']} cut by budget, {summary['not_started']} not started, {summary['error']} errors "
+          f"in {time.time() - t0:.1f}s -> {args.results}", file=sys.stderr)
+    sys.exit(1 if summary["error"] else 0)
+
+if __name__ == "__main__":
+    main()
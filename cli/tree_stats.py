@@ -0,0 +1,43 @@
+import argparse, sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.io.event_index import EventLogReader
+from src.solver.tree_stats import render
+
+def _last_tree_stats(path: str):
+    """tree_stats of the last done (or, for an unfinished run, tick) event in an eventlog."""
+    reader = EventLogReader(path)
+    done = reader.last("done") if reader.entries else None  # indexed: no full scan
+    if done is not None and "tree_stats" in done.get("metrics", {}):
+        return done["metrics"]["tree_stats"]
+    found = None
+    for ev in reader.events():
+        stats = ev.get("metrics", {}).get("tree_stats")
+        if stats is not None and ev.get("type") in ("done", "tick"):
+            found = stats
+    return found
+
+def main():
+    ap = argparse.ArgumentParser(description="Render search-tree statistics (cli.solve --tree-stats) from eventlogs as text tables")
+    ap.add_argument("eventlogs", nargs="+", help="events.jsonl(.gz) files; several are shown side by side")
+    ap.add_argument("--labels", help="comma-separated column labels, one per eventlog (default: file stems)")
+    args = ap.parse_args()
+
+    labels = args.labels.split(",") if args.labels else [Path(p).stem for p in args.eventlogs]
+    if len(labels) != len(args.eventlogs):
+        print("--labels needs one label per eventlog", file=sys.stderr)
+        sys.exit(2)
+    stats = []
+    for path in args.eventlogs:
+        s = _last_tree_stats(path)
+        if s is None:
+            print(f"{path}: no tree_stats (run cli.solve with --tree-stats)", file=sys.stderr)
+            sys.exit(1)
+        stats.append(s)
+    print(render(stats, labels))
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,11 @@
-import sys, json
+import argparse, glob, json, sys, time
 from pathlib import Path
 from src.io.container import load_container
-from src.io.solution_sig import canonical_state_signature
-from src.pieces.library_fcc_v1 import load_fcc_A_to_Y
-from src.solver.symbreak import container_symmetry_group
+from src.solver.verify import ContainerVerifier, index_containers, iter_stored_solutions, verify_many
 
-def main():
-    if len(sys.argv) != 3:
-        print("usage: python -m cli.verify solution.json container.json", file=sys.stderr)
-        sys.exit(1)
-
-    sol_path = Path(sys.argv[1]); cont_path = Path(sys.argv[2])
+def _verify_one(sol_path: Path, cont_path: Path, check_sid: bool):
     sol = json.loads(sol_path.read_text(encoding="utf-8"))
-    
+
     # Use v1.0 container loader with validation
     try:
         container = load_container(str(cont_path))
@@ -22,48 +15,64 @@ def main():
     except Exception as e:
         print(f"Failed to load container: {e}", file=sys.stderr)
         sys.exit(1)
-    
-    container_cells = {tuple(map(int,c)) for c in container["coordinates"]}
-    lib = load_fcc_A_to_Y()
-
-    covered = set()
-    for pl in sol.get("placements", []):
-        pid = pl["piece"]; ori = pl["ori"]; dx,dy,dz = pl["t"]
-        pdef = lib.get(pid)
-        if not pdef:
-            print(f"unknown piece {pid}"); sys.exit(2)
-        try:
-            orient = pdef.orientations[ori]
-        except IndexError:
-            print(f"invalid orientation index {ori} for piece {pid}"); sys.exit(2)
-        cov = [(u[0]+dx,u[1]+dy,u[2]+dz) for u in orient]
-        for c in cov:
-            if c not in container_cells:
-                print(f"cell {c} not in container"); sys.exit(2)
-            if c in covered:
-                print(f"overlap at {c}"); sys.exit(2)
-            covered.add(c)
-
-    if covered != container_cells:
-        missing = container_cells - covered
-        extra = covered - container_cells
-        if missing: print(f"missing cells: {sorted(missing)}")
-        if extra: print(f"extra cells: {sorted(extra)}")
-        sys.exit(2)
 
-    # Recompute canonical signature
-    cells_sorted = sorted(tuple(map(int,c)) for c in container["coordinates"])
-    symGroup = container_symmetry_group(cells_sorted)
-    recomputed_sid = canonical_state_signature(covered, symGroup)
-    stored_sid = sol.get("sid_state_canon_sha256")
-    if stored_sid != recomputed_sid:
-        print("canonical sid mismatch")
-        print(f"stored: {stored_sid}")
-        print(f"recomputed: {recomputed_sid}")
+    error = ContainerVerifier(container, check_sid).check(sol)
+    if error:
+        print(error)
         sys.exit(2)
-
     print("solution verified ok")
     sys.exit(0)
 
+def _verify_batch(args):
+    paths = []
+    for pattern in args.containers:
+        paths.extend(sorted(glob.glob(pattern)) or [pattern])
+    containers = index_containers(paths)
+    out = sys.stdout if args.report == "-" else open(args.report, "w", encoding="utf-8")
+    t0 = time.time()
+    ok = failed = 0
+    try:
+        for res in verify_many(iter_stored_solutions(args.batch), containers, workers=args.workers,
+                               chunk=args.chunk, check_sid=not args.no_sid):
+            if res["ok"]:
+                ok += 1
+                if args.failures_only:
+                    continue
+            else:
+                failed += 1
+            out.write(json.dumps(res, ensure_ascii=False) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.time() - t0
+    rate = (ok + failed) / elapsed if elapsed > 0 else 0.0
+    print(f"[verify] {ok + failed} solutions: {ok} ok, {failed} failed in {elapsed:.1f}s ({rate:.0f}/s)", file=sys.stderr)
+    sys.exit(2 if failed else 0)
+
+def main():
+    ap = argparse.ArgumentParser(description="Verify solutions against their containers",
+                                 usage="python -m cli.verify solution.json container.json\n"
+                                       "       python -m cli.verify --batch DIR|STORE --containers GLOB [...]")
+    ap.add_argument("solution", nargs="?", help="solution JSON")
+    ap.add_argument("container", nargs="?", help="container JSON")
+    ap.add_argument("--batch", metavar="DIR|STORE",
+                    help="verify every solution in a directory of solution files or a JSONL store (one solution per line, or solve-batch results)")
+    ap.add_argument("--containers", nargs="+", default=["data/containers/v1/*.json"],
+                    help="container paths or globs, matched to solutions by cid (default: data/containers/v1/*.json)")
+    ap.add_argument("--workers", type=int, default=0, help="worker processes (default: one per CPU; 1 = no pool)")
+    ap.add_argument("--chunk", type=int, default=256, help="solutions per worker task (default: 256)")
+    ap.add_argument("--report", default="-", help="JSONL pass/fail report, one line per solution (default: stdout)")
+    ap.add_argument("--failures-only", action="store_true", help="report only failed solutions")
+    ap.add_argument("--no-sid", action="store_true", help="skip the canonical SID check")
+    args = ap.parse_args()
+
+    if args.batch:
+        _verify_batch(args)
+    if not (args.solution and args.container):
+        print("usage: python -m cli.verify solution.json container.json", file=sys.stderr)
+        sys.exit(1)
+    _verify_one(Path(args.solution), Path(args.container), not args.no_sid)
+
 if __name__ == "__main__":
     main()
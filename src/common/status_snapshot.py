@@ -27,6 +27,8 @@ class Metrics:
     solutions: int
     elapsed_ms: int
     best_depth: Optional[int] = None
+    progress: Optional[float] = None   # completed fraction of the search tree, 0..1
+    eta_ms: Optional[int] = None
 
 @dataclass
 class ContainerInfo:
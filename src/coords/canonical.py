@@ -1,7 +1,6 @@
 """Canonical coordinate transformations and representations."""
 
 from typing import Tuple, List, Set, Iterable
-import numpy as np
 import hashlib
 from .lattice_fcc import FCCLattice
 
@@ -80,6 +79,8 @@ class CanonicalCoordinate:
         if not coords:
             return set()
         
+        import numpy as np  # deferred: keeps CLI startup free of NumPy
+
         # Translate to origin (minimum coordinate becomes (0,0,0))
         coords_list = list(coords)
         min_coord = tuple(np.array(coords_list).min(axis=0))
@@ -102,6 +103,8 @@ class CanonicalCoordinate:
         Returns:
             Canonical coordinate set
         """
+        import numpy as np
+
         # Generate all 24 rotation matrices for cubic symmetry
         rotations = self._generate_rotation_matrices()
         
@@ -130,12 +133,14 @@ class CanonicalCoordinate:
         canonical_list = min(canonical_candidates)
         return set(canonical_list)
     
-    def _generate_rotation_matrices(self) -> List[np.ndarray]:
+    def _generate_rotation_matrices(self) -> List["np.ndarray"]:
         """Generate all 24 rotation matrices for cubic symmetry.
         
         Returns:
             List of 3x3 rotation matrices
         """
+        import numpy as np
+
         # Identity and basic rotations
         rotations = []
         
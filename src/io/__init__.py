@@ -7,5 +7,8 @@ and snapshots with JSON schema validation.
 from .container import load_container
 from .solution import write_solution
 from .snapshot import open_eventlog, write_event
+from .event_index import EventLogReader, IndexedEventWriter, build_index
+from .inventory import resolve_inventory
 
-__all__ = ["load_container", "write_solution", "open_eventlog", "write_event"]
+__all__ = ["load_container", "write_solution", "open_eventlog", "write_event",
+           "EventLogReader", "IndexedEventWriter", "build_index", "resolve_inventory"]
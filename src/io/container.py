@@ -1,8 +1,7 @@
 import json
-from jsonschema import validate
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
-from .schema import load_schema
+from .schema import validate_instance
 from ..coords.canonical import cid_sha256
 
 I3 = Tuple[int,int,int]
@@ -27,7 +26,7 @@ def load_container(path: str) -> Dict[str, Any]:
         )
     
     # Validate against v1.0 schema
-    validate(instance=data, schema=load_schema("container.schema.json"))
+    validate_instance("container.schema.json", data)
     
     # Use cells field (v1.0 format) instead of coordinates (legacy)
     if "cells" not in data:
@@ -0,0 +1,212 @@
+"""Seekable eventlogs: a byte-offset index sidecar and block-gzip storage.
+
+``IndexedEventWriter`` writes the usual JSONL eventlog and, next to it,
+``<eventlog>.idx``. The sidecar is JSONL too, one entry per indexed event::
+
+    {"n": 4000, "t_ms": 81234, "type": "tick", "offset": 1048211}
+    {"n": 4017, "t_ms": 81990, "type": "solution", "offset": 1052887, "solution": 0}
+
+Entries are written for the first event, every ``every`` events after the
+previous entry, and every ``solution`` and ``done`` event. ``offset`` is
+the byte position of that event in the log file.
+
+If the log path ends in ``.gz``, every indexed event starts a new,
+independent gzip member. ``offset`` then points at a member boundary, and
+decompression can start there. The whole file is still an ordinary
+multi-member gzip file (``zcat`` reads it). A member is only complete once
+the next indexed event starts or the log is closed. A live reader
+therefore sees a compressed log up to the last finished block. A plain
+log is readable up to the last flushed line.
+
+``EventLogReader`` uses the sidecar to jump to a time (``at_time``), to
+the k-th solution (``solution``) or to the last event of a type
+(``last``). Without a sidecar it falls back to a full scan.
+``build_index`` writes a sidecar for an existing plain log.
+"""
+
+from __future__ import annotations
+import bisect
+import gzip
+import json
+import zlib
+from typing import Any, Dict, Iterator, List, Optional
+
+INDEX_SUFFIX = ".idx"
+INDEXED_TYPES = ("solution", "done")
+
+
+def index_path(log_path: str) -> str:
+    return str(log_path) + INDEX_SUFFIX
+
+
+class IndexedEventWriter:
+    """JSONL eventlog writer that keeps an offset index sidecar."""
+
+    def __init__(self, path: str, every: int = 1000):
+        self.path = str(path)
+        self.every = max(1, int(every))
+        self.gzip = self.path.endswith(".gz")
+        self._fp = open(self.path, "wb")
+        self._idx = open(index_path(self.path), "w", encoding="utf-8")
+        self._offset = 0      # bytes written to the log
+        self._count = 0       # events written
+        self._since = 0       # events since the last index entry
+        self._solutions = 0
+        self._member = None   # compressor of the open gzip member
+
+    def write_event(self, ev: Dict[str, Any]) -> None:
+        kind = ev.get("type")
+        if self._count == 0 or self._since >= self.every or kind in INDEXED_TYPES:
+            self._mark(ev)
+        data = (json.dumps(ev, ensure_ascii=False) + "\n").encode("utf-8")
+        if self.gzip:
+            if self._member is None:
+                self._member = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31: gzip framing
+            data = self._member.compress(data)
+        self._fp.write(data)
+        self._offset += len(data)
+        self._count += 1
+        self._since += 1
+
+    def _end_member(self) -> None:
+        if self._member is not None:
+            data = self._member.flush()
+            self._fp.write(data)
+            self._offset += len(data)
+            self._member = None
+
+    def _mark(self, ev: Dict[str, Any]) -> None:
+        self._end_member()
+        self._fp.flush()
+        entry = {"n": self._count, "t_ms": ev.get("t_ms"), "type": ev.get("type"), "offset": self._offset}
+        if ev.get("type") == "solution":
+            entry["solution"] = self._solutions
+            self._solutions += 1
+        self._idx.write(json.dumps(entry) + "\n")
+        self._idx.flush()
+        self._since = 0
+
+    def close(self) -> None:
+        if self._fp.closed:
+            return
+        self._end_member()
+        self._fp.close()
+        self._idx.close()
+
+    def __enter__(self) -> "IndexedEventWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def load_index(log_path: str) -> List[Dict[str, Any]]:
+    """Index entries of ``log_path``, or [] if it has no sidecar. A torn last line is ignored."""
+    entries = []
+    try:
+        with open(index_path(log_path), "r", encoding="utf-8") as fp:
+            for line in fp:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    break
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+class EventLogReader:
+    """Random access into an eventlog written by ``IndexedEventWriter``."""
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        self.gzip = self.path.endswith(".gz")
+        self.entries = load_index(self.path)
+
+    def events(self, offset: int = 0) -> Iterator[Dict[str, Any]]:
+        """Events from byte ``offset`` (an index entry's offset) to the end of the log."""
+        with open(self.path, "rb") as raw:
+            raw.seek(offset)
+            stream = gzip.GzipFile(fileobj=raw, mode="rb") if self.gzip else raw
+            try:
+                for line in stream:
+                    if not line.strip():
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        return  # torn last line of a live log
+            except (EOFError, zlib.error):
+                return  # unfinished gzip member of a live log
+
+    def at_time(self, t_ms: int) -> Iterator[Dict[str, Any]]:
+        """Events with ``t_ms >= t_ms``, starting from the nearest earlier index entry."""
+        times = [e["t_ms"] if e.get("t_ms") is not None else -1 for e in self.entries]
+        k = bisect.bisect_right(times, t_ms) - 1
+        offset = self.entries[k]["offset"] if k >= 0 else 0
+        for ev in self.events(offset):
+            if ev.get("t_ms", t_ms) >= t_ms:
+                yield ev
+
+    def solution(self, k: int) -> Optional[Dict[str, Any]]:
+        """The k-th (0-based) solution event, or None."""
+        for e in self.entries:
+            if e.get("solution") == k:
+                return next(self.events(e["offset"]), None)
+        if self.entries:
+            return None  # every solution is indexed
+        seen = 0
+        for ev in self.events():
+            if ev.get("type") == "solution":
+                if seen == k:
+                    return ev
+                seen += 1
+        return None
+
+    def last(self, kind: str) -> Optional[Dict[str, Any]]:
+        """The last event of type ``kind``; indexed types are read directly."""
+        if kind in INDEXED_TYPES:
+            for e in reversed(self.entries):
+                if e.get("type") == kind:
+                    return next(self.events(e["offset"]), None)
+            if self.entries:
+                return None
+        found = None
+        for ev in self.events():
+            if ev.get("type") == kind:
+                found = ev
+        return found
+
+
+def build_index(log_path: str, every: int = 1000) -> int:
+    """Write the sidecar for an existing plain eventlog; returns the number of entries.
+
+    A gzip log compressed as one member cannot be seeked into. Rewrite it
+    with ``IndexedEventWriter`` instead.
+    """
+    if str(log_path).endswith(".gz"):
+        raise ValueError("build_index works on plain logs; rewrite gzip logs with IndexedEventWriter")
+    every = max(1, int(every))
+    entries = 0
+    solutions = since = count = offset = 0
+    with open(log_path, "rb") as fp, open(index_path(log_path), "w", encoding="utf-8") as idx:
+        for line in fp:
+            start, offset = offset, offset + len(line)
+            if not line.strip():
+                continue
+            try:
+                ev = json.loads(line)
+            except ValueError:
+                break
+            kind = ev.get("type")
+            if count == 0 or since >= every or kind in INDEXED_TYPES:
+                entry = {"n": count, "t_ms": ev.get("t_ms"), "type": kind, "offset": start}
+                if kind == "solution":
+                    entry["solution"] = solutions
+                    solutions += 1
+                idx.write(json.dumps(entry) + "\n")
+                entries += 1
+                since = 0
+            count += 1
+            since += 1
+    return entries
@@ -1,11 +1,32 @@
-"""Event logging for tracking solver operations and debugging."""
+"""Event logging for tracking solver operations and debugging.
+
+``EventLogger`` keeps the most recent ``max_events`` events in a ring
+buffer (``events``) and hands every event to its sinks as it happens:
+
+* ``FileSink``    -- human-readable lines (``timestamp - ballpuzzle - LEVEL - [type] message``)
+* ``JsonlSink``   -- one JSON object per line
+* ``ConsoleSink`` -- the human-readable line on stderr
+* ``LoggingSink`` -- forwards to a ``logging`` logger without touching its handlers
+* ``QueueSink``   -- wraps another sink; a writer thread drains a bounded queue,
+  so slow I/O stays off the caller's thread. When the queue is full, events
+  are dropped and counted, or with ``block=True`` the caller waits
+
+The logger's ``level`` is checked first, before the event dict, timestamp
+or message exist. The ``log_*`` helpers check it before building their
+f-strings, so suppressed events allocate nothing. Each sink can have a
+stricter level of its own, checked before it formats anything.
+"""
 
 import json
 import logging
-from typing import Dict, Any, Optional
+import queue
+import sys
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
 from datetime import datetime
-from pathlib import Path
 from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, TextIO
 
 
 class EventLevel(Enum):
@@ -17,42 +38,157 @@ class EventLevel(Enum):
     CRITICAL = "critical"
 
 
+_SEVERITY = {EventLevel.DEBUG: 10, EventLevel.INFO: 20, EventLevel.WARNING: 30,
+             EventLevel.ERROR: 40, EventLevel.CRITICAL: 50}
+_BY_NAME = {lvl.value: lvl for lvl in EventLevel}
+
+
+def format_event(event: Dict[str, Any]) -> str:
+    """The line the logging-based logger used to write for ``event``."""
+    return f"{event['timestamp']} - ballpuzzle - {event['level'].upper()} - [{event['event_type']}] {event['message']}"
+
+
+class EventSink(ABC):
+    """Receives events that passed the logger's level; ``level`` filters further."""
+
+    def __init__(self, level: EventLevel = EventLevel.DEBUG):
+        self.min_severity = _SEVERITY[level]
+
+    @abstractmethod
+    def emit(self, event: Dict[str, Any]) -> None:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class _StreamSink(EventSink):
+    def __init__(self, stream: TextIO, level: EventLevel, owns: bool):
+        super().__init__(level)
+        self.stream = stream
+        self._owns = owns
+
+    def _line(self, event: Dict[str, Any]) -> str:
+        return format_event(event)
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        # Flushed per event, as logging.FileHandler did: a crash keeps the log
+        # and ``tail -f`` follows it. Wrap in QueueSink to keep this off the caller.
+        self.stream.write(self._line(event) + "\n")
+        self.stream.flush()
+
+    def close(self) -> None:
+        if self._owns:
+            self.stream.close()
+        else:
+            self.stream.flush()
+
+
+class FileSink(_StreamSink):
+    """Human-readable lines appended to ``path``."""
+
+    def __init__(self, path: str, level: EventLevel = EventLevel.DEBUG):
+        super().__init__(open(path, "a", encoding="utf-8"), level, owns=True)
+
+
+class JsonlSink(_StreamSink):
+    """One JSON object per event, appended to ``path``."""
+
+    def __init__(self, path: str, level: EventLevel = EventLevel.DEBUG):
+        super().__init__(open(path, "a", encoding="utf-8"), level, owns=True)
+
+    def _line(self, event: Dict[str, Any]) -> str:
+        return json.dumps(event, ensure_ascii=False, default=str)
+
+
+class ConsoleSink(_StreamSink):
+    """Human-readable lines on stderr (INFO and above by default)."""
+
+    def __init__(self, level: EventLevel = EventLevel.INFO, stream: Optional[TextIO] = None):
+        super().__init__(stream or sys.stderr, level, owns=False)
+
+
+class LoggingSink(EventSink):
+    """Forwards to ``logging.getLogger(name)``; configuring its handlers is up to the application."""
+
+    def __init__(self, name: str = "ballpuzzle", level: EventLevel = EventLevel.DEBUG):
+        super().__init__(level)
+        self.logger = logging.getLogger(name)
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        self.logger.log(_SEVERITY[_BY_NAME[event["level"]]], "[%s] %s", event["event_type"], event["message"])
+
+
+class QueueSink(EventSink):
+    """Runs ``sink`` on a writer thread behind a queue of at most ``maxsize`` events."""
+
+    _STOP = object()
+
+    def __init__(self, sink: EventSink, maxsize: int = 10000, block: bool = False):
+        super().__init__()
+        self.min_severity = sink.min_severity
+        self.sink = sink
+        self.block = block
+        self.dropped = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize)
+        self._thread = threading.Thread(target=self._drain, name="eventlog-writer", daemon=True)
+        self._thread.start()
+
+    def _drain(self) -> None:
+        while True:
+            event = self._queue.get()
+            if event is self._STOP:
+                return
+            try:
+                self.sink.emit(event)
+            except Exception:
+                pass  # a failing sink must not kill the writer
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        if self.block:
+            self._queue.put(event)
+            return
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+        self.sink.close()
+
+
 class EventLogger:
     """Structured event logger for ball puzzle solver operations."""
     
-    def __init__(self, log_file: Optional[str] = None, console_output: bool = True):
+    def __init__(self, log_file: Optional[str] = None, console_output: bool = True,
+                 max_events: int = 10000, level: EventLevel = EventLevel.DEBUG,
+                 sinks: Optional[Iterable[EventSink]] = None):
         """Initialize event logger.
         
         Args:
-            log_file: Optional file path for logging
-            console_output: Whether to output to console
+            log_file: Optional file path for human-readable logging (all levels)
+            console_output: Whether to print INFO and above to stderr
+            max_events: Size of the ``events`` ring buffer (0 keeps none)
+            level: Events below this level are dropped before any work is done
+            sinks: Further sinks, e.g. ``JsonlSink`` or ``QueueSink(FileSink(...))``
         """
         self.log_file = log_file
         self.console_output = console_output
-        self.events = []
-        
-        # Set up Python logger
-        self.logger = logging.getLogger("ballpuzzle")
-        self.logger.setLevel(logging.DEBUG)
-        
-        # Clear existing handlers
-        self.logger.handlers.clear()
-        
-        # Add console handler if requested
+        self.events: deque = deque(maxlen=max(0, int(max_events)))
+        self.events_logged = 0
+        self.min_severity = _SEVERITY[level]
+        self.sinks: List[EventSink] = []
         if console_output:
-            console_handler = logging.StreamHandler()
-            console_handler.setLevel(logging.INFO)
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            console_handler.setFormatter(formatter)
-            self.logger.addHandler(console_handler)
-        
-        # Add file handler if requested
+            self.sinks.append(ConsoleSink())
         if log_file:
-            file_handler = logging.FileHandler(log_file)
-            file_handler.setLevel(logging.DEBUG)
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            file_handler.setFormatter(formatter)
-            self.logger.addHandler(file_handler)
+            self.sinks.append(FileSink(log_file))
+        self.sinks.extend(sinks or ())
+        
+    def is_enabled(self, level: EventLevel) -> bool:
+        return _SEVERITY[level] >= self.min_severity
     
     def log_event(
         self,
@@ -69,22 +205,23 @@ class EventLogger:
             message: Human-readable message
             data: Optional structured data
         """
-        if data is None:
-            data = {}
+        severity = _SEVERITY[level]
+        if severity < self.min_severity:
+            return
         
         event = {
             'timestamp': datetime.now().isoformat(),
             'level': level.value,
             'event_type': event_type,
             'message': message,
-            'data': data
+            'data': data if data is not None else {}
         }
-        
-        self.events.append(event)
-        
-        # Log to Python logger
-        log_level = getattr(logging, level.value.upper())
-        self.logger.log(log_level, f"[{event_type}] {message}")
+        self.events_logged += 1
+        if self.events.maxlen:
+            self.events.append(event)
+        for sink in self.sinks:
+            if severity >= sink.min_severity:
+                sink.emit(event)
     
     def debug(self, event_type: str, message: str, data: Dict[str, Any] = None):
         """Log debug event."""
@@ -108,6 +245,8 @@ class EventLogger:
     
     def log_solver_start(self, engine: str, container_size: int, piece_count: int):
         """Log solver start event."""
+        if _SEVERITY[EventLevel.INFO] < self.min_severity:
+            return
         self.info("solver_start", f"Starting solver with {engine} engine", {
             'engine': engine,
             'container_size': container_size,
@@ -116,6 +255,8 @@ class EventLogger:
     
     def log_solver_finish(self, status: str, time_elapsed: float, nodes_explored: int):
         """Log solver finish event."""
+        if _SEVERITY[EventLevel.INFO] < self.min_severity:
+            return
         self.info("solver_finish", f"Solver finished with status: {status}", {
             'status': status,
             'time_elapsed': time_elapsed,
@@ -124,6 +265,8 @@ class EventLogger:
     
     def log_piece_placed(self, piece_name: str, coordinates: list, depth: int):
         """Log piece placement event."""
+        if _SEVERITY[EventLevel.DEBUG] < self.min_severity:
+            return
         self.debug("piece_placed", f"Placed piece {piece_name} at depth {depth}", {
             'piece_name': piece_name,
             'coordinates': coordinates,
@@ -132,6 +275,8 @@ class EventLogger:
     
     def log_piece_backtrack(self, piece_name: str, depth: int):
         """Log piece backtrack event."""
+        if _SEVERITY[EventLevel.DEBUG] < self.min_severity:
+            return
         self.debug("piece_backtrack", f"Backtracked piece {piece_name} at depth {depth}", {
             'piece_name': piece_name,
             'depth': depth
@@ -139,6 +284,8 @@ class EventLogger:
     
     def log_pruning(self, reason: str, depth: int):
         """Log pruning event."""
+        if _SEVERITY[EventLevel.DEBUG] < self.min_severity:
+            return
         self.debug("pruning", f"Pruned branch: {reason}", {
             'reason': reason,
             'depth': depth
@@ -146,26 +293,28 @@ class EventLogger:
     
     def log_solution_found(self, solution_id: str, piece_count: int):
         """Log solution found event."""
+        if _SEVERITY[EventLevel.INFO] < self.min_severity:
+            return
         self.info("solution_found", f"Solution found with {piece_count} pieces", {
             'solution_id': solution_id,
             'piece_count': piece_count
         })
     
     def save_events(self, file_path: str):
-        """Save all events to JSON file.
+        """Save the buffered events to JSON file.
         
         Args:
             file_path: Path where to save events
         """
         with open(file_path, 'w') as f:
-            json.dump(self.events, f, indent=2)
+            json.dump(list(self.events), f, indent=2)
     
     def clear_events(self):
         """Clear all stored events."""
         self.events.clear()
     
     def get_events(self, event_type: str = None, level: EventLevel = None) -> list:
-        """Get filtered events.
+        """Get filtered events from the buffer.
         
         Args:
             event_type: Optional event type filter
@@ -174,7 +323,7 @@ class EventLogger:
         Returns:
             List of matching events
         """
-        filtered_events = self.events
+        filtered_events = list(self.events)
         
         if event_type:
             filtered_events = [e for e in filtered_events if e['event_type'] == event_type]
@@ -183,3 +332,14 @@ class EventLogger:
             filtered_events = [e for e in filtered_events if e['level'] == level.value]
         
         return filtered_events
+
+    def close(self):
+        """Flush and close all sinks (joins ``QueueSink`` writer threads)."""
+        for sink in self.sinks:
+            sink.close()
+
+    def __enter__(self) -> "EventLogger":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,63 @@
+"""Piece inventories from the command line: ``--pieces`` and ``--inventory``."""
+
+import json
+from typing import Dict, Optional
+
+from .schema import validate_instance
+
+
+def parse_inline_pieces(s: str) -> Dict[str, int]:
+    """
+    Parse --pieces like: A=1,B=2,C=0
+    Returns dict with non-negative ints. Ignores empty segments.
+    Raises ValueError on bad tokens.
+    """
+    result: Dict[str, int] = {}
+    if not s:
+        return result
+    for tok in s.split(","):
+        tok = tok.strip()
+        if not tok:
+            continue
+        if "=" not in tok:
+            raise ValueError(f"Invalid token '{tok}'. Expected NAME=COUNT.")
+        name, val = tok.split("=", 1)
+        name = name.strip().upper()
+        val = val.strip()
+        if not (len(name) == 1 and name.isalpha()):
+            raise ValueError(f"Invalid piece name '{name}'. Use single letters A..Z.")
+        try:
+            n = int(val)
+        except Exception:
+            raise ValueError(f"Invalid count '{val}' for piece '{name}'. Must be integer.")
+        if n < 0:
+            raise ValueError(f"Negative count '{n}' for piece '{name}'.")
+        result[name] = n
+    return result
+
+
+def load_inventory_json(path: str) -> Dict[str, int]:
+    """
+    Read inventory JSON file:
+      { "pieces": { "A":1, "B":2, ... } }
+    Validates against inventory.schema.json and returns the inner dict.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    validate_instance("inventory.schema.json", data)
+    pieces = data.get("pieces", {})
+    # Ensure ints
+    clean = {k: int(v) for k, v in pieces.items()}
+    return clean
+
+
+def resolve_inventory(pieces: Optional[str] = None, inventory: Optional[str] = None) -> Dict[str, int]:
+    """
+    Precedence: ``pieces`` (inline) > ``inventory`` (file) > default all pieces (A-Y = 1 each).
+    """
+    if pieces:
+        return parse_inline_pieces(pieces)
+    if inventory:
+        return load_inventory_json(inventory)
+    # Default: all pieces A-Y available once each
+    return {chr(ord('A') + i): 1 for i in range(25)}
@@ -1,5 +1,33 @@
 import json, importlib.resources as r
+from functools import lru_cache
 
 def load_schema(name: str):
     with r.files(__package__).joinpath(name).open("r", encoding="utf-8") as f:
         return json.load(f)
+
+@lru_cache(maxsize=None)
+def get_validator(name: str):
+    """Return a compiled, process-wide cached validator for a bundled schema.
+
+    jsonschema is imported on first use so that callers which never validate
+    do not pay its import cost. The schema itself is checked once here instead
+    of on every ``jsonschema.validate`` call.
+    """
+    from jsonschema.validators import validator_for
+    schema = load_schema(name)
+    cls = validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema)
+
+def validate_instance(name: str, instance) -> None:
+    """Validate ``instance`` against a bundled schema.
+
+    Well-formed instances of the hot schemas are accepted by a precompiled
+    check (see ``compiled.py``); anything else goes through the cached
+    jsonschema validator so errors are reported exactly as before.
+    """
+    from .compiled import FAST_CHECKS
+    check = FAST_CHECKS.get(name)
+    if check is not None and check(instance):
+        return
+    get_validator(name).validate(instance)
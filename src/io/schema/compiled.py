@@ -0,0 +1,87 @@
+"""Precompiled fast-path checks for the hot bundled schemas.
+
+Each predicate mirrors its JSON schema and is conservative: it returns True
+only for instances the schema accepts. A False result means "not proven
+valid" and callers fall back to the real jsonschema validator, which then
+produces the usual ValidationError. This keeps jsonschema out of the startup
+path for well-formed inputs.
+"""
+
+import re
+from typing import Any, Callable, Dict
+
+_CID_RE = re.compile(r"^sha256:[a-f0-9]{64}$")
+_CONTAINER_REQUIRED = frozenset(("version", "lattice", "cells", "cid", "designer"))
+_DESIGNER_KEYS = frozenset(("name", "date", "email"))
+_EVENT_TYPES = frozenset(("tick", "solution", "best_partial", "done"))
+
+
+def _is_int(v: Any) -> bool:
+    return type(v) is int
+
+
+def container_v1(d: Any) -> bool:
+    """container.schema.json"""
+    if type(d) is not dict or d.keys() != _CONTAINER_REQUIRED:
+        return False
+    if d["version"] != "1.0" or d["lattice"] != "fcc":
+        return False
+    cells = d["cells"]
+    if type(cells) is not list or not cells:
+        return False
+    for c in cells:
+        if type(c) is not list or len(c) != 3:
+            return False
+        if not (_is_int(c[0]) and _is_int(c[1]) and _is_int(c[2])):
+            return False
+    cid = d["cid"]
+    if type(cid) is not str or not _CID_RE.search(cid):
+        return False
+    designer = d["designer"]
+    if type(designer) is not dict or "name" not in designer or "date" not in designer:
+        return False
+    if not _DESIGNER_KEYS.issuperset(designer):
+        return False
+    return all(type(v) is str for v in designer.values())
+
+
+def inventory(d: Any) -> bool:
+    """inventory.schema.json"""
+    if type(d) is not dict or d.keys() != {"pieces"}:
+        return False
+    pieces = d["pieces"]
+    if type(pieces) is not dict:
+        return False
+    for k, v in pieces.items():
+        if len(k) != 1 or not ("A" <= k <= "Z"):
+            return False
+        if not _is_int(v) or v < 0:
+            return False
+    return True
+
+
+def event(d: Any) -> bool:
+    """snapshot.schema.json"""
+    if type(d) is not dict:
+        return False
+    v = d.get("v")
+    t_ms = d.get("t_ms")
+    if not _is_int(v) or v != 1 or not _is_int(t_ms) or t_ms < 0:
+        return False
+    ev_type = d.get("type")
+    if type(ev_type) is not str or ev_type not in _EVENT_TYPES:
+        return False
+    if "metrics" in d and type(d["metrics"]) is not dict:
+        return False
+    if "solution" in d and type(d["solution"]) is not dict:
+        return False
+    if "partial" in d and type(d["partial"]) is not dict:
+        return False
+    return True
+
+
+FAST_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "container.schema.json": container_v1,
+    "inventory.schema.json": inventory,
+    "snapshot.schema.json": event,
+}
@@ -1,8 +1,16 @@
 import json
-from typing import Dict, Any, TextIO
+from typing import Dict, Any, TextIO, Union
+from .event_index import IndexedEventWriter
 
-def open_eventlog(path: str):
+def open_eventlog(path: str, index_every: int = 0):
+    """Plain text eventlog, or with ``index_every`` > 0 (or a ``.gz`` path) an
+    ``IndexedEventWriter`` that also writes the ``.idx`` offset sidecar."""
+    if index_every > 0 or str(path).endswith(".gz"):
+        return IndexedEventWriter(path, index_every or 1000)
     return open(path, "w", encoding="utf-8")
 
-def write_event(line: Dict[str, Any], fp: TextIO):
+def write_event(line: Dict[str, Any], fp: Union[TextIO, IndexedEventWriter]):
+    if isinstance(fp, IndexedEventWriter):
+        fp.write_event({"v":1, **line})
+        return
     fp.write(json.dumps({"v":1, **line}, ensure_ascii=False) + "\n")
@@ -0,0 +1,108 @@
+"""Process-wide compiled FCC piece library.
+
+``sphere_orientations.PIECES`` stores orientations as nested lists. Engines
+used to convert them on every solve and index them again inside their
+placement loops. :func:`compiled_library` does that work once per process
+and returns an immutable :class:`CompiledPieceLibrary` holding:
+
+* ``orientations[name]`` -- tuple of orientations, each a tuple of 4 cells;
+* ``rel[name][ori][a]`` -- the orientation's cells relative to its atom
+  ``a``, so a placement that puts atom ``a`` on cell ``c`` covers
+  ``c + rel[name][ori][a]`` (with ``t = c - orientations[name][ori][a]``);
+* ``offsets`` -- start of each piece's orientations in the flat tables;
+* ``digest`` -- sha256 of the orientation data, for cache keys;
+* ``array`` / ``flat`` / ``rel_array`` -- NumPy int8 views, shapes
+  ``(piece, ori, 4, 3)`` (zero padded, see ``ori_counts``),
+  ``(total_ori, 4, 3)`` and ``(total_ori, 4, 4, 3)``. These are built on
+  first access so that importing the library does not import NumPy.
+"""
+
+from __future__ import annotations
+import hashlib
+from functools import lru_cache
+from typing import Dict, Tuple
+
+I3 = Tuple[int, int, int]
+Orientation = Tuple[I3, ...]
+
+
+class CompiledPieceLibrary:
+    """Immutable, array-backed view of a piece set."""
+
+    __slots__ = ("names", "index", "orientations", "rel", "ori_counts", "offsets",
+                 "digest", "_defs", "_arrays")
+
+    def __init__(self, pieces: Dict[str, list]):
+        self.names: Tuple[str, ...] = tuple(sorted(pieces))
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.orientations: Dict[str, Tuple[Orientation, ...]] = {
+            name: tuple(tuple(tuple(int(v) for v in cell) for cell in ori) for ori in pieces[name])
+            for name in self.names
+        }
+        self.rel: Dict[str, Tuple[Tuple[Orientation, ...], ...]] = {
+            name: tuple(
+                tuple(tuple((c[0] - a[0], c[1] - a[1], c[2] - a[2]) for c in ori) for a in ori)
+                for ori in oris)
+            for name, oris in self.orientations.items()
+        }
+        self.ori_counts: Tuple[int, ...] = tuple(len(self.orientations[n]) for n in self.names)
+        offsets = [0]
+        for n in self.ori_counts:
+            offsets.append(offsets[-1] + n)
+        self.offsets: Tuple[int, ...] = tuple(offsets)
+        h = hashlib.sha256()
+        for name in self.names:
+            h.update(name.encode("ascii"))
+            h.update(bytes((v & 0xFF) for ori in self.orientations[name] for cell in ori for v in cell))
+        self.digest: str = h.hexdigest()
+        self._defs = None
+        self._arrays = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def flat_index(self, name: str, ori_idx: int) -> int:
+        """Row of ``(name, ori_idx)`` in ``flat`` / ``rel_array``."""
+        return self.offsets[self.index[name]] + ori_idx
+
+    def piece_defs(self) -> Dict[str, "StaticPieceDef"]:
+        """``StaticPieceDef`` objects built once from this library's tuples."""
+        if self._defs is None:
+            from .library_fcc_v1 import StaticPieceDef
+            self._defs = {name: StaticPieceDef(name, self.orientations[name]) for name in self.names}
+        return self._defs
+
+    def _build_arrays(self):
+        if self._arrays is None:
+            import numpy as np
+            max_ori = max(self.ori_counts) if self.ori_counts else 0
+            array = np.zeros((len(self.names), max_ori, 4, 3), dtype=np.int8)
+            for p, name in enumerate(self.names):
+                for o, ori in enumerate(self.orientations[name]):
+                    array[p, o] = ori
+            flat = np.concatenate([array[p, :n] for p, n in enumerate(self.ori_counts)]) \
+                if self.names else np.zeros((0, 4, 3), dtype=np.int8)
+            rel = flat[:, None, :, :] - flat[:, :, None, :]
+            for a in (array, flat, rel):
+                a.setflags(write=False)
+            self._arrays = (array, flat, rel)
+        return self._arrays
+
+    @property
+    def array(self):
+        return self._build_arrays()[0]
+
+    @property
+    def flat(self):
+        return self._build_arrays()[1]
+
+    @property
+    def rel_array(self):
+        return self._build_arrays()[2]
+
+
+@lru_cache(maxsize=None)
+def compiled_library() -> CompiledPieceLibrary:
+    """The A..Y library from ``sphere_orientations``, compiled once per process."""
+    from .sphere_orientations import PIECES
+    return CompiledPieceLibrary(PIECES)
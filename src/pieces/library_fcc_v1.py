@@ -9,14 +9,17 @@ class StaticPieceDef:
     """Definition of a single piece with static orientations."""
     def __init__(self, name: str, orientations_ijk: List[List[List[int]]]):
         self.name = name
-        self.orientations = [tuple(map(tuple, ori)) for ori in orientations_ijk]
+        self.orientations: Tuple[Tuple[I3, ...], ...] = tuple(tuple(map(tuple, ori)) for ori in orientations_ijk)
 
 def load_fcc_A_to_Y() -> Dict[str, StaticPieceDef]:
-    """Load the STATIC, verified FCC orientations (R6, integer lattice)."""
-    from .sphere_orientations import PIECES   # static source of truth
-    out: Dict[str, StaticPieceDef] = {}
-    for name, orients in PIECES.items():
-        out[name] = StaticPieceDef(name, orients)
+    """Load the STATIC, verified FCC orientations (R6, integer lattice).
+
+    The definitions come from the process-wide compiled library, so repeated
+    calls are cheap; the returned dict is a fresh copy but the definitions
+    are shared and must not be mutated.
+    """
+    from .compiled import compiled_library
+    out: Dict[str, StaticPieceDef] = dict(compiled_library().piece_defs())
     # Sanity: A should have 3 orientations
     assert len(out["A"].orientations) == 3, "Piece A must have exactly 3 orientations"
     return out
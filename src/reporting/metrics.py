@@ -1,10 +1,26 @@
-"""Metrics collection for solver performance analysis."""
+"""Metrics collection for solver performance analysis.
 
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, field
+Engines feed a ``MetricsCollector`` from the counters they already keep:
+a ``MetricsExporter`` polls a provider callable on a timer (like the status
+emitter), so the search loop pays nothing. Each poll writes a Prometheus
+exposition-format file for node_exporter's textfile collector and/or
+appends one JSON line to a time series.
+"""
+
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, field, fields
 from datetime import datetime
+import json
+import os
+import sys
+import threading
 import time
 
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
 
 @dataclass
 class SolverMetrics:
@@ -51,11 +67,13 @@ class MetricsCollector:
         self.depth_samples: List[int] = []
         self.timing_checkpoints: List[Tuple[str, float]] = []
         self._start_time: Optional[float] = None
+        self._last_sample: Tuple[float, int] = (0.0, 0)  # (time, nodes) of the previous sample
     
     def start_collection(self):
         """Start metrics collection."""
         self._start_time = time.time()
         self.metrics.start_time = self._start_time
+        self._last_sample = (self._start_time, 0)
         self.depth_samples.clear()
         self.timing_checkpoints.clear()
         self.timing_checkpoints.append(("start", self._start_time))
@@ -71,7 +89,14 @@ class MetricsCollector:
         # Calculate derived metrics
         if self.metrics.total_time > 0:
             self.metrics.nodes_per_second = self.metrics.nodes_explored / self.metrics.total_time
+        self._derive_rates()
+        
+        if self.depth_samples:
+            self.metrics.average_depth = sum(self.depth_samples) / len(self.depth_samples)
         
+        self.timing_checkpoints.append(("end", self.metrics.end_time))
+    
+    def _derive_rates(self):
         if self.metrics.nodes_explored > 0:
             self.metrics.pruning_rate = self.metrics.pruned_nodes / (
                 self.metrics.nodes_explored + self.metrics.pruned_nodes
@@ -80,11 +105,54 @@ class MetricsCollector:
         cache_total = self.metrics.cache_hits + self.metrics.cache_misses
         if cache_total > 0:
             self.metrics.cache_hit_rate = self.metrics.cache_hits / cache_total
+    
+    def update(self, counters: Dict[str, Any]):
+        """Set counters from an engine's running totals.
         
-        if self.depth_samples:
-            self.metrics.average_depth = sum(self.depth_samples) / len(self.depth_samples)
+        Args:
+            counters: ``SolverMetrics`` field values (``nodes_explored``,
+                ``solutions_found``, ...); other keys go to ``custom_metrics``
+        """
+        for name, value in counters.items():
+            if name in _FIELDS:
+                setattr(self.metrics, name, value)
+            else:
+                self.metrics.custom_metrics[name] = value
+        if (self.metrics.solutions_found and self.metrics.first_solution_time is None
+                and self._start_time is not None):
+            self.metrics.first_solution_time = time.time() - self._start_time
+    
+    def sample(self) -> Dict[str, Any]:
+        """Point-in-time metrics; ``nodes_per_second`` covers the interval since the last sample.
         
-        self.timing_checkpoints.append(("end", self.metrics.end_time))
+        Returns:
+            Dictionary of the current counters, rates and memory usage
+        """
+        now = time.time()
+        if self._start_time is None:
+            self.start_collection()
+        last_t, last_nodes = self._last_sample
+        self._last_sample = (now, self.metrics.nodes_explored)
+        self._derive_rates()
+        rss, peak = memory_usage()
+        self.metrics.peak_memory_usage = max(self.metrics.peak_memory_usage, peak)
+        elapsed = now - self._start_time
+        m = self.metrics
+        return {
+            "ts": round(now, 3),
+            "elapsed_s": round(elapsed, 3),
+            "nodes_explored": m.nodes_explored,
+            "nodes_per_second": round((m.nodes_explored - last_nodes) / (now - last_t), 1) if now > last_t else 0.0,
+            "nodes_per_second_avg": round(m.nodes_explored / elapsed, 1) if elapsed > 0 else 0.0,
+            "solutions_found": m.solutions_found,
+            "max_depth_reached": m.max_depth_reached,
+            "pruned_nodes": m.pruned_nodes,
+            "pruning_rate": round(m.pruning_rate, 4),
+            "cache_hit_rate": round(m.cache_hit_rate, 4),
+            "rss_bytes": rss,
+            "peak_rss_bytes": m.peak_memory_usage,
+            **{k: v for k, v in m.custom_metrics.items() if isinstance(v, (int, float)) and not isinstance(v, bool)},
+        }
     
     def record_node_explored(self, depth: int):
         """Record exploration of a search node.
@@ -186,3 +254,135 @@ class MetricsCollector:
         self.depth_samples.clear()
         self.timing_checkpoints.clear()
         self._start_time = None
+        self._last_sample = (0.0, 0)
+
+
+_FIELDS = {f.name for f in fields(SolverMetrics)} - {"custom_metrics"}
+
+
+def memory_usage() -> Tuple[int, int]:
+    """Current and peak resident set size in bytes (0 where the platform does not say)."""
+    rss = 0
+    try:
+        with open("/proc/self/statm", "r") as f:
+            rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    peak = 0
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak *= 1 if sys.platform == "darwin" else 1024  # bytes on macOS, KiB elsewhere
+    return rss, max(rss, peak)
+
+
+# sample key -> (metric name, type, help)
+PROMETHEUS_METRICS = {
+    "nodes_explored": ("ballpuzzle_nodes_explored_total", "counter", "Search nodes explored."),
+    "nodes_per_second": ("ballpuzzle_nodes_per_second", "gauge", "Nodes explored per second since the previous sample."),
+    "nodes_per_second_avg": ("ballpuzzle_nodes_per_second_avg", "gauge", "Nodes explored per second since the engine started."),
+    "solutions_found": ("ballpuzzle_solutions_found_total", "counter", "Solutions found."),
+    "max_depth_reached": ("ballpuzzle_max_depth", "gauge", "Deepest search level reached."),
+    "pruned_nodes": ("ballpuzzle_pruned_nodes_total", "counter", "Search nodes pruned."),
+    "pruning_rate": ("ballpuzzle_pruning_rate", "gauge", "Pruned share of visited plus pruned nodes."),
+    "cache_hit_rate": ("ballpuzzle_cache_hit_rate", "gauge", "Cache hits over cache lookups."),
+    "rss_bytes": ("ballpuzzle_rss_bytes", "gauge", "Resident set size of the solver process."),
+    "peak_rss_bytes": ("ballpuzzle_peak_rss_bytes", "gauge", "Peak resident set size of the solver process."),
+    "elapsed_s": ("ballpuzzle_elapsed_seconds", "gauge", "Seconds since the engine started."),
+}
+
+
+def _label_value(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def prometheus_text(sample: Dict[str, Any], labels: Optional[Dict[str, Any]] = None) -> str:
+    """Render a ``MetricsCollector.sample()`` in the Prometheus text exposition format."""
+    label_str = ",".join(f'{k}="{_label_value(v)}"' for k, v in sorted((labels or {}).items()))
+    label_str = "{" + label_str + "}" if label_str else ""
+    lines = []
+    for key, (name, kind, help_text) in PROMETHEUS_METRICS.items():
+        if key in sample:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name}{label_str} {sample[key]}"]
+    for key, value in sample.items():  # engine-specific counters, exported as gauges
+        if key not in PROMETHEUS_METRICS and key != "ts":
+            name = "ballpuzzle_" + "".join(ch if ch.isalnum() else "_" for ch in key)
+            lines += [f"# HELP {name} Engine counter {key}.", f"# TYPE {name} gauge", f"{name}{label_str} {value}"]
+    return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    """Timer-driven export of an engine's counters (see the module docstring).
+    
+    ``start(provider)`` polls ``provider()`` (a dict of ``SolverMetrics``
+    counters) every ``interval_ms``; ``stop(final)`` writes a last sample.
+    """
+    
+    def __init__(self, prom_path: Optional[str] = None, jsonl_path: Optional[str] = None,
+                 interval_ms: int = 5000, labels: Optional[Dict[str, Any]] = None):
+        self.prom_path = prom_path
+        self.jsonl_path = jsonl_path
+        self.interval = max(100, int(interval_ms))
+        self.labels = dict(labels or {})
+        self.collector = MetricsCollector()
+        self._provider: Optional[Callable[[], Dict[str, Any]]] = None
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        self._running = False
+    
+    def start(self, provider: Callable[[], Dict[str, Any]]):
+        self._provider = provider
+        self.collector.start_collection()
+        self._running = True
+        self._schedule()
+    
+    def _schedule(self):
+        if not self._running:
+            return
+        self._timer = threading.Timer(self.interval / 1000.0, self._tick)
+        self._timer.daemon = True
+        self._timer.start()
+    
+    def _tick(self):
+        if not (self._running and self._provider):
+            return
+        try:
+            self.export(self._provider())
+        except Exception:
+            # Never disturb the engine over a metrics write
+            pass
+        finally:
+            self._schedule()
+    
+    def export(self, counters: Dict[str, Any]) -> Dict[str, Any]:
+        """Feed ``counters`` to the collector, write one sample and return it."""
+        with self._lock:
+            self.collector.update(counters)
+            sample = self.collector.sample()
+            if self.prom_path:
+                from ..common.status_snapshot import atomic_write_json
+                atomic_write_json(self.prom_path, prometheus_text(sample, self.labels))
+            if self.jsonl_path:
+                with open(self.jsonl_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({**self.labels, **sample}) + "\n")
+            return sample
+    
+    def stop(self, final: Optional[Dict[str, Any]] = None):
+        self._running = False
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        if final is not None:
+            try:
+                self.export(final)
+            except Exception:
+                pass
+            self.collector.end_collection()
+
+
+def exporter_from_options(options: Dict[str, Any], engine: str, container_cid: str) -> Optional[MetricsExporter]:
+    """``MetricsExporter`` for the ``metrics_prom`` / ``metrics_jsonl`` engine options, or None."""
+    prom, jsonl = options.get("metrics_prom"), options.get("metrics_jsonl")
+    if not (prom or jsonl):
+        return None
+    return MetricsExporter(prom, jsonl, int(options.get("metrics_interval_ms", 5000)),
+                           labels={"engine": engine, "container": str(container_cid)[:16]})
@@ -0,0 +1,11 @@
+"""Long-lived solver service for ball puzzle solving.
+
+This module provides warm worker processes that keep the engines and piece
+tables loaded between jobs, and a daemon that schedules solve jobs onto a
+bounded pool of them over a Unix socket or local HTTP.
+"""
+
+from .workers import WarmWorker
+from .daemon import SolverDaemon, Job
+
+__all__ = ["WarmWorker", "SolverDaemon", "Job"]
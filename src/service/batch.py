@@ -0,0 +1,257 @@
+"""Batch solving: many containers x an engine/option matrix on warm workers.
+
+A batch is a list of :class:`BatchJob` (one container, one engine, one
+options dict). Jobs are scheduled onto a pool of :class:`WarmWorker`
+processes and every finished job appends one JSON line to a single results
+file::
+
+    {"job": "3f2a...", "container": "data/containers/v1/Shape_3.fcc.json",
+     "cid": "sha256:...", "cells": 100, "engine": "dlx", "options": {...},
+     "status": "done", "error": null, "solutions_found": 1, "solutions": [...],
+     "metrics": {...}, "first_solution_ms": 812, "elapsed_ms": 1290,
+     "finished_at": "2025-01-01T12:00:00Z"}
+
+Job ids hash the container cid, engine, options and inventory, so a restart
+with the same matrix skips every job whose last record is ``done``. When the
+global budget runs out, running jobs are cancelled and recorded with status
+``budget`` (they are re-run on resume); queued jobs are left for next time.
+"""
+
+from __future__ import annotations
+import hashlib
+import itertools
+import json
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .workers import WarmWorker
+
+ORDERS = ("largest", "difficulty", "given")
+
+
+@dataclass
+class BatchJob:
+    id: str
+    path: str
+    container: Dict[str, Any] = field(repr=False)
+    engine: str
+    options: Dict[str, Any]
+    inventory: Dict[str, Any] = field(repr=False)
+    difficulty: float = 0.0
+
+    @property
+    def cells(self) -> int:
+        return len(self.container["cells"])
+
+
+def job_id(container: Dict[str, Any], engine: str, options: Dict[str, Any],
+           inventory: Dict[str, Any]) -> str:
+    key = {"cid": container.get("cid_sha256") or container.get("cid"), "engine": engine,
+           "options": options, "inventory": inventory}
+    blob = json.dumps(key, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def parse_value(text: str) -> Any:
+    """Matrix values are JSON where possible (``8``, ``true``), else strings."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def expand_matrix(engines: Sequence[str], sets: Sequence[str],
+                  base: Optional[Dict[str, Any]] = None) -> List[Tuple[str, Dict[str, Any]]]:
+    """Cartesian product of engines and ``KEY=V1,V2`` option axes.
+
+    >>> expand_matrix(["dfs"], ["mrv_window=0,8"])
+    [('dfs', {'mrv_window': 0}), ('dfs', {'mrv_window': 8})]
+    """
+    axes: List[Tuple[str, List[Any]]] = []
+    for spec in sets:
+        if "=" not in spec:
+            raise ValueError(f"Invalid --set '{spec}'. Expected KEY=V1,V2,...")
+        key, vals = spec.split("=", 1)
+        axes.append((key.strip(), [parse_value(v.strip()) for v in vals.split(",") if v.strip()]))
+    variants = []
+    for engine in engines:
+        for combo in itertools.product(*(vals for _, vals in axes)):
+            opts = dict(base or {})
+            opts.update({k: v for (k, _), v in zip(axes, combo)})
+            variants.append((engine, opts))
+    return variants
+
+
+def load_matrix_file(path: str, base: Optional[Dict[str, Any]] = None) -> List[Tuple[str, Dict[str, Any]]]:
+    """Read ``[{"engine": "dfs", "options": {...}}, ...]`` variants from JSON."""
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    if not isinstance(entries, list):
+        raise ValueError("matrix file must hold a JSON list of {engine, options} objects")
+    return [(str(e.get("engine", "dfs")), {**(base or {}), **(e.get("options") or {})}) for e in entries]
+
+
+def predicted_difficulty(container: Dict[str, Any], pieces: Dict[str, Any],
+                         inventory: Dict[str, int]) -> float:
+    """Rough log10 search-tree size used for ``--order difficulty``.
+
+    Counts the in-container placements of every available piece; with ``m``
+    placements covering an average cell and ``n/4`` pieces to place, the tree
+    is modelled as ``m ** (n/4)``.
+    """
+    cells = {tuple(c) for c in container["cells"]}
+    if not cells:
+        return 0.0
+    placements = 0
+    for name, count in inventory.items():
+        if count <= 0 or name not in pieces:
+            continue
+        for ori in pieces[name].orientations:
+            a0 = ori[0]
+            for c in cells:
+                d = (c[0] - a0[0], c[1] - a0[1], c[2] - a0[2])
+                if all((p[0] + d[0], p[1] + d[1], p[2] + d[2]) in cells for p in ori[1:]):
+                    placements += 1
+    mean_cover = placements * 4 / len(cells)
+    return (len(cells) / 4) * math.log10(max(mean_cover, 1.0))
+
+
+def order_jobs(jobs: List[BatchJob], order: str) -> List[BatchJob]:
+    """Stable sort: ``largest`` by cell count, ``difficulty`` by prediction."""
+    if order == "largest":
+        return sorted(jobs, key=lambda j: -j.cells)
+    if order == "difficulty":
+        return sorted(jobs, key=lambda j: -j.difficulty)
+    if order == "given":
+        return list(jobs)
+    raise ValueError(f"order must be one of: {', '.join(ORDERS)}")
+
+
+def finished_job_ids(results_path: str) -> Set[str]:
+    """Ids whose most recent record in the results file is ``done``."""
+    last: Dict[str, str] = {}
+    p = Path(results_path)
+    if not p.exists():
+        return set()
+    with p.open("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue  # torn final line from an interrupted run
+            if isinstance(rec, dict) and "job" in rec:
+                last[rec["job"]] = rec.get("status", "")
+    return {jid for jid, status in last.items() if status == "done"}
+
+
+class _Running:
+    def __init__(self, job: BatchJob):
+        self.job = job
+        self.t0 = time.time()
+        self.solutions: List[Dict[str, Any]] = []
+        self.metrics: Dict[str, Any] = {}
+        self.first_solution_ms: Optional[int] = None
+        self.budget_cut = False
+
+    def record(self, status: str, error: Optional[str]) -> Dict[str, Any]:
+        job = self.job
+        if self.budget_cut and status != "error":
+            status = "budget"
+        return {
+            "job": job.id,
+            "container": job.path,
+            "cid": job.container.get("cid_sha256"),
+            "cells": job.cells,
+            "engine": job.engine,
+            "options": job.options,
+            "status": status,
+            "error": error,
+            "solutions_found": len(self.solutions),
+            "solutions": self.solutions,
+            "metrics": self.metrics,
+            "first_solution_ms": self.first_solution_ms,
+            "elapsed_ms": int((time.time() - self.t0) * 1000),
+            "finished_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        }
+
+
+def run_batch(jobs: Iterable[BatchJob], results_path: str, workers: int = 2,
+              budget_s: float = 0.0, resume: bool = True,
+              on_record: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """Run ``jobs`` in order on ``workers`` warm processes.
+
+    Returns a summary: counts by status, plus ``skipped`` (already done) and
+    ``not_started`` (left in the queue when the budget ran out).
+    """
+    jobs = list(jobs)
+    done = finished_job_ids(results_path) if resume else set()
+    pending = deque(j for j in jobs if j.id not in done)
+    summary: Dict[str, Any] = {"total": len(jobs), "skipped": len(jobs) - len(pending),
+                               "not_started": 0, "done": 0, "budget": 0, "cancelled": 0, "error": 0}
+    if not pending:
+        return summary
+
+    Path(results_path).parent.mkdir(parents=True, exist_ok=True)
+    deadline = time.time() + budget_s if budget_s > 0 else None
+    pool = [WarmWorker() for _ in range(max(1, min(int(workers), len(pending))))]
+    running: Dict[WarmWorker, _Running] = {}
+    expired = False
+
+    def _emit(out, rec: Dict[str, Any]) -> None:
+        out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        out.flush()
+        summary[rec["status"]] = summary.get(rec["status"], 0) + 1
+        if on_record:
+            on_record(rec)
+
+    with open(results_path, "a", encoding="utf-8") as out:
+        try:
+            while pending or running:
+                if deadline is not None and not expired and time.time() >= deadline:
+                    expired = True
+                    summary["not_started"] = len(pending)
+                    pending.clear()
+                    for w, run in running.items():
+                        run.budget_cut = True
+                        w.cancel()
+                for w in pool:
+                    if w not in running and pending:
+                        job = pending.popleft()
+                        w.submit(job.id, job.engine, job.container, job.inventory, job.options)
+                        running[w] = _Running(job)
+                if not running:
+                    break
+                timeout = 0.25 if deadline is None else max(0.0, min(0.25, deadline - time.time()))
+                by_conn = {w.conn: w for w in running}
+                for conn in wait(list(by_conn), timeout=timeout):
+                    w = by_conn[conn]
+                    run = running[w]
+                    try:
+                        msg = w.recv()
+                    except (EOFError, OSError) as e:
+                        # Worker died: record the job and replace the process
+                        del running[w]
+                        _emit(out, run.record("error", f"worker lost: {e}"))
+                        w.close(timeout=0.5)
+                        pool[pool.index(w)] = WarmWorker()
+                        continue
+                    if msg[0] == "event":
+                        ev = msg[2]
+                        if ev.get("type") == "solution":
+                            run.solutions.append(ev.get("solution"))
+                            if run.first_solution_ms is None:
+                                run.first_solution_ms = int((time.time() - run.t0) * 1000)
+                        elif ev.get("type") == "done":
+                            run.metrics = ev.get("metrics", {})
+                    elif msg[0] == "end":
+                        del running[w]
+                        _emit(out, run.record(msg[2], msg[3]))
+        finally:
+            for w in pool:
+                w.close()
+    return summary
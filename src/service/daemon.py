@@ -0,0 +1,286 @@
+"""Solver daemon: a bounded pool of warm workers fed from a job queue.
+
+Jobs are described by a request dict::
+
+    {"container": "path/to/shape.fcc.json"   # or "cid": "sha256:..."
+     "inventory": {"A": 1, ...}               # or {"pieces": {...}}; default A..Y x1
+     "engine": "dfs",
+     "options": {"seed": 9000, "max_results": 1, ...}}
+
+Containers are loaded and validated once and kept in memory (by path, and
+by cid for the configured containers directory). Each worker slot is served
+by a relay thread that forwards worker messages into the job's event queue.
+That queue holds at most ``max_job_events`` events: when a client reads too
+slowly, ``tick`` events are dropped (and counted in ``dropped_ticks``) and
+other events wait for room, which in turn stops the relay from reading the
+worker's pipe until the client catches up. A cancelled job's events are
+discarded instead, so an abandoned stream never blocks its worker slot.
+"""
+
+from __future__ import annotations
+import itertools
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..io.container import load_container
+from ..solver.registry import available_engines
+from .workers import WarmWorker
+
+DEFAULT_OPTIONS: Dict[str, Any] = {"seed": 9000, "max_results": 1}
+MAX_JOB_EVENTS = 1024
+
+
+@dataclass
+class Job:
+    id: str
+    engine: str
+    container: Dict[str, Any]
+    inventory: Dict[str, Any]
+    options: Dict[str, Any]
+    status: str = "queued"  # queued | running | done | cancelled | error
+    error: Optional[str] = None
+    submitted_ms: int = field(default_factory=lambda: int(time.time() * 1000))
+    started_ms: Optional[int] = None
+    finished_ms: Optional[int] = None
+    events: "queue.Queue[Optional[Dict[str, Any]]]" = field(
+        default_factory=lambda: queue.Queue(MAX_JOB_EVENTS), repr=False)
+    dropped_ticks: int = 0
+    cancel_requested: bool = False
+    worker: Optional[WarmWorker] = field(default=None, repr=False)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "job": self.id,
+            "engine": self.engine,
+            "cid": self.container.get("cid_sha256"),
+            "status": self.status,
+            "error": self.error,
+            "submitted_ms": self.submitted_ms,
+            "started_ms": self.started_ms,
+            "finished_ms": self.finished_ms,
+            "dropped_ticks": self.dropped_ticks,
+        }
+
+
+class QueueFull(Exception):
+    """Raised when the daemon's pending-job queue is at capacity."""
+
+
+class SolverDaemon:
+    """Keeps warm solver processes and schedules jobs onto them."""
+
+    def __init__(self, workers: int = 2, max_queue: int = 64,
+                 containers_dir: Optional[str] = None, max_jobs_kept: int = 256,
+                 max_job_events: int = MAX_JOB_EVENTS):
+        self.num_workers = max(1, int(workers))
+        self.max_queue = max(1, int(max_queue))
+        self.max_job_events = max(1, int(max_job_events))
+        self.containers_dir = containers_dir
+        self.max_jobs_kept = max_jobs_kept
+        self._pending: "queue.Queue[Optional[Job]]" = queue.Queue()
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._workers: List[WarmWorker] = []
+        self._threads: List[threading.Thread] = []
+        self._containers_by_path: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._containers_by_cid: Optional[Dict[str, Dict[str, Any]]] = None
+        self._running = False
+
+    # ---------------- lifecycle ----------------
+    def start(self) -> "SolverDaemon":
+        self._running = True
+        self._workers = [WarmWorker() for _ in range(self.num_workers)]
+        for w in self._workers:
+            w.wait_ready()
+        for i in range(self.num_workers):
+            t = threading.Thread(target=self._relay_loop, args=(i,), name=f"relay-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def stop(self) -> None:
+        self._running = False
+        with self._lock:
+            for job in self._jobs.values():
+                if job.status in ("queued", "running"):
+                    job.cancel_requested = True
+                    if job.worker:
+                        job.worker.cancel()
+        for _ in self._threads:
+            self._pending.put(None)
+        for t in self._threads:
+            t.join(timeout=5.0)
+        for w in self._workers:
+            w.close()
+        self._threads.clear()
+        self._workers.clear()
+
+    # ---------------- containers ----------------
+    def resolve_container(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if request.get("container"):
+            path = str(Path(request["container"]).resolve())
+            mtime = os.path.getmtime(path)
+            cached = self._containers_by_path.get(path)
+            if cached and cached[0] == mtime:
+                return cached[1]
+            try:
+                container = load_container(path)
+            except Exception as e:  # bad JSON, schema ValidationError, malformed cells
+                raise ValueError(f"invalid container {path}: {getattr(e, 'message', e)}") from e
+            self._containers_by_path[path] = (mtime, container)
+            return container
+        if request.get("cid"):
+            cid = str(request["cid"])
+            index = self._cid_index()
+            container = index.get(cid) or index.get(f"sha256:{cid}")
+            if container is None:
+                raise ValueError(f"unknown container cid: {cid}")
+            return container
+        raise ValueError("request needs 'container' (path) or 'cid'")
+
+    def _cid_index(self) -> Dict[str, Dict[str, Any]]:
+        if self._containers_by_cid is None:
+            index: Dict[str, Dict[str, Any]] = {}
+            if self.containers_dir:
+                for p in sorted(Path(self.containers_dir).glob("*.json")):
+                    try:
+                        c = load_container(str(p))
+                    except Exception:
+                        continue  # skip legacy / invalid files
+                    index[c["cid"]] = c
+                    index[c["cid_sha256"]] = c
+            self._containers_by_cid = index
+        return self._containers_by_cid
+
+    # ---------------- jobs ----------------
+    def submit(self, request: Dict[str, Any]) -> Job:
+        if not self._running:
+            raise RuntimeError("daemon is not running")
+        engine = request.get("engine", "dfs")
+        if engine not in available_engines():
+            raise ValueError(f"engine must be one of: {', '.join(available_engines())}")
+        container = self.resolve_container(request)
+        inventory = request.get("inventory") or {chr(ord('A') + i): 1 for i in range(25)}
+        if "pieces" not in inventory:
+            inventory = {"pieces": inventory}
+        options = {**DEFAULT_OPTIONS, **(request.get("options") or {})}
+        with self._lock:
+            if self._pending.qsize() >= self.max_queue:
+                raise QueueFull(f"job queue full ({self.max_queue} pending)")
+            job = Job(id=f"job-{next(self._ids)}", engine=engine, container=container,
+                      inventory=inventory, options=options, events=queue.Queue(self.max_job_events))
+            self._jobs[job.id] = job
+            self._trim_jobs()
+        self._pending.put(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status not in ("queued", "running"):
+                return False
+            job.cancel_requested = True
+            if job.worker is not None:
+                job.worker.cancel()
+            return True
+
+    def stream(self, job: Job) -> Iterator[Dict[str, Any]]:
+        """Yield the job's engine events, then a final ``end`` record."""
+        while True:
+            ev = job.events.get()
+            if ev is None:
+                break
+            yield ev
+        yield {"type": "end", **job.summary()}
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            jobs = [j.summary() for j in self._jobs.values()]
+        return {
+            "workers": self.num_workers,
+            "busy": sum(1 for j in jobs if j["status"] == "running"),
+            "queued": sum(1 for j in jobs if j["status"] == "queued"),
+            "engines": available_engines(),
+            "jobs": jobs,
+        }
+
+    def _trim_jobs(self) -> None:
+        finished = [j for j in self._jobs.values() if j.status not in ("queued", "running")]
+        for j in finished[:max(0, len(self._jobs) - self.max_jobs_kept)]:
+            del self._jobs[j.id]
+
+    def _finish(self, job: Job, status: str, error: Optional[str] = None) -> None:
+        with self._lock:
+            job.status = status
+            job.error = error
+            job.worker = None
+            job.finished_ms = int(time.time() * 1000)
+        self._deliver(job, None)
+
+    def _deliver(self, job: Job, ev: Optional[Dict[str, Any]]) -> None:
+        """Queue ``ev`` (``None`` ends the stream) for the job's reader; see the module doc."""
+        if ev is not None and ev.get("type") == "tick":
+            try:
+                job.events.put_nowait(ev)
+            except queue.Full:
+                job.dropped_ticks += 1
+            return
+        while True:
+            try:
+                job.events.put(ev, timeout=0.1)
+                return
+            except queue.Full:
+                if job.cancel_requested or not self._running:
+                    if ev is not None:
+                        return
+                    try:
+                        job.events.get_nowait()  # make room for the end of stream
+                    except queue.Empty:
+                        pass
+
+    def _relay_loop(self, slot: int) -> None:
+        while self._running:
+            job = self._pending.get()
+            if job is None:
+                return
+            worker = self._workers[slot]
+            try:
+                # A replacement worker may still be warming up: wait outside the
+                # lock so cancel(), status() and submit() stay responsive.
+                worker.wait_ready()
+                with self._lock:
+                    # Submit under the lock so a concurrent cancel() cannot be
+                    # cleared by the worker's per-job reset of its cancel event.
+                    if job.cancel_requested:
+                        job.status = "cancelled"
+                    else:
+                        job.status = "running"
+                        job.worker = worker
+                        job.started_ms = int(time.time() * 1000)
+                        worker.submit(job.id, job.engine, job.container, job.inventory, job.options)
+                if job.status == "cancelled":
+                    self._finish(job, "cancelled")
+                    continue
+                while True:
+                    msg = worker.recv()
+                    if msg[0] == "event":
+                        self._deliver(job, msg[2])
+                    elif msg[0] == "end":
+                        status = "cancelled" if job.cancel_requested and msg[2] != "error" else msg[2]
+                        self._finish(job, status, msg[3])
+                        break
+            except (EOFError, OSError) as e:
+                # Worker died: report and replace it with a fresh warm one
+                self._finish(job, "error", f"worker lost: {e}")
+                worker.close(timeout=0.5)
+                if self._running:
+                    self._workers[slot] = WarmWorker()
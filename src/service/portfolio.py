@@ -0,0 +1,150 @@
+"""Portfolio solving: race diversified engine configurations in parallel.
+
+Each member is an ``(engine, options)`` configuration run in its own warm
+worker process. Members stream ``tick`` events (tagged with ``member``); the
+first member to reach ``max_results`` solutions wins, its solutions are
+emitted and every other member is cancelled. The final ``done`` event
+carries the winner's metrics plus a ``portfolio`` report::
+
+    {"winner": {"member": 2, "engine": "dfs", "options": {...}},
+     "members": [{"member": 0, "engine": "dlx", "status": "cancelled",
+                  "solutions": 0, "elapsed_ms": 812, "metrics": {...}}, ...]}
+
+A portfolio file is a JSON list of ``{"engine": ..., "options": {...}}``.
+Members without an explicit ``seed`` get ``base_seed + member``. When the
+configs are cycled, an explicit seed is offset by the cycle number, so
+repeated configs still diverge.
+"""
+
+from __future__ import annotations
+import json
+import time
+from dataclasses import dataclass, field
+from multiprocessing.connection import wait
+from typing import Any, Dict, Iterator, List, Optional
+
+from .workers import WarmWorker
+
+DEFAULT_PORTFOLIO: List[Dict[str, Any]] = [
+    {"engine": "dlx", "options": {}},
+    {"engine": "dfs", "options": {"target_policy": "coverage", "restart_schedule": "luby", "restart_base": 500}},
+    {"engine": "dfs", "options": {"target_policy": "coverage", "hole_pruning": "lt4"}},
+    {"engine": "dfs", "options": {"mrv_window": 8, "hole_pruning": "single_component", "pivot_cycle": True}},
+]
+
+
+@dataclass
+class Member:
+    index: int
+    engine: str
+    options: Dict[str, Any]
+    status: str = "pending"  # pending | running | won | done | cancelled | error
+    error: Optional[str] = None
+    solutions: List[Dict[str, Any]] = field(default_factory=list)
+    metrics: Dict[str, Any] = field(default_factory=dict)
+    elapsed_ms: int = 0
+
+    def report(self) -> Dict[str, Any]:
+        return {"member": self.index, "engine": self.engine, "options": self.options,
+                "status": self.status, "error": self.error, "solutions": len(self.solutions),
+                "elapsed_ms": self.elapsed_ms, "metrics": self.metrics}
+
+
+def load_portfolio(path: str) -> List[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    if not isinstance(entries, list) or not entries:
+        raise ValueError("portfolio file must hold a non-empty JSON list of {engine, options} objects")
+    return [{"engine": str(e.get("engine", "dfs")), "options": dict(e.get("options") or {})} for e in entries]
+
+
+def build_members(configs: List[Dict[str, Any]], size: int, base_options: Dict[str, Any]) -> List[Member]:
+    """Cycle through ``configs`` to fill ``size`` members with distinct seeds."""
+    base_seed = int(base_options.get("seed", 0))
+    members = []
+    for i in range(max(1, size)):
+        cycle, k = divmod(i, len(configs))
+        cfg = configs[k]
+        opts = {**base_options, **cfg.get("options", {})}
+        if "seed" in cfg.get("options", {}):
+            opts["seed"] = int(cfg["options"]["seed"]) + cycle
+        else:
+            opts["seed"] = base_seed + i
+        members.append(Member(index=i, engine=cfg["engine"], options=opts))
+    return members
+
+
+def race(container: Dict[str, Any], inventory: Dict[str, Any], members: List[Member],
+         max_results: int = 1, cancel_grace_s: float = 5.0) -> Iterator[Dict[str, Any]]:
+    """Run ``members`` concurrently and yield the race's events (see module doc)."""
+    t0 = time.time()
+    workers = [WarmWorker() for _ in members]
+    by_conn = {}
+    try:
+        for w, m in zip(workers, members):
+            opts = {**m.options, "max_results": max_results}
+            w.submit(f"member-{m.index}", m.engine, container, inventory, opts)
+            m.status = "running"
+            by_conn[w.conn] = (w, m)
+        winner: Optional[Member] = None
+        cancel_deadline: Optional[float] = None
+        while by_conn:
+            timeout = None if cancel_deadline is None else max(0.0, cancel_deadline - time.time())
+            ready = wait(list(by_conn), timeout=timeout)
+            if not ready:
+                break  # cancelled members did not stop in time; close() terminates them
+            for conn in ready:
+                w, m = by_conn[conn]
+                try:
+                    msg = w.recv()
+                except (EOFError, OSError) as e:
+                    m.status, m.error = "error", f"worker lost: {e}"
+                    m.elapsed_ms = int((time.time() - t0) * 1000)
+                    del by_conn[conn]
+                    continue
+                if msg[0] == "event":
+                    ev = msg[2]
+                    etype = ev.get("type")
+                    if etype == "tick":
+                        yield {**ev, "member": m.index}
+                    elif etype == "solution" and winner is None:
+                        m.solutions.append(ev)
+                        if len(m.solutions) >= max_results:
+                            winner = m
+                            m.status = "won"
+                            for other_w, other in by_conn.values():
+                                if other is not m:
+                                    other_w.cancel()
+                            cancel_deadline = time.time() + cancel_grace_s
+                            for sol in m.solutions:
+                                yield {**sol, "member": m.index}
+                    elif etype == "done":
+                        m.metrics = ev.get("metrics", {})
+                elif msg[0] == "end":
+                    if m.status != "won":
+                        m.status = "cancelled" if winner is not None and msg[2] != "error" else msg[2]
+                    m.error = msg[3]
+                    m.elapsed_ms = int((time.time() - t0) * 1000)
+                    del by_conn[conn]
+        for _, m in by_conn.values():
+            m.status = "cancelled"
+            m.elapsed_ms = int((time.time() - t0) * 1000)
+    finally:
+        for w in workers:
+            w.close(timeout=1.0)
+
+    report: Dict[str, Any] = {
+        "winner": None if winner is None else {"member": winner.index, "engine": winner.engine,
+                                               "options": winner.options},
+        "members": [m.report() for m in members],
+    }
+    if winner is not None:
+        metrics = dict(winner.metrics)
+    else:
+        # No winner: report the best effort (most solutions, then deepest)
+        best = max(members, key=lambda m: (len(m.solutions), m.metrics.get("max_depth_reached", 0)))
+        metrics = dict(best.metrics)
+        for sol in best.solutions:
+            yield {**sol, "member": best.index}
+    metrics["portfolio"] = report
+    yield {"type": "done", "t_ms": int((time.time() - t0) * 1000), "metrics": metrics}
@@ -0,0 +1,153 @@
+"""Transports for the solver daemon.
+
+Two front-ends share one dispatcher:
+
+* JSON lines over a Unix stream socket. A client sends one request object
+  per connection and reads newline-delimited replies::
+
+      {"op": "solve", "container": "...", "inventory": {...}, "engine": "dfs", "options": {...}}
+        -> {"type": "accepted", "job": "job-1"}, then engine events, then {"type": "end", ...}
+      {"op": "cancel", "job": "job-1"}   -> {"ok": true}
+      {"op": "status"}                   -> {"workers": 2, "busy": 1, ...}
+      {"op": "shutdown"}                 -> {"ok": true}
+
+* Local HTTP: ``POST /solve`` streams the same lines as ``application/x-ndjson``;
+  ``POST /jobs/<id>/cancel``, ``GET /status`` and ``POST /shutdown``.
+
+A client that disconnects while its job streams cancels that job.
+"""
+
+from __future__ import annotations
+import json
+import os
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from .daemon import SolverDaemon, QueueFull
+
+
+def _line(obj: Dict[str, Any]) -> bytes:
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def dispatch(daemon: SolverDaemon, request: Dict[str, Any],
+             on_shutdown: Callable[[], None]) -> Iterator[Dict[str, Any]]:
+    """Handle one request; yields the reply records in order."""
+    if not isinstance(request, dict):
+        yield {"type": "error", "error": "bad request: expected a JSON object"}
+        return
+    op = request.get("op", "solve")
+    if op == "solve":
+        try:
+            job = daemon.submit(request)
+        except QueueFull as e:
+            yield {"type": "error", "error": str(e), "retry": True}
+            return
+        except (ValueError, OSError) as e:
+            yield {"type": "error", "error": str(e)}
+            return
+        yield {"type": "accepted", "job": job.id}
+        finished = False
+        try:
+            for ev in daemon.stream(job):
+                yield ev
+            finished = True
+        finally:
+            if not finished:
+                daemon.cancel(job.id)
+    elif op == "cancel":
+        yield {"ok": daemon.cancel(str(request.get("job", "")))}
+    elif op == "status":
+        yield daemon.status()
+    elif op == "shutdown":
+        yield {"ok": True}
+        on_shutdown()
+    else:
+        yield {"type": "error", "error": f"unknown op: {op}"}
+
+
+class _LineHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        raw = self.rfile.readline()
+        try:
+            request = json.loads(raw.decode("utf-8") or "{}")
+        except ValueError as e:
+            self.wfile.write(_line({"type": "error", "error": f"bad request: {e}"}))
+            return
+        replies = dispatch(self.server.daemon, request, self.server.request_shutdown)
+        try:
+            for rec in replies:
+                self.wfile.write(_line(rec))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            replies.close()  # runs dispatch's finally -> cancels the job
+
+
+class _HTTPHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.0"  # close-delimited streaming bodies
+
+    def log_message(self, fmt, *args):  # keep the daemon's stderr quiet
+        pass
+
+    def _reply(self, replies: Iterator[Dict[str, Any]], status: int = 200):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        try:
+            for rec in replies:
+                self.wfile.write(_line(rec))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            replies.close()
+
+    def _body(self) -> Dict[str, Any]:
+        n = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(n).decode("utf-8")) if n else {}
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/status":
+            self._reply(dispatch(self.server.daemon, {"op": "status"}, self.server.request_shutdown))
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        path = self.path.rstrip("/")
+        try:
+            body = self._body()
+        except ValueError as e:
+            self._reply(iter([{"type": "error", "error": f"bad request: {e}"}]), status=400)
+            return
+        if path == "/solve":
+            request = {**body, "op": "solve"} if isinstance(body, dict) else body
+        elif path.startswith("/jobs/") and path.endswith("/cancel"):
+            request = {"op": "cancel", "job": path[len("/jobs/"):-len("/cancel")]}
+        elif path == "/shutdown":
+            request = {"op": "shutdown"}
+        else:
+            self.send_error(404)
+            return
+        self._reply(dispatch(self.server.daemon, request, self.server.request_shutdown))
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def _attach(server, daemon: SolverDaemon):
+    server.daemon = daemon
+    server.request_shutdown = lambda: threading.Thread(target=server.shutdown, daemon=True).start()
+    return server
+
+
+def make_server(daemon: SolverDaemon, unix_path: Optional[str] = None,
+                host: str = "127.0.0.1", port: int = 8765):
+    """Create (but do not start) a Unix-socket or HTTP server bound to ``daemon``."""
+    if unix_path:
+        if os.path.exists(unix_path):
+            os.unlink(unix_path)
+        return _attach(_UnixServer(unix_path, _LineHandler), daemon)
+    server = ThreadingHTTPServer((host, port), _HTTPHandler)
+    server.daemon_threads = True
+    return _attach(server, daemon)
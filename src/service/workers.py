@@ -0,0 +1,123 @@
+"""Warm solver worker processes.
+
+A worker imports every registered engine and builds the piece library once
+at start-up, then runs jobs sent over a pipe and streams the engine events
+back. Per-container tables (preflight results, placement tables) are kept
+in a ``TableCache`` keyed by container cid, so repeated jobs on a container
+skip rebuilding them. Each worker owns a cancel event that is handed to the engine as the
+``cancel`` option, so a running job can be stopped without killing the
+process (and losing the warm state).
+"""
+
+from __future__ import annotations
+import multiprocessing as mp
+import time
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# Messages sent worker -> parent:
+#   ("ready", pid)
+#   ("event", job_id, event_dict)
+#   ("end", job_id, status, error_message_or_None)   status: done | cancelled | error
+Message = Tuple[Any, ...]
+
+
+def _warm_state() -> Dict[str, Any]:
+    from ..pieces.library_fcc_v1 import load_fcc_A_to_Y
+    from ..solver.registry import available_engines, get_engine
+    from ..coords.symmetry_fcc import ROTATIONS_24  # noqa: F401  (built at import)
+    from ..solver.table_cache import TableCache
+    pieces = load_fcc_A_to_Y()
+    for name in available_engines():
+        get_engine(name)
+    return {"pieces": pieces, "tables": TableCache()}
+
+
+def _worker_main(conn, cancel_ev) -> None:
+    import signal
+    from ..solver.registry import get_engine
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the parent owns shutdown
+    state = _warm_state()
+    conn.send(("ready", mp.current_process().pid))
+    while True:
+        try:
+            msg = conn.recv()
+        except EOFError:
+            break
+        if msg is None:
+            break
+        job_id, engine_name, container, inventory, options = msg
+        opts = dict(options)
+        opts["cancel"] = cancel_ev.is_set
+        opts["table_cache"] = state["tables"]
+        t0 = time.time()
+        try:
+            engine = get_engine(engine_name)
+            for ev in engine.solve(container, inventory, state["pieces"], opts):
+                ev.setdefault("t_ms", int((time.time() - t0) * 1000))
+                conn.send(("event", job_id, ev))
+            status = "cancelled" if cancel_ev.is_set() else "done"
+            conn.send(("end", job_id, status, None))
+        except (Exception, SystemExit) as e:  # SystemExit: unknown engine in registry
+            conn.send(("end", job_id, "error", f"{type(e).__name__}: {e}"))
+
+
+class WarmWorker:
+    """One warm solver process plus its pipe and cancel event."""
+
+    def __init__(self, ctx: Optional[mp.context.BaseContext] = None):
+        ctx = ctx or mp.get_context()
+        self.cancel_event = ctx.Event()
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child, self.cancel_event), daemon=True)
+        self.process.start()
+        child.close()
+        self.ready = False
+        self.job_id: Optional[str] = None
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        if not self.ready and self.conn.poll(timeout):
+            msg = self.conn.recv()
+            self.ready = msg[0] == "ready"
+        return self.ready
+
+    def submit(self, job_id: str, engine: str, container: Dict[str, Any],
+               inventory: Dict[str, Any], options: Dict[str, Any]) -> None:
+        """Start a job; results are read with ``recv``/``run``."""
+        self.wait_ready()
+        self.cancel_event.clear()
+        self.job_id = job_id
+        self.conn.send((job_id, engine, container, inventory, options))
+
+    def recv(self) -> Message:
+        msg = self.conn.recv()
+        if msg[0] == "ready":
+            self.ready = True
+            return self.recv()
+        if msg[0] == "end":
+            self.job_id = None
+        return msg
+
+    def run(self, job_id: str, engine: str, container: Dict[str, Any],
+            inventory: Dict[str, Any], options: Dict[str, Any]) -> Iterator[Message]:
+        """Submit a job and yield its messages up to and including ``end``."""
+        self.submit(job_id, engine, container, inventory, options)
+        while True:
+            msg = self.recv()
+            yield msg
+            if msg[0] == "end":
+                return
+
+    def cancel(self) -> None:
+        self.cancel_event.set()
+
+    def close(self, timeout: float = 2.0) -> None:
+        try:
+            self.cancel_event.set()
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout)
+        self.conn.close()
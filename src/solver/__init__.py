@@ -2,16 +2,28 @@
 
 This module provides the main solving infrastructure including
 engine APIs, heuristics, pruning strategies, and symmetry breaking.
+
+Engine classes are resolved lazily (PEP 562) so importing ``src.solver``
+does not pull in every engine and its dependencies.
 """
 
 from .engine_api import EngineProtocol, EngineOptions, SolveEvent
-from .engines.current_engine import CurrentEngine
-from .engines.dfs_engine import DFSEngine
 from .registry import get_engine
 
+_LAZY = {
+    "CurrentEngine": ".engines.current_engine",
+    "DFSEngine": ".engines.dfs_engine",
+}
+
+def __getattr__(name):
+    if name in _LAZY:
+        import importlib
+        return getattr(importlib.import_module(_LAZY[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 __all__ = [
     "EngineProtocol",
-    "EngineOptions", 
+    "EngineOptions",
     "SolveEvent",
     "CurrentEngine",
     "DFSEngine",
@@ -0,0 +1,144 @@
+"""Lattice-colouring parity pruning.
+
+A colouring gives every lattice cell one of ``m`` colours; a placement then
+covers a fixed colour-count vector. The empty cells of a search node must be
+covered by exactly ``empty / 4`` pieces from the remaining bag, so their
+colour-count vector has to be a sum of one achievable vector per piece used.
+When it is not, the node has no solution.
+
+Colourings are built from bits ``(a . x) mod 2``:
+
+* 4-colourings from pairs of coordinate bits, ``2 * bit_a + bit_b``
+* the 2-colouring ``(i + j + k) mod 2``, not implied by any pair
+
+Per-orientation colour vectors come from the compiled piece library (built
+from ``sphere_orientations.PIECES``). Translating an orientation only flips
+colour bits, so a placement's vector is the orientation's vector with its
+colours permuted by the translation parity; the container's placements pick
+which (orientation, parity) vectors each piece can actually take.
+
+Empty-cell colour counts are popcounts of the free mask against per-colour
+cell masks, so they track the occupancy incrementally for free. Reachable
+sums are computed per (colouring, remaining bag) and cached (LRU).
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Dict, List, Sequence, Set, Tuple
+
+from .placement_gen import enumerate_placements
+
+I3 = Tuple[int, int, int]
+Bits = Tuple[I3, ...]
+
+COLOURINGS: Tuple[Bits, ...] = (
+    ((1, 0, 0), (0, 1, 0)),
+    ((0, 1, 0), (0, 0, 1)),
+    ((1, 0, 0), (0, 0, 1)),
+    ((1, 1, 1),),
+)
+
+try:
+    _popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def _popcount(x: int) -> int:
+        return bin(x).count("1")
+
+
+def colour_of(cell: Sequence[int], bits: Bits) -> int:
+    c = 0
+    for a in bits:
+        c = (c << 1) | ((a[0] * cell[0] + a[1] * cell[1] + a[2] * cell[2]) & 1)
+    return c
+
+
+def orientation_vector(ori: Sequence[I3], bits: Bits) -> Tuple[int, ...]:
+    """Colour counts of an orientation placed at the origin."""
+    v = [0] * (1 << len(bits))
+    for u in ori:
+        v[colour_of(u, bits)] += 1
+    return tuple(v)
+
+
+class ColouringPruner:
+    def __init__(self, cells: Sequence[I3], orientations: Dict[str, Sequence[Sequence[I3]]],
+                 piece_counts: Dict[str, int], colourings: Sequence[Bits] = COLOURINGS,
+                 cache_size: int = 50_000):
+        self.cells = [tuple(c) for c in cells]
+        self.pieces = sorted(p for p, n in piece_counts.items() if int(n) > 0 and p in orientations)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[int, Tuple[int, ...]], Set[int]]" = OrderedDict()
+        self.checks = 0
+        self.prunes = 0
+
+        rows = enumerate_placements(self.cells, orientations, self.pieces)
+        n = len(self.cells)
+        # Sums are packed into one int, one digit per colour (last colour is implied)
+        self.base = n + 1
+        self.colourings: List[Tuple[List[int], Dict[str, Tuple[int, ...]]]] = []
+        for bits in colourings:
+            m = 1 << len(bits)
+            masks = [0] * m
+            for i, c in enumerate(self.cells):
+                masks[colour_of(c, bits)] |= 1 << i
+            ori_vec = {(p, o): orientation_vector(orientations[p][o], bits)
+                       for p in self.pieces for o in range(len(orientations[p]))}
+            values: Dict[str, Set[int]] = {p: set() for p in self.pieces}
+            for piece, o, t, _ in rows:
+                flip = colour_of(t, bits)  # translation XORs every cell's colour
+                base_vec = ori_vec[(piece, o)]
+                values[piece].add(self._pack([base_vec[c ^ flip] for c in range(m)]))
+            self.colourings.append((masks, {p: tuple(sorted(v)) for p, v in values.items()}))
+
+    def _pack(self, vec: Sequence[int]) -> int:
+        key = 0
+        for x in vec[:-1]:
+            key = key * self.base + x
+        return key
+
+    def _reachable(self, k: int, bag: Tuple[int, ...], need: int) -> Set[int]:
+        key = (k, bag)
+        hit = self._cache.get(key)
+        if hit is not None:
+            self._cache.move_to_end(key)
+            return hit
+        values = self.colourings[k][1]
+        reach: List[Set[int]] = [set() for _ in range(need + 1)]
+        reach[0].add(0)
+        for p, count in zip(self.pieces, bag):
+            vals = values[p]
+            if not count or not vals:
+                continue
+            layers = [set(r) for r in reach]
+            frontier = reach
+            for _ in range(min(count, need)):
+                step: List[Set[int]] = [set() for _ in range(need + 1)]
+                for u in range(need):
+                    if frontier[u]:
+                        step[u + 1] = {x + v for x in frontier[u] for v in vals}
+                for u in range(1, need + 1):
+                    layers[u] |= step[u]
+                frontier = step
+            reach = layers
+        out = reach[need]
+        self._cache[key] = out
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return out
+
+    def feasible(self, occupied_mask: int, bag_counts: Dict[str, int]) -> bool:
+        """False if some colouring proves the empty cells cannot be covered
+        by the remaining bag."""
+        free = ~occupied_mask & ((1 << len(self.cells)) - 1)
+        empty = _popcount(free)
+        if empty == 0:
+            return True
+        need = empty // 4
+        bag = tuple(min(int(bag_counts.get(p, 0)), need) for p in self.pieces)
+        self.checks += 1
+        for k, (masks, _) in enumerate(self.colourings):
+            target = self._pack([_popcount(free & m) for m in masks])
+            if target not in self._reachable(k, bag, need):
+                self.prunes += 1
+                return False
+        return True
@@ -0,0 +1,192 @@
+"""Independent solving of disconnected empty regions.
+
+When placements split the empty cells into several components that no
+placement can span, the components are independent sub-problems coupled
+only through the remaining bag. Searching them together multiplies their
+trees; solving them apart costs the sum.
+
+``empty_components`` splits an empty mask by bitmask flood fill over
+per-cell neighbour masks. ``RegionTilings`` enumerates, for one region and a
+bag, every distinct piece multiset that tiles it, with one witness tiling
+each, or with ``all_tilings=True`` every tiling. Results are memoized by
+(translation-normalised region shape, bag capped at the region's piece
+need), so a region reappearing anywhere in the container is solved once.
+
+``split_fills`` solves the small components smallest first and enumerates
+how the bag is partitioned across them. With witnesses only, it yields one
+combined fill per distinct total piece usage, so the rest of the search
+runs once per leftover bag; that finds a first solution but not all of
+them. With ``all_tilings`` it yields every combination of component
+tilings. A small component with no tiling yields nothing, which kills the
+branch before the other components are explored.
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .placement_gen import PlacementRow, enumerate_placements
+
+I3 = Tuple[int, int, int]
+Usage = Tuple[int, ...]
+
+
+class RegionBudgetExceeded(Exception):
+    """Raised when a region takes more than ``node_budget`` search nodes."""
+
+
+def empty_components(empty_mask: int, neighbor_masks: Sequence[int]) -> List[int]:
+    """Connected components of ``empty_mask`` as bitmasks, smallest first."""
+    comps = []
+    rest = empty_mask
+    while rest:
+        comp = frontier = rest & -rest
+        while frontier:
+            grow = 0
+            f = frontier
+            while f:
+                low = f & -f
+                grow |= neighbor_masks[low.bit_length() - 1]
+                f ^= low
+            frontier = grow & rest & ~comp
+            comp |= frontier
+        comps.append(comp)
+        rest &= ~comp
+    comps.sort(key=lambda m: bin(m).count("1"))
+    return comps
+
+
+class RegionTilings:
+    """Piece multisets that tile a region, memoized by region shape.
+
+    ``node_budget`` bounds the search nodes plus, with ``all_tilings``, the
+    tilings built, per region.
+    """
+
+    def __init__(self, orientations: Dict[str, Sequence[Sequence[I3]]], pieces: Sequence[str],
+                 placement_filter: Optional[Callable[[PlacementRow], bool]] = None,
+                 node_budget: int = 50_000, cache_size: int = 10_000, all_tilings: bool = False):
+        self.orientations = orientations
+        self.pieces = sorted(pieces)
+        self.placement_filter = placement_filter
+        self.node_budget = node_budget
+        self.cache_size = cache_size
+        self.all_tilings = all_tilings
+        self._cache: "OrderedDict[Tuple[Tuple[I3, ...], Usage], Optional[Dict[Usage, List[List[PlacementRow]]]]]" = OrderedDict()
+        self.hits = 0
+        self.solved = 0
+
+    def tilings(self, cells: Sequence[I3], bag: Usage) -> Dict[Usage, List[List[PlacementRow]]]:
+        """``{usage: [rows, ...]}`` for every way ``bag`` can tile ``cells``: one
+        witness tiling per usage, or all of them with ``all_tilings``. Usage
+        vectors are indexed like ``self.pieces``. Raises
+        ``RegionBudgetExceeded`` for regions too large to solve on their own."""
+        cells = sorted(cells)
+        o = cells[0]
+        shape = tuple((c[0] - o[0], c[1] - o[1], c[2] - o[2]) for c in cells)
+        need = len(cells) // 4
+        key = (shape, tuple(min(n, need) for n in bag))
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            hit = self._cache[key]
+        else:
+            try:
+                hit = self._solve(shape, key[1])
+            except RegionBudgetExceeded:
+                hit = None  # remembered, so the region is not retried
+            self._cache[key] = hit
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        if hit is None:
+            raise RegionBudgetExceeded()
+        return {u: [[(p, r, (t[0] + o[0], t[1] + o[1], t[2] + o[2]),
+                      tuple((c[0] + o[0], c[1] + o[1], c[2] + o[2]) for c in cs))
+                     for p, r, t, cs in rows]
+                    for rows in found]
+                for u, found in hit.items()}
+
+    def _solve(self, shape: Tuple[I3, ...], bag: Usage) -> Dict[Usage, List[List[PlacementRow]]]:
+        self.solved += 1
+        n = len(shape)
+        if n % 4:
+            return {}
+        index = {c: i for i, c in enumerate(shape)}
+        slot = {p: s for s, p in enumerate(self.pieces)}
+        rows = enumerate_placements(shape, self.orientations, [p for p, k in zip(self.pieces, bag) if k])
+        if self.placement_filter is not None:
+            rows = [r for r in rows if self.placement_filter(r)]
+        covers: List[List[Tuple[int, int, int]]] = [[] for _ in range(n)]
+        for q, (piece, _, _, cs) in enumerate(rows):
+            m = sum(1 << index[c] for c in cs)
+            for c in cs:
+                covers[index[c]].append((q, m, slot[piece]))
+        full = (1 << n) - 1
+        every = self.all_tilings
+        memo: Dict[Tuple[int, Usage], Dict[Usage, List[Tuple]]] = {}
+        nodes = 0
+
+        def rec(mask: int, left: Usage) -> Dict[Usage, List[Tuple]]:
+            # usage added from here on -> tilings as cons lists (placement, rest)
+            nonlocal nodes
+            if mask == full:
+                return {(0,) * len(left): [None]}
+            key = (mask, left)
+            hit = memo.get(key)
+            if hit is not None:
+                return hit
+            nodes += 1
+            if nodes > self.node_budget:
+                raise RegionBudgetExceeded()
+            free = ~mask & full
+            cell = (free & -free).bit_length() - 1
+            out: Dict[Usage, List[Tuple]] = {}
+            for q, m, s in covers[cell]:
+                if m & mask or not left[s]:
+                    continue
+                sub = rec(mask | m, left[:s] + (left[s] - 1,) + left[s + 1:])
+                for u, ws in sub.items():
+                    u = u[:s] + (u[s] + 1,) + u[s + 1:]
+                    if every:
+                        nodes += len(ws)
+                        if nodes > self.node_budget:
+                            raise RegionBudgetExceeded()
+                        out.setdefault(u, []).extend((q, w) for w in ws)
+                    elif u not in out:
+                        out[u] = [(q, ws[0])]
+            memo[key] = out
+            return out
+
+        result = {}
+        for u, ws in rec(0, bag).items():
+            found = []
+            for w in ws:
+                placed = []
+                while w is not None:
+                    q, w = w
+                    placed.append(rows[q])
+                found.append(placed)
+            result[u] = found
+        return result
+
+
+def split_fills(region_cells: Sequence[Sequence[I3]], bag: Usage,
+                tilings: RegionTilings) -> Iterator[Tuple[Usage, List[PlacementRow]]]:
+    """Combined fills of ``region_cells`` (smallest first) as ``(usage, rows)``:
+    one per distinct total usage of ``bag``, or every combination of
+    component tilings if ``tilings.all_tilings``."""
+    seen = set()
+    every = tilings.all_tilings
+
+    def rec(k: int, left: Usage, used: Usage, rows: List[PlacementRow]):
+        if k == len(region_cells):
+            if every or used not in seen:
+                seen.add(used)
+                yield used, rows
+            return
+        for u, found in tilings.tilings(region_cells[k], left).items():
+            for placed in found:
+                yield from rec(k + 1, tuple(a - b for a, b in zip(left, u)),
+                               tuple(a + b for a, b in zip(used, u)), rows + placed)
+
+    yield from rec(0, tuple(bag), (0,) * len(bag), [])
@@ -0,0 +1,244 @@
+"""Exhaustive solution counting without per-solution emission.
+
+``SolutionCounter`` counts exact covers of a container by the inventory
+(each piece used at most its count, every cell covered once). Leaves only
+increment a counter -- no placement lists, signatures or files -- and
+subtree counts are memoized by ``(occupied mask, remaining bag)``, so a
+sub-state reached through different placement orders is counted once.
+
+The symmetry-reduced total is the number of solution orbits under the
+container's symmetry group, by Burnside's lemma: ``orbits = sum(fix(g)) / |G|``.
+``fix(g)`` counts the solutions mapped onto themselves by ``g``; they are
+enumerated by placing whole ``<g>``-orbits of placements at once, with the
+same memo scheme per ``g``. The group (``container_symmetries``) holds every
+rotation followed by the translation that maps the cells onto themselves:
+containers are not centred on the origin, so rotations about the origin
+alone (``container_symmetry_group``) almost never fix one.
+
+``keep`` restricts the orientations that may be placed, e.g. to the
+R6-connected ones that pass DFS's final gate. If the kept placements are not
+closed under the whole group, ``count_events`` reduces by the subgroup that
+preserves them (``preserves``).
+
+``count_events`` wraps the counter in the engine event protocol; engines
+delegate to it when ``options["count_only"]`` is set.
+"""
+
+from __future__ import annotations
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .coverage import CoverageCounts
+from ..coords.symmetry_fcc import ROTATIONS_24, apply_rot
+from ..pieces.compiled import compiled_library
+
+I3 = Tuple[int, int, int]
+Rot = Tuple[I3, I3, I3]
+Sym = Tuple[Rot, I3]  # cell -> apply_rot(rot, cell) + translation
+IDENTITY: Rot = ((1, 0, 0), (0, 1, 0), (0, 0, 1))
+
+
+def container_symmetries(cells: Sequence[I3]) -> List[Sym]:
+    """Rotations plus translations mapping ``cells`` onto themselves.
+
+    A translation preserves the lexicographic order, so for each rotation the
+    only candidate shift maps the smallest rotated cell onto the smallest cell.
+    """
+    cells = [tuple(c) for c in cells]
+    if not cells:
+        return [(IDENTITY, (0, 0, 0))]
+    target = set(cells)
+    lo = min(cells)
+    group: List[Sym] = []
+    for rot in ROTATIONS_24:
+        rotated = [apply_rot(rot, c) for c in cells]
+        r = min(rotated)
+        t = (lo[0] - r[0], lo[1] - r[1], lo[2] - r[2])
+        if all((c[0] + t[0], c[1] + t[1], c[2] + t[2]) in target for c in rotated):
+            group.append((rot, t))
+    return group
+
+
+def _as_sym(g) -> Sym:
+    """Accept a bare rotation (about the origin) as well as a ``Sym``."""
+    return g if len(g) == 2 else (g, (0, 0, 0))
+
+
+class CountStopped(Exception):
+    """Raised inside the search when the time limit or cancel fires."""
+
+
+class SolutionCounter:
+    def __init__(self, cells: Sequence[I3], orientations: Dict[str, Sequence[Sequence[I3]]],
+                 piece_counts: Dict[str, int], time_limit: float = 0.0, cancel=None,
+                 keep: Optional[Callable[[Sequence[I3]], bool]] = None):
+        if keep is not None:
+            orientations = {p: [o for o in oris if keep(o)] for p, oris in orientations.items()}
+        self.cells = [tuple(c) for c in cells]
+        self.num_cells = len(self.cells)
+        self.full = (1 << self.num_cells) - 1
+        space = CoverageCounts(self.cells, orientations, piece_counts)
+        self.pieces = sorted(space.piece_counts)
+        piece_slot = {p: i for i, p in enumerate(self.pieces)}
+        self.bag0 = tuple(space.piece_counts[p] for p in self.pieces)
+        self.placement_slot = [piece_slot[p] for p in space.placement_piece]
+        self.placement_cells = space.placement_cells
+        self.placement_mask = [sum(1 << i for i in cs) for cs in space.placement_cells]
+        self.covers = space.covers
+        self.time_limit = time_limit
+        self.cancel = cancel
+        self.nodes = 0
+        self.memo_hits = 0
+        self.memo_entries = 0
+        self._t0 = time.time()
+
+    # ---------------- plain count ----------------
+    def count(self) -> int:
+        """Number of distinct solutions (placement sets) of the container."""
+        return self._count_orbits(None)
+
+    # ---------------- symmetry ----------------
+    def placement_image(self, g) -> Optional[List[int]]:
+        """Placement index map under ``g`` (a ``Sym`` or a bare rotation; -1
+        where the image is not a placement), or None if ``g`` does not map
+        the container onto itself."""
+        rot, t = _as_sym(g)
+        index = {c: i for i, c in enumerate(self.cells)}
+        perm = []
+        for c in self.cells:
+            x, y, z = apply_rot(rot, c)
+            j = index.get((x + t[0], y + t[1], z + t[2]))
+            if j is None:
+                return None
+            perm.append(j)
+        by_key = {(s, cs): q for q, (s, cs) in enumerate(zip(self.placement_slot, self.placement_cells))}
+        return [by_key.get((s, tuple(sorted(perm[i] for i in cs))), -1)
+                for s, cs in zip(self.placement_slot, self.placement_cells)]
+
+    def preserves(self, g) -> bool:
+        """True if ``g`` maps the container and its placement set onto themselves."""
+        image = self.placement_image(g)
+        return image is not None and -1 not in image
+
+    def count_fixed(self, g) -> int:
+        """Number of solutions mapped onto themselves by ``g``."""
+        image = self.placement_image(g)
+        return 0 if image is None else self._count_orbits(image)
+
+    def count_unique(self, group: Sequence, total: Optional[int] = None) -> Tuple[int, Dict[str, int]]:
+        """Symmetry-reduced count over ``group`` (``Sym``s or bare rotations)
+        plus per-element fixed counts. ``total`` (the plain count) is reused
+        for the identity element."""
+        fixed: Dict[str, int] = {}
+        acc = 0
+        for k, g in enumerate(group):
+            if _as_sym(g) == (IDENTITY, (0, 0, 0)) and total is not None:
+                n = total
+            else:
+                n = self.count_fixed(g)
+            fixed[str(k)] = n
+            acc += n
+        if acc % len(group):
+            raise AssertionError(f"Burnside sum {acc} not divisible by group order {len(group)}")
+        return acc // len(group), fixed
+
+    # ---------------- search ----------------
+    def _check_stop(self) -> None:
+        if self.time_limit > 0 and time.time() - self._t0 >= self.time_limit:
+            raise CountStopped("time_limit")
+        if self.cancel is not None and self.cancel():
+            raise CountStopped("cancelled")
+
+    def _orbit(self, q: int, image: Optional[List[int]]) -> Optional[Tuple[int, int]]:
+        """(mask, size) of the orbit of placement ``q``; None if it leaves the
+        placement set or its placements overlap."""
+        if image is None:
+            return self.placement_mask[q], 1
+        mask = 0
+        size = 0
+        p = q
+        while True:
+            m = self.placement_mask[p]
+            if mask & m:
+                return None
+            mask |= m
+            size += 1
+            p = image[p]
+            if p < 0:
+                return None
+            if p == q:
+                return mask, size
+
+    def _count_orbits(self, image: Optional[List[int]]) -> int:
+        memo: Dict[Tuple[int, Tuple[int, ...]], int] = {}
+        full = self.full
+        covers = self.covers
+        slots = self.placement_slot
+        orbits: Dict[int, Optional[Tuple[int, int]]] = {}
+
+        def rec(mask: int, bag: Tuple[int, ...]) -> int:
+            if mask == full:
+                return 1
+            key = (mask, bag)
+            hit = memo.get(key)
+            if hit is not None:
+                self.memo_hits += 1
+                return hit
+            self.nodes += 1
+            if (self.nodes & 0xFFF) == 0:
+                self._check_stop()
+            free = ~mask & full
+            cell = (free & -free).bit_length() - 1  # lowest empty cell: each cover counted once
+            total = 0
+            for q in covers[cell]:
+                s = slots[q]
+                if bag[s] == 0:
+                    continue
+                orb = orbits.get(q, False)
+                if orb is False:
+                    orb = orbits[q] = self._orbit(q, image)
+                if orb is None:
+                    continue
+                omask, size = orb
+                if omask & mask or bag[s] < size:
+                    continue
+                nb = bag[:s] + (bag[s] - size,) + bag[s + 1:]
+                total += rec(mask | omask, nb)
+            memo[key] = total
+            return total
+
+        result = rec(0, self.bag0)
+        self.memo_entries += len(memo)
+        return result
+
+
+def count_events(container, inventory, options,
+                 keep: Optional[Callable[[Sequence[I3]], bool]] = None) -> Iterator[Dict[str, Any]]:
+    """Engine-protocol wrapper: a single ``done`` event whose metrics carry the
+    raw (``solutions_total``) and symmetry-reduced (``solutions_unique``) counts.
+    ``keep`` is the engine's orientation filter (see ``SolutionCounter``)."""
+    t0 = time.time()
+    coords = container.get("coordinates") or container.get("cells", [])
+    cells = sorted(tuple(int(x) for x in c) for c in coords)
+    counts = inventory.get("pieces", inventory)
+    counts = {k: int(v) for k, v in counts.items() if int(v) > 0}
+    counter = SolutionCounter(cells, compiled_library().orientations, counts,
+                              time_limit=float(options.get("time_limit", 0) or 0),
+                              cancel=options.get("cancel"), keep=keep)
+    group = container_symmetries(cells)
+    if keep is not None:
+        group = [g for g in group if counter.preserves(g)]
+    metrics: Dict[str, Any] = {"count_only": True, "solutions_found": 0, "complete": True,
+                               "symmetry_group_order": len(group)}
+    try:
+        total = counter.count()
+        metrics["solutions_total"] = total
+        unique, fixed = counter.count_unique(group, total)
+        metrics["solutions_unique"] = unique
+        metrics["fixed_by_symmetry"] = fixed
+    except CountStopped as e:
+        metrics["complete"] = False
+        metrics["stopped"] = str(e)
+    metrics.update({"nodes_explored": counter.nodes, "memo_entries": counter.memo_entries,
+                    "memo_hits": counter.memo_hits, "time_elapsed": time.time() - t0})
+    yield {"type": "done", "t_ms": int((time.time() - t0) * 1000), "metrics": metrics}
@@ -0,0 +1,144 @@
+"""Incremental per-cell coverage counts for exact MRV target selection.
+
+``CoverageCounts`` enumerates every placement of the available pieces inside
+a container once, then tracks for each empty cell how many placements that
+cover it are still feasible (all cells empty and a copy of the piece left).
+``place``/``unplace`` update the counts incrementally, and empty cells are
+kept in buckets by count so the most constrained cell is found by scanning
+up from bucket 0 -- usually a handful of steps. Each bucket also has a
+min-heap of its cell indices for the lowest-index tie-break. Cells leaving
+a bucket stay in its heap and are popped lazily when they reach the top;
+a cell is pushed only when it is not already in the heap, so each heap
+holds every cell at most once.
+
+A placement is feasible iff ``blocked[q] == 0`` (none of its cells is
+occupied) and its piece still has copies; it contributes to the count of
+each of its cells exactly while feasible.
+"""
+
+from __future__ import annotations
+import heapq
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+I3 = Tuple[int, int, int]
+
+
+class CoverageCounts:
+    def __init__(self, cells: Sequence[I3], orientations: Dict[str, Sequence[Sequence[I3]]],
+                 piece_counts: Dict[str, int]):
+        self.num_cells = len(cells)
+        index = {tuple(c): i for i, c in enumerate(cells)}
+        self.piece_counts = {p: int(n) for p, n in piece_counts.items() if int(n) > 0}
+
+        # Enumerate placements: (piece, cell indices); anchoring atom 0 on
+        # every cell yields each translation exactly once per orientation.
+        self.placement_piece: List[str] = []
+        self.placement_cells: List[Tuple[int, ...]] = []
+        seen: Set[Tuple[str, Tuple[int, ...]]] = set()
+        for piece in sorted(self.piece_counts):
+            for ori in orientations.get(piece, ()):
+                if not ori:
+                    continue
+                a0 = ori[0]
+                for c in cells:
+                    dx, dy, dz = c[0] - a0[0], c[1] - a0[1], c[2] - a0[2]
+                    idxs = []
+                    for u in ori:
+                        i = index.get((u[0] + dx, u[1] + dy, u[2] + dz))
+                        if i is None:
+                            break
+                        idxs.append(i)
+                    else:
+                        key = (piece, tuple(sorted(idxs)))
+                        if key not in seen:  # symmetric pieces repeat footprints
+                            seen.add(key)
+                            self.placement_piece.append(piece)
+                            self.placement_cells.append(key[1])
+
+        self.covers: List[List[int]] = [[] for _ in range(self.num_cells)]
+        self.by_piece: Dict[str, List[int]] = {p: [] for p in self.piece_counts}
+        for q, (piece, qcells) in enumerate(zip(self.placement_piece, self.placement_cells)):
+            self.by_piece[piece].append(q)
+            for i in qcells:
+                self.covers[i].append(q)
+        self.reset()
+
+    # ---------------- state ----------------
+    def reset(self) -> None:
+        """Empty container and full inventory."""
+        self.avail = dict(self.piece_counts)
+        self.blocked = [0] * len(self.placement_cells)
+        self.empty = [True] * self.num_cells
+        self.count = [len(c) for c in self.covers]
+        max_count = max(self.count, default=0)
+        self.buckets: List[Set[int]] = [set() for _ in range(max_count + 1)]
+        for i, n in enumerate(self.count):
+            self.buckets[n].add(i)
+        # heaps[n] holds every member of buckets[n], plus cells that have left it
+        self.heaps: List[List[int]] = [sorted(b) for b in self.buckets]
+        self.in_heap: List[Set[int]] = [set(b) for b in self.buckets]
+
+    def _add(self, n: int, d: int) -> None:
+        self.buckets[n].add(d)
+        if d not in self.in_heap[n]:
+            self.in_heap[n].add(d)
+            heapq.heappush(self.heaps[n], d)
+
+    def _adjust(self, q: int, delta: int) -> None:
+        for d in self.placement_cells[q]:
+            n = self.count[d]
+            self.count[d] = n + delta
+            if self.empty[d]:
+                self.buckets[n].discard(d)
+                self._add(n + delta, d)
+
+    def place(self, cell_idxs: Sequence[int], piece: str) -> None:
+        """Occupy ``cell_idxs`` with one copy of ``piece``."""
+        for c in cell_idxs:
+            self.empty[c] = False
+            self.buckets[self.count[c]].discard(c)
+        avail = self.avail
+        blocked = self.blocked
+        for c in cell_idxs:
+            for q in self.covers[c]:
+                blocked[q] += 1
+                if blocked[q] == 1 and avail[self.placement_piece[q]] > 0:
+                    self._adjust(q, -1)
+        avail[piece] -= 1
+        if avail[piece] == 0:
+            for q in self.by_piece[piece]:
+                if blocked[q] == 0:
+                    self._adjust(q, -1)
+
+    def unplace(self, cell_idxs: Sequence[int], piece: str) -> None:
+        """Exact inverse of ``place``."""
+        avail = self.avail
+        blocked = self.blocked
+        avail[piece] += 1
+        if avail[piece] == 1:
+            for q in self.by_piece[piece]:
+                if blocked[q] == 0:
+                    self._adjust(q, +1)
+        for c in cell_idxs:
+            for q in self.covers[c]:
+                blocked[q] -= 1
+                if blocked[q] == 0 and avail[self.placement_piece[q]] > 0:
+                    self._adjust(q, +1)
+        for c in cell_idxs:
+            self.empty[c] = True
+            self._add(self.count[c], c)
+
+    # ---------------- queries ----------------
+    def min_cell(self) -> Optional[Tuple[int, int]]:
+        """``(cell_index, count)`` of an empty cell with the fewest feasible
+        placements (lowest index on ties), or None when no cell is empty."""
+        for n, bucket in enumerate(self.buckets):
+            if bucket:
+                heap, queued = self.heaps[n], self.in_heap[n]
+                while heap[0] not in bucket:
+                    queued.discard(heapq.heappop(heap))
+                return heap[0], n
+        return None
+
+    def feasible(self, q: int) -> bool:
+        return self.blocked[q] == 0 and self.avail[self.placement_piece[q]] > 0
@@ -1,10 +1,30 @@
 """Engine protocol and types for the tight scope M2 task."""
 
-from typing import Protocol, Iterator, Dict, Any, TypedDict
+from typing import Protocol, Iterator, Dict, Any, TypedDict, Callable
 
 class EngineOptions(TypedDict, total=False):
     seed: int
     flags: Dict[str, Any]
+    cancel: Callable[[], bool]  # polled by engines; True stops the search
+    target_policy: str  # DFS target cell: "window" (MRV window) | "coverage" (exact MRV)
+    count_only: bool  # count all solutions (raw and symmetry-reduced) instead of emitting them
+    preflight: bool  # static infeasibility checks before searching (default True)
+    colour_pruning: bool  # prune nodes whose empty cells fail a lattice-colouring count check
+    split_components: bool  # DFS: fill small components of a split empty region independently
+    split_max_cells: int  # largest component solved apart (default 24)
+    region_memo: bool  # memoized solvability of the remaining region (DFS, DLX)
+    region_memo_cells: int  # consult the memo once at most this many cells are empty (default 24)
+    region_memo_path: str  # optional SQLite file persisting the memo across runs; implies region_memo
+    cell_order: str  # bit order of container cells: lex | bfs | morton | hilbert | boundary
+    ordering: str  # engine-c candidate ordering: lcv (default) | mincov | index
+    ordering_compare: bool  # engine-c: also run with ordering index, report nodes_by_ordering in done
+    tree_stats: bool  # per-depth node/candidate/prune-reason counts in done (DFS, DLX) and ticks (DFS)
+    profile: bool  # per-phase search timings in the done metrics (DFS, DLX, engine-c)
+    metrics_prom: str  # Prometheus textfile rewritten every metrics_interval_ms (src/reporting/metrics.py)
+    metrics_jsonl: str  # JSONL time series of the same samples
+    metrics_interval_ms: int  # export interval (default 5000)
+    profile_path: str  # collapsed-stack file of phase x depth self times; implies profile
+    table_cache: Any  # TableCache reusing per-container tables across solves (src/solver/table_cache.py)
 
 class SolveEvent(TypedDict, total=False):
     t_ms: int
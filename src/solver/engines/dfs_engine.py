@@ -1,9 +1,12 @@
 """Bitmask-optimized DFS engine for rhombohedral (FCC) integer lattice solving (R6 adjacency only).
 
 Features preserved:
-- Root-level timed/node restarts (pivot over start piece and orientation)
-- MRV window target-cell heuristic
-- Hole-pruning modes (none | single_component | lt4) with legacy --hole4 alias
+- Root-level timed/node restarts (pivot over start piece and orientation), or
+  fixed/Luby/geometric node-budget restarts that keep a dead-state cache and
+  failure statistics across attempts (restart_schedule)
+- MRV window target-cell heuristic, or exact MRV from incremental coverage counts
+  (target_policy="coverage")
+- Hole-pruning modes (none | single_component | lt4 | shape) with legacy --hole4 alias
 - Status snapshots (compatible with existing UI)
 
 Improvements:
@@ -17,22 +20,38 @@ NOTE: R6 adjacency only (±1 in exactly one coordinate).
 
 import time
 import random
+from contextlib import ExitStack
 from typing import Iterator, Dict, Any, List, Tuple, Optional
 
 from ..engine_api import EngineProtocol, EngineOptions, SolveEvent
 from ...solver.tt import SeenMasks
 from ...solver.heuristics import tie_shuffle
 from ...solver.placement_gen import Placement
-from ...pieces.library_fcc_v1 import load_fcc_A_to_Y
+from ...pieces.compiled import compiled_library
 from ...pieces.inventory import PieceBag
 from ...io.solution_sig import canonical_state_signature
 from ...solver.symbreak import container_symmetry_group
+from ...solver.coverage import CoverageCounts
+from ...solver.restarts import DeadStateCache, FailureStats, restart_budgets
+from ...solver.preflight import preflight_done
+from ...solver.counting import count_events
+from ...solver.partial import BestPartial, LocalSearch
+from ...solver.colouring import ColouringPruner
+from ...solver.components import RegionBudgetExceeded, RegionTilings, empty_components, split_fills
+from ...solver.region_shapes import ShapeIndex
+from ...solver.region_memo import RegionMemo
+from ...solver.cell_order import order_cells
+from ...solver.profiler import NULL_PROFILER, PhaseProfiler
+from ...solver.tree_stats import TreeStats
+from ...solver.tree_progress import SubtreeProgress
+from ...solver.table_cache import cached_table
 # from .engine_c.lattice_fcc import FCC_NEIGHBORS   # <- NOT USED (legacy 12-neighbor). We use R6 below.
 from .engine_c.bitset import popcount, bitset_from_indices
 from ...common.status_snapshot import (
     ContainerInfo, StatusV2, PlacedPiece, Metrics, now_ms
 )
 from ...common.status_emitter import StatusEmitter
+from ...reporting.metrics import exporter_from_options
 
 I3 = Tuple[int, int, int]
 
@@ -232,6 +251,46 @@ def _connected_r6(cells_ijk: List[I3]) -> bool:
     return len(seen) == len(S)
 
 
+# --------------------------------
+# Target cell: MRV over a window of the first empty cells
+# --------------------------------
+def mrv_window_target(st: BitmaskDFSState, window_size: int,
+                      bias: Optional[Dict[int, float]] = None) -> Optional[I3]:
+    """First empty cell, or the one with fewest empty neighbours among the first ``window_size``.
+
+    ``bias`` (cell index -> failure score, from learned restarts) breaks ties
+    towards fail-prone cells.
+    """
+    empty_idxs = st.get_empty_cells()
+    if not empty_idxs:
+        return None
+    bias = bias or {}
+    if window_size <= 0 or window_size >= len(empty_idxs):
+        if bias:
+            return st.index_to_cell[max(empty_idxs, key=lambda i: bias.get(i, 0.0))]
+        return st.index_to_cell[empty_idxs[0]]
+
+    # Choose the most constrained among a small window (fewest empty neighbors)
+    best = None
+    best_score = None
+    for idx in empty_idxs[:window_size]:
+        neigh_mask = st.neighbor_masks.get(idx, 0)
+        # Count empty neighbors via bitset
+        cnt = 0
+        nm = neigh_mask
+        while nm:
+            lsb = nm & -nm
+            n_idx = (lsb.bit_length() - 1)
+            if not st.is_occupied(n_idx):
+                cnt += 1
+            nm &= ~lsb
+        score = (cnt, -bias.get(idx, 0.0))
+        if best_score is None or score < best_score:
+            best_score = score
+            best = idx
+    return st.index_to_cell[best] if best is not None else st.get_first_empty_cell()
+
+
 # --------------------------------
 # Engine
 # --------------------------------
@@ -239,6 +298,21 @@ class DFSEngine(EngineProtocol):
     name = "dfs"
 
     def solve(self, container, inventory, pieces, options: EngineOptions) -> Iterator[SolveEvent]:
+        # Resources opened by the search (the region memo) are closed even if the
+        # caller abandons or cancels the generator before the done event
+        with ExitStack() as cleanup:
+            yield from self._solve(container, inventory, pieces, options, cleanup)
+
+    def _solve(self, container, inventory, pieces, options, cleanup: ExitStack) -> Iterator[SolveEvent]:
+        rejected = preflight_done(container, inventory, options)
+        if rejected is not None:
+            yield rejected
+            return
+        if options.get("count_only"):
+            # Same placements as the search: only R6-connected orientations pass the final gate
+            yield from count_events(container, inventory, options,
+                                    keep=lambda ori: _connected_r6(list(map(tuple, ori))))
+            return
         t0 = time.time()
         start_time_ms = now_ms()
 
@@ -247,15 +321,41 @@ class DFSEngine(EngineProtocol):
         random.seed(seed)
         time_limit = float(options.get("time_limit", float("inf")))
         max_results = int(options.get("max_results", 1))
+        cancel = options.get("cancel")  # optional zero-arg callable; True stops the search
 
         # Enhanced DFS knobs
         restart_interval_s = float(options.get("restart_interval_s", 30.0))
         restart_nodes = int(options.get("restart_nodes", 100_000))
+        restart_schedule = options.get("restart_schedule")  # None (legacy) | fixed | luby | geometric
+        restart_base = int(options.get("restart_base", 1000))
+        restart_factor = float(options.get("restart_factor", 1.5))
+        dead_cache_size = int(options.get("dead_cache_size", 100_000))
         pivot_cycle = bool(options.get("pivot_cycle", True))
         mrv_window = int(options.get("mrv_window", 0))  # 0 = disabled
-        hole_pruning = options.get("hole_pruning", "none")  # none | single_component | lt4
+        target_policy = options.get("target_policy", "window")  # window | coverage
+        if target_policy not in ("window", "coverage"):
+            raise ValueError(f"target_policy must be 'window' or 'coverage', got {target_policy!r}")
+        hole_pruning = options.get("hole_pruning", "none")  # none | single_component | lt4 | shape
         if options.get("hole4", False):
             hole_pruning = "lt4"
+        # Anytime: track the fullest partial packing, optionally improve it by local search
+        anytime = bool(options.get("anytime", False))
+        best_partial_interval_ms = int(options.get("best_partial_interval_ms", 1000))
+        local_search_s = float(options.get("local_search_s", 0.0))
+        local_search_k = int(options.get("local_search_k", 2))
+        # Phase profiler: per-phase totals in done metrics, collapsed stacks to profile_path
+        profile_path = options.get("profile_path")
+        prof = PhaseProfiler("dfs") if options.get("profile") or profile_path else NULL_PROFILER
+        tree_stats = bool(options.get("tree_stats", False))
+        progress_interval_ms = int(options.get("progress_interval_ms", 0) or 0)
+        colour_pruning = bool(options.get("colour_pruning", False))
+        # Solve components of a split empty region independently (up to split_max_cells each)
+        split_components = bool(options.get("split_components", False))
+        split_max_cells = int(options.get("split_max_cells", 24))
+        # Memoized solvability of the remaining region once it has at most region_memo_cells cells
+        region_memo_path = options.get("region_memo_path")
+        region_memo = bool(options.get("region_memo", False)) or bool(region_memo_path)
+        region_memo_cells = int(options.get("region_memo_cells", 24))
 
         # Dev assertions (optional)
         assert_library = bool(options.get("assert_library", False))
@@ -277,7 +377,8 @@ class DFSEngine(EngineProtocol):
             for c in coords_raw:
                 assert isinstance(c, (list, tuple)) and len(c) == 3, f"Bad cell: {c}"
                 assert all(isinstance(v, int) for v in c), f"Non-integer container cell: {c}"
-        container_cells = sorted(tuple(int(x) for x in c) for c in coords_raw)
+        # Bit order of the occupancy masks (lex | bfs | morton | hilbert | boundary)
+        container_cells = order_cells(coords_raw, options.get("cell_order", "lex"))
         container_cells_count = len(container_cells)
         container_cid = container.get("cid_sha256", f"container_{hash(str(container))}")
 
@@ -293,7 +394,9 @@ class DFSEngine(EngineProtocol):
             return
 
         # Pieces & inventory (counts per type)
-        pieces_dict = load_fcc_A_to_Y()
+        library = compiled_library()
+        pieces_dict = library.piece_defs()
+        rel_tables = library.rel
         if assert_library:
             # Validate library orientations are integer-connected on R6
             for name, pdef in pieces_dict.items():
@@ -320,6 +423,43 @@ class DFSEngine(EngineProtocol):
         # Search state
         state = BitmaskDFSState(container_cells)
         symGroup = container_symmetry_group(container_cells)
+        # Exact MRV: feasible-placement counts per empty cell, same indexing as state
+        coverage = cached_table(options, container,
+                                ("coverage", options.get("cell_order", "lex"), tuple(sorted(piece_counts.items()))),
+                                lambda: CoverageCounts(container_cells, library.orientations, piece_counts)) \
+            if target_policy == "coverage" else None
+        dead_ends = 0
+        # Colour-count feasibility of the empty region against the remaining bag
+        colours = ColouringPruner([state.index_to_cell[i] for i in range(container_cells_count)],
+                                  library.orientations, piece_counts) if colour_pruning else None
+        # Placements inside one R6 component; only R6-connected pieces pass the final gate,
+        # so no emitted solution has a piece spanning two components. One witness tiling per
+        # piece usage finds a first solution; more results need every tiling.
+        regions = RegionTilings(library.orientations, piece_counts,
+                                placement_filter=lambda r: _connected_r6(list(r[3])),
+                                all_tilings=max_results > 1) if split_components else None
+        split_nodes = 0
+        # shape: lt4 plus 4/8-cell components whose shape no remaining piece (pair) fills
+        shapes = ShapeIndex(library.orientations, keep=lambda ori: _connected_r6(list(map(tuple, ori)))) \
+            if hole_pruning == "shape" else None
+        shape_prunes = 0
+        solvability = cleanup.enter_context(RegionMemo(library.orientations, region_memo_path,
+                                                         digest=library.digest)) if region_memo else None
+        solvability_prunes = 0
+        # Learned restarts: node-budget schedule plus knowledge kept across attempts
+        learned = restart_schedule is not None
+        budgets = restart_budgets(restart_schedule, restart_base, restart_factor) if learned else None
+        attempt_budget = next(budgets) if budgets else 0
+        dead_cache = DeadStateCache(dead_cache_size) if learned else None
+        failures = FailureStats() if learned else None
+        first_solution_ms: Optional[int] = None
+        best_partial = BestPartial(container_cells, container_cid) if anytime else None
+        last_partial_emit = t0
+        # Per-depth node, candidate and prune counts (one level per placed piece)
+        tree = TreeStats(container_cells_count // 4) if tree_stats else None
+        # Completed fraction of the current pass (mixed-radix cursor over children)
+        progress = SubtreeProgress(container_cells_count // 4)
+        last_tick = t0
 
         solutions_found = 0
         nodes_explored = 0
@@ -373,6 +513,7 @@ class DFSEngine(EngineProtocol):
                     truncated = True
 
                 elapsed = now_ms() - start_time_ms
+                frac = progress.fraction()
                 metrics = Metrics(
                     nodes=int(nodes_explored),
                     pruned=0,
@@ -380,6 +521,8 @@ class DFSEngine(EngineProtocol):
                     solutions=int(solutions_found),
                     elapsed_ms=int(elapsed),
                     best_depth=int(max_depth_reached) if max_depth_reached > 0 else None,
+                    progress=round(frac, 6),
+                    eta_ms=progress.eta_ms(elapsed, frac),
                 )
                 return StatusV2(
                     version=2,
@@ -414,62 +557,97 @@ class DFSEngine(EngineProtocol):
             except Exception:
                 status_emitter = None
 
-        # Target selection (MRV over a window of empties; 0 -> first empty)
+        # Prometheus textfile / JSONL time series, polled from the counters above
+        def metrics_counters() -> Dict[str, Any]:
+            frac = progress.fraction()
+            counters = {"nodes_explored": nodes_explored, "solutions_found": solutions_found,
+                        "max_depth_reached": max_depth_reached,
+                        "pruned_nodes": dead_ends + shape_prunes + solvability_prunes + (colours.prunes if colours else 0),
+                        "progress": frac, "eta_ms": progress.eta_ms((time.time() - t0) * 1000, frac)}
+            if solvability is not None:
+                hits = solvability.hits + solvability.disk_hits
+                counters.update(cache_hits=hits, cache_misses=solvability.lookups - hits)
+            return counters
+
+        metrics_exporter = exporter_from_options(options, "dfs", container_cid)
+        if metrics_exporter:
+            metrics_exporter.start(metrics_counters)
+
+        def time_up() -> bool:
+            if time_limit > 0 and (time.time() - t0) >= time_limit:
+                return True
+            return cancel is not None and bool(cancel())
+
+        # Target selection (MRV over a window of empties; 0 -> first empty).
+        # With failure statistics, 0 -> the most fail-prone empty cell, and
+        # window ties go to the more fail-prone cell.
         def select_target_cell_mrv(st: BitmaskDFSState, window_size: int) -> Optional[I3]:
-            empty_idxs = st.get_empty_cells()
-            if not empty_idxs:
-                return None
-            if window_size <= 0 or window_size >= len(empty_idxs):
-                return st.index_to_cell[empty_idxs[0]]
-
-            # Choose the most constrained among a small window (fewest empty neighbors)
-            best = None
-            best_score = None
-            for idx in empty_idxs[:window_size]:
-                neigh_mask = st.neighbor_masks.get(idx, 0)
-                # Count empty neighbors via bitset
-                cnt = 0
-                nm = neigh_mask
-                while nm:
-                    lsb = nm & -nm
-                    n_idx = (lsb.bit_length() - 1)
-                    if not st.is_occupied(n_idx):
-                        cnt += 1
-                    nm &= ~lsb
-                if best_score is None or cnt < best_score:
-                    best_score = cnt
-                    best = idx
-            return st.index_to_cell[best] if best is not None else st.get_first_empty_cell()
+            return mrv_window_target(st, window_size, failures.cell if failures is not None else None)
 
-        def should_prune_holes(st: BitmaskDFSState, mode: str) -> bool:
+        def should_prune_holes(st: BitmaskDFSState, mode: str, bag: PieceBag) -> bool:
+            nonlocal shape_prunes
             if mode == "none":
                 return False
             if mode == "single_component":
                 return st.has_holes_single_component()
             if mode == "lt4":
                 return st.has_holes_lt4()
+            if mode == "shape":
+                for comp in empty_components(st.get_empty_mask(), st.neighbor_masks):
+                    size = popcount(comp)
+                    if size < 4:
+                        return True
+                    if size > 8:
+                        break
+                    cells = [st.index_to_cell[i] for i in range(st.num_cells) if comp >> i & 1]
+                    if not shapes.fillable(cells, bag.counts):
+                        shape_prunes += 1
+                        return True
             return False
 
         # ---------------- Core DFS (R6) ----------------
         def dfs(depth: int, placement_stack: List[Tuple[Placement, int]], bag: PieceBag) -> Iterator[SolveEvent]:
             nonlocal solutions_found, nodes_explored, max_depth_reached, max_pieces_placed, current_placement_stack
-            nonlocal last_restart_time, last_restart_nodes, restart_count
+            nonlocal last_restart_time, last_restart_nodes, restart_count, dead_ends, first_solution_ms
+            nonlocal last_partial_emit, split_nodes, solvability_prunes, last_tick
 
-            # Time bound
-            if time_limit > 0 and (time.time() - t0) >= time_limit:
+            # Time bound / cancellation
+            if time_up():
+                if tree is not None:
+                    tree.prune("time", depth)
                 return
 
-            # Restart policy from root only
-            if depth == 0:
+            # Restart policy: node budget of the current attempt (learned), else root only
+            if learned:
+                if depth > 0 and (nodes_explored - last_restart_nodes) >= attempt_budget:
+                    raise _RestartSignal()
+            elif depth == 0:
                 now_t = time.time()
                 if (now_t - last_restart_time) >= restart_interval_s or (nodes_explored - last_restart_nodes) >= restart_nodes:
                     raise _RestartSignal()
 
             nodes_explored += 1
+            if tree is not None:
+                tree.nodes[depth] += 1
             if depth > max_depth_reached:
                 max_depth_reached = depth
+            if progress_interval_ms and (time.time() - last_tick) * 1000 >= progress_interval_ms:
+                last_tick = time.time()
+                frac = progress.fraction()
+                tick = {"nodes_explored": nodes_explored, "max_depth_reached": max_depth_reached,
+                        "solutions_found": solutions_found, "progress": round(frac, 6),
+                        "eta_ms": progress.eta_ms((last_tick - t0) * 1000, frac)}
+                if tree is not None:
+                    tick["tree_stats"] = tree.to_dict()
+                yield {"type": "tick", "t_ms": int((last_tick - t0) * 1000), "metrics": tick}
             if len(placement_stack) > max_pieces_placed:
                 max_pieces_placed = len(placement_stack)
+            if best_partial is not None and len(placement_stack) * 4 > best_partial.filled:
+                best_partial.offer((pl.piece, pl.ori_idx, pl.t, pl.covered) for pl, _m in placement_stack)
+                now_t = time.time()
+                if (now_t - last_partial_emit) * 1000 >= best_partial_interval_ms:
+                    last_partial_emit = now_t
+                    yield best_partial.event(int((now_t - t0) * 1000))
 
             empty_count = state.count_empty_cells()
             if empty_count == 0:
@@ -479,10 +657,14 @@ class DFSEngine(EngineProtocol):
                 # Final R6 connectivity gate (per-piece)
                 for pl in placements_list:
                     if not _connected_r6(list(map(tuple, pl.covered))):
+                        if tree is not None:
+                            tree.prune("r6", depth)
                         return  # reject and continue search
 
                 # Metrics and signature
                 solutions_found += 1
+                if first_solution_ms is None:
+                    first_solution_ms = int((time.time() - t0) * 1000)
                 solution_placements = []
                 all_occupied_cells: List[I3] = []
 
@@ -499,7 +681,8 @@ class DFSEngine(EngineProtocol):
                 for pl in placements_list:
                     pieces_used[pl.piece] = pieces_used.get(pl.piece, 0) + 1
 
-                sid = canonical_state_signature(all_occupied_cells, symGroup)
+                with prof.phase("solution_signature", depth):
+                    sid = canonical_state_signature(all_occupied_cells, symGroup)
 
                 if assert_io:
                     for pl in placements_list:
@@ -524,84 +707,178 @@ class DFSEngine(EngineProtocol):
 
             # Quick infeasibility: remaining empties must be multiple of 4
             if (empty_count & 3) != 0:
+                if tree is not None:
+                    tree.prune("mod4", depth)
                 return
 
-            # Hole pruning (R6)
-            if should_prune_holes(state, hole_pruning):
-                return
+            with prof.phase("hole_checks", depth):
+                # Hole pruning (R6)
+                if should_prune_holes(state, hole_pruning, bag):
+                    if tree is not None:
+                        tree.prune("hole", depth)
+                    return
+                if colours is not None and not colours.feasible(state.occupied_mask, bag.counts):
+                    if tree is not None:
+                        tree.prune("colour", depth)
+                    return
+                if solvability is not None and empty_count <= region_memo_cells:
+                    empty = [state.index_to_cell[i] for i in state.get_empty_cells()]
+                    if solvability.solvable(empty, bag.counts) is False:
+                        solvability_prunes += 1
+                        if tree is not None:
+                            tree.prune("solvability", depth)
+                        return
+
+            # States exhausted in this or an earlier attempt have no solution
+            if dead_cache is not None:
+                dead_key = DeadStateCache.key(state.occupied_mask, bag.counts)
+                if dead_key in dead_cache:
+                    if tree is not None:
+                        tree.prune("dead_state", depth)
+                    return
+                solutions_before = solutions_found
+
+            # Split empty region: fill the small components independently, then search the rest
+            if regions is not None:
+                with prof.phase("split_components", depth):
+                    comps = empty_components(state.get_empty_mask(), state.neighbor_masks)
+                    small = [c for c in comps if popcount(c) <= split_max_cells] if len(comps) > 1 else []
+                    fills = None
+                    if small:
+                        cells_of = [[state.index_to_cell[i] for i in range(state.num_cells) if c >> i & 1] for c in small]
+                        try:
+                            fills = list(split_fills(cells_of, tuple(bag.get_count(p) for p in regions.pieces), regions))
+                        except RegionBudgetExceeded:
+                            fills = None  # too large to solve apart; search it in place
+                if fills is not None:
+                    split_nodes += 1
+                    progress.branch(depth, len(fills))
+                    for fi, (_used, rows) in enumerate(fills):
+                        if fi and time_up():
+                            return
+                        progress.at(depth, fi)
+                        placed: List[Tuple[Placement, int, List[int]]] = []
+                        for piece, o, t, covered in rows:
+                            pl = Placement(piece=piece, ori_idx=o, t=t, covered=covered)
+                            bag.use_piece(piece)
+                            mask = state.place_piece(pl)
+                            cell_idxs = [state.cell_to_index[c] for c in covered]
+                            if coverage is not None:
+                                coverage.place(cell_idxs, piece)
+                            placement_stack.append((pl, mask))
+                            placed.append((pl, mask, cell_idxs))
+                        current_placement_stack = placement_stack.copy()
+                        for ev in dfs(depth + 1, placement_stack, bag):
+                            yield ev
+                            if solutions_found >= max_results:
+                                break
+                        for pl, mask, cell_idxs in reversed(placed):
+                            placement_stack.pop()
+                            state.remove_piece(mask)
+                            bag.return_piece(pl.piece)
+                            if coverage is not None:
+                                coverage.unplace(cell_idxs, pl.piece)
+                        current_placement_stack = placement_stack.copy()
+                        if solutions_found >= max_results:
+                            return
+                    if not time_up():
+                        progress.at(depth, len(fills))
+                    if dead_cache is not None and solutions_found == solutions_before and not time_up():
+                        dead_cache.add(dead_key)
+                    return
 
             # Select a target empty cell
-            target = select_target_cell_mrv(state, mrv_window)
+            with prof.phase("target_select", depth):
+                if coverage is not None:
+                    best = coverage.min_cell()
+                    if best is None:
+                        return
+                    if best[1] == 0:
+                        dead_ends += 1  # some empty cell can no longer be covered
+                        if tree is not None:
+                            tree.prune("dead_end", depth)
+                        return
+                    target = state.index_to_cell[best[0]]
+                else:
+                    target = select_target_cell_mrv(state, mrv_window)
             if target is None:
                 return
 
             # Generate candidates, honoring pivot piece type & orientation, and bag counts
             candidates: List[Placement] = []
 
-            avail_types = [p for p in bag.counts.keys() if bag.get_count(p) > 0]
-            if not avail_types:
-                return
-
-            pv_piece, pv_ori = current_pivot()
-            order = sorted(avail_types)
-            if pv_piece and pv_piece in order:
-                order.remove(pv_piece)
-                order.insert(0, pv_piece)
-
-            for p_name in order:
-                if bag.get_count(p_name) <= 0:
-                    continue
-                pdef = pieces_dict.get(p_name)
-                if pdef is None or not pdef.orientations:
-                    continue
+            valid = prof.wrap("is_valid_placement", state.is_valid_placement, depth)
+            with prof.phase("candidates", depth):
+                avail_types = [p for p in bag.counts.keys() if bag.get_count(p) > 0]
+                if not avail_types:
+                    if tree is not None:
+                        tree.prune("inventory", depth)
+                    return
+                attempts = 0
+
+                pv_piece, pv_ori = current_pivot()
+                order = sorted(avail_types)
+                if failures is not None:
+                    order.sort(key=lambda p: failures.piece.get(p, 0.0))  # fail-prone pieces later
+                if pv_piece and pv_piece in order:
+                    order.remove(pv_piece)
+                    order.insert(0, pv_piece)
+
+                for p_name in order:
+                    if bag.get_count(p_name) <= 0:
+                        continue
+                    pdef = pieces_dict.get(p_name)
+                    if pdef is None or not pdef.orientations:
+                        continue
 
-                orientations = list(enumerate(pdef.orientations))
-                # pivot orientation for the pivot piece first
-                if p_name == pv_piece and 0 <= pv_ori < len(orientations):
-                    pivot_item = orientations[pv_ori]
-                    orientations = [pivot_item] + [item for i, item in enumerate(orientations) if i != pv_ori]
+                    orientations = list(enumerate(pdef.orientations))
+                    # pivot orientation for the pivot piece first
+                    if p_name == pv_piece and 0 <= pv_ori < len(orientations):
+                        pivot_item = orientations[pv_ori]
+                        orientations = [pivot_item] + [item for i, item in enumerate(orientations) if i != pv_ori]
 
-                orientations = tie_shuffle(orientations, seed=seed)
+                    orientations = tie_shuffle(orientations, seed=seed)
 
-                for ori_idx, ori in orientations:
-                    if time_limit > 0 and (time.time() - t0) >= time_limit:
-                        return
-                    if not ori:
-                        continue
-
-                    # NEW: try anchoring EVERY cell of the orientation to the target
-                    # so we don't miss placements where the target matches ori[1], ori[2], or ori[3].
-                    for anchor_cell in ori:
-                        tx = target[0] - anchor_cell[0]
-                        ty = target[1] - anchor_cell[1]
-                        tz = target[2] - anchor_cell[2]
-
-                        covered = tuple((tx + cx, ty + cy, tz + cz) for (cx, cy, cz) in ori)
-                        
-                        # Verify target is actually covered by this placement
-                        if target not in covered:
+                    for ori_idx, ori in orientations:
+                        if time_up():
+                            if tree is not None:
+                                tree.prune("time", depth)
+                            return
+                        if not ori:
                             continue
-                            
-                        pl = Placement(piece=p_name, ori_idx=ori_idx, t=(tx, ty, tz), covered=covered)
-
-                        # (Optional) sanity asserts if you have assert_io on
-                        if assert_io:
-                            assert all(isinstance(v, int) for v in pl.t), f"Non-int t: {pl.t}"
-                            for c in pl.covered:
-                                assert all(isinstance(v, int) for v in c), f"Non-int covered: {c}"
-
-                        if state.is_valid_placement(pl):
-                            candidates.append(pl)
-                        elif depth == 0 and assert_io and len(candidates) == 0:
-                            # Debug first failed placement
-                            print(f"[DFS][debug] Failed placement: piece={p_name}, ori={ori_idx}, t={pl.t}")
-                            print(f"[DFS][debug] Covered cells: {pl.covered}")
-                            for i, cell in enumerate(pl.covered):
-                                if cell not in state.cell_to_index:
-                                    print(f"[DFS][debug]   Cell {i} {cell} is outside container")
-                                elif state.is_occupied(state.cell_to_index[cell]):
-                                    print(f"[DFS][debug]   Cell {i} {cell} is already occupied")
-                            break  # Only debug first failure per orientation
+                        attempts += len(ori)
+
+                        # NEW: try anchoring EVERY cell of the orientation to the target
+                        # so we don't miss placements where the target matches ori[1], ori[2], or ori[3].
+                        # rel[a] holds the cells relative to atom a, so the target is always covered.
+                        rel = rel_tables[p_name][ori_idx]
+                        for a, anchor_cell in enumerate(ori):
+                            tx = target[0] - anchor_cell[0]
+                            ty = target[1] - anchor_cell[1]
+                            tz = target[2] - anchor_cell[2]
+
+                            covered = tuple((target[0] + rx, target[1] + ry, target[2] + rz) for (rx, ry, rz) in rel[a])
+
+                            pl = Placement(piece=p_name, ori_idx=ori_idx, t=(tx, ty, tz), covered=covered)
+
+                            # (Optional) sanity asserts if you have assert_io on
+                            if assert_io:
+                                assert all(isinstance(v, int) for v in pl.t), f"Non-int t: {pl.t}"
+                                for c in pl.covered:
+                                    assert all(isinstance(v, int) for v in c), f"Non-int covered: {c}"
+
+                            if valid(pl):
+                                candidates.append(pl)
+                            elif depth == 0 and assert_io and len(candidates) == 0:
+                                # Debug first failed placement
+                                print(f"[DFS][debug] Failed placement: piece={p_name}, ori={ori_idx}, t={pl.t}")
+                                print(f"[DFS][debug] Covered cells: {pl.covered}")
+                                for i, cell in enumerate(pl.covered):
+                                    if cell not in state.cell_to_index:
+                                        print(f"[DFS][debug]   Cell {i} {cell} is outside container")
+                                    elif state.is_occupied(state.cell_to_index[cell]):
+                                        print(f"[DFS][debug]   Cell {i} {cell} is already occupied")
+                                break  # Only debug first failure per orientation
 
             # Debug: check for zero candidates at depth 0
             if depth == 0 and not candidates and assert_io:
@@ -618,42 +895,77 @@ class DFSEngine(EngineProtocol):
                     else:
                         print(f"[DFS][debug] {first_piece} has no orientations or piece def")
 
+            if tree is not None:
+                tree.generated[depth] += len(candidates)
+                tree.prune("overlap", depth, attempts - len(candidates))
+                if not candidates:
+                    tree.prune("dead_end", depth)
+
             # Explore candidates
-            for pl in candidates:
+            target_idx = state.cell_to_index[target]
+            progress.branch(depth, len(candidates))
+            for ci, pl in enumerate(candidates):
+                if ci and time_up():
+                    if tree is not None:
+                        tree.prune("time", depth)
+                    return
+                progress.at(depth, ci)
                 if bag.get_count(pl.piece) <= 0:
+                    if tree is not None:
+                        tree.prune("inventory", depth)
                     continue
-                bag.use_piece(pl.piece)
-                mask = state.place_piece(pl)
-                if mask == 0:
-                    bag.return_piece(pl.piece)
-                    continue
-
-                placement_stack.append((pl, mask))
-                current_placement_stack = placement_stack.copy()
-
+                with prof.phase("place", depth):
+                    bag.use_piece(pl.piece)
+                    mask = state.place_piece(pl)
+                    if mask == 0:
+                        bag.return_piece(pl.piece)
+                        continue
+                    if coverage is not None:
+                        cell_idxs = [state.cell_to_index[c] for c in pl.covered]
+                        coverage.place(cell_idxs, pl.piece)
+                    placement_stack.append((pl, mask))
+                with prof.phase("snapshot_copy", depth):
+                    current_placement_stack = placement_stack.copy()
+                if tree is not None:
+                    tree.tried[depth] += 1
+
+                solutions_at_child = solutions_found
                 for ev in dfs(depth + 1, placement_stack, bag):
                     yield ev
                     if solutions_found >= max_results:
                         break
+                if failures is not None and solutions_found == solutions_at_child:
+                    failures.record(pl.piece, target_idx)
 
                 # Backtrack
-                placement_stack.pop()
-                state.remove_piece(mask)
-                bag.return_piece(pl.piece)
-                current_placement_stack = placement_stack.copy()
+                with prof.phase("undo", depth):
+                    placement_stack.pop()
+                    state.remove_piece(mask)
+                    bag.return_piece(pl.piece)
+                    if coverage is not None:
+                        coverage.unplace(cell_idxs, pl.piece)
+                with prof.phase("snapshot_copy", depth):
+                    current_placement_stack = placement_stack.copy()
 
                 if solutions_found >= max_results:
                     return
+            if not time_up():
+                progress.at(depth, len(candidates))  # whole subtree done
+
+            if dead_cache is not None and solutions_found == solutions_before and not time_up():
+                dead_cache.add(dead_key)
 
         # ------------- Root loop with restarts over the SAME integer inventory -------------
         while True:
-            if time_limit > 0 and (time.time() - t0) >= time_limit:
+            if time_up():
                 break
             if solutions_found >= max_results:
                 break
 
             bag = PieceBag(piece_counts)  # fresh counts each restart
             state.occupied_mask = 0
+            if coverage is not None:
+                coverage.reset()
             current_placement_stack = []
 
             try:
@@ -667,6 +979,8 @@ class DFSEngine(EngineProtocol):
 
                 if solutions_found >= max_results:
                     break
+                if learned:
+                    break  # the attempt ran to completion: search space exhausted
                 if pivot_cycle:
                     advance_pivot()
                     continue
@@ -675,10 +989,50 @@ class DFSEngine(EngineProtocol):
             except _RestartSignal:
                 restart_count += 1
                 advance_pivot()
+                if learned:
+                    failures.on_restart()
+                    attempt_budget = next(budgets)
                 # loop continues with fresh state and bag
 
+        local_search_moves = 0
+        if best_partial is not None and solutions_found == 0:
+            if local_search_s > 0 and not (cancel is not None and cancel()):
+                ls = LocalSearch(container_cells, library.orientations, piece_counts, seed)
+                start = ls.rows_of((r[0], r[3]) for r in best_partial.rows)
+                for rows in ls.run(start, local_search_s, local_search_k, cancel):
+                    best_partial.offer(rows, source="local_search")
+                    now_t = time.time()
+                    if (now_t - last_partial_emit) * 1000 >= best_partial_interval_ms:
+                        last_partial_emit = now_t
+                        yield best_partial.event(int((now_t - t0) * 1000))
+                local_search_moves = ls.moves
+            if best_partial.filled == container_cells_count and \
+                    all(_connected_r6(list(r[3])) for r in best_partial.rows):
+                # Local search completed the packing: report it as a solution
+                solutions_found += 1
+                first_solution_ms = int((time.time() - t0) * 1000)
+                partial = best_partial.as_partial()
+                yield {
+                    "type": "solution",
+                    "t_ms": first_solution_ms,
+                    "solution": {
+                        "containerCidSha256": container_cid,
+                        "lattice": "fcc",
+                        "piecesUsed": partial["piecesUsed"],
+                        "placements": partial["placements"],
+                        "sid_state_sha256": "dfs_state",
+                        "sid_route_sha256": "dfs_local_search",
+                        "sid_state_canon_sha256": canonical_state_signature(
+                            [c for r in best_partial.rows for c in r[3]], symGroup),
+                    },
+                }
+            elif best_partial.dirty:
+                yield best_partial.event(int((time.time() - t0) * 1000))
+
         if status_emitter:
             status_emitter.stop()
+        if metrics_exporter:
+            metrics_exporter.stop(metrics_counters())
 
         final_metrics = {
             "solutions_found": solutions_found,
@@ -687,5 +1041,38 @@ class DFSEngine(EngineProtocol):
             "max_depth_reached": max_depth_reached,
             "max_pieces_placed": max_pieces_placed,
             "restart_count": restart_count,
+            "target_policy": target_policy,
+            "dead_ends": dead_ends,
+            "first_solution_ms": first_solution_ms,
+            "progress": round(progress.fraction(), 6),
         }
+        if solvability is not None:
+            solvability.close()
+            final_metrics.update(solvability.stats())
+            final_metrics["solvability_prunes"] = solvability_prunes
+        if shapes is not None:
+            final_metrics.update({"shape_prunes": shape_prunes, "shape_pairs_cached": len(shapes.pairs)})
+        if regions is not None:
+            final_metrics.update({"split_nodes": split_nodes, "regions_solved": regions.solved,
+                                  "region_memo_hits": regions.hits})
+        if colours is not None:
+            final_metrics.update({"colour_checks": colours.checks, "colour_prunes": colours.prunes})
+        if best_partial is not None:
+            final_metrics.update({
+                "best_partial_cells": best_partial.filled,
+                "best_partial_pieces": len(best_partial.rows),
+                "local_search_moves": local_search_moves,
+            })
+        if learned:
+            final_metrics.update({
+                "restart_schedule": restart_schedule,
+                "dead_states": len(dead_cache),
+                "dead_state_hits": dead_cache.hits,
+            })
+        if tree is not None:
+            final_metrics["tree_stats"] = tree.to_dict()
+        if prof.enabled:
+            final_metrics["profile"] = prof.summary()
+            if profile_path:
+                prof.write_collapsed(profile_path)
         yield {"type": "done", "metrics": final_metrics}
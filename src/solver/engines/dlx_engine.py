@@ -4,11 +4,11 @@ Drop-in compatible with DFS engine event/status schemas.
 
 import time
 import random
+from contextlib import ExitStack
 from typing import Iterator, Dict, List, Set, Any, Tuple, Optional
 
 from ..engine_api import EngineProtocol  # and the runtime expects solve(...) to yield events
-from ...pieces.library_fcc_v1 import load_fcc_A_to_Y
-from ...pieces.sphere_orientations import get_piece_orientations
+from ...pieces.compiled import compiled_library
 from ...coords.symmetry_fcc import canonical_atom_tuple
 from ...solver.heuristics import tie_shuffle
 
@@ -16,9 +16,18 @@ from ...common.status_snapshot import (
     StatusV2, PlacedPiece, ContainerInfo, Metrics, now_ms, label_for_piece, expand_piece_to_cells
 )
 from ...common.status_emitter import StatusEmitter
+from ...reporting.metrics import exporter_from_options
 
 from ...io.solution_sig import canonical_state_signature
 from ...solver.symbreak import container_symmetry_group
+from ...solver.preflight import preflight_done
+from ...solver.counting import count_events
+from ...solver.colouring import ColouringPruner
+from ...solver.region_memo import RegionMemo
+from ...solver.cell_order import order_cells
+from ...solver.profiler import NULL_PROFILER, PhaseProfiler
+from ...solver.tree_stats import TreeStats
+from ...solver.tree_progress import SubtreeProgress
 
 from .coordinate_mapper import CoordinateMapper
 from .bitmap_state import BitmapState
@@ -31,6 +40,19 @@ class DLXEngine(EngineProtocol):
 
     def solve(self, container, inventory, pieces, options) -> Iterator[Dict[str, Any]]:
         """Solve using Algorithm X with Dancing Links, iterating through piece combinations."""
+        # Resources opened by the search (the region memo) are closed even if the
+        # caller abandons or cancels the generator before the done event
+        with ExitStack() as cleanup:
+            yield from self._solve(container, inventory, pieces, options, cleanup)
+
+    def _solve(self, container, inventory, pieces, options, cleanup: ExitStack) -> Iterator[Dict[str, Any]]:
+        rejected = preflight_done(container, inventory, options)
+        if rejected is not None:
+            yield rejected
+            return
+        if options.get("count_only"):
+            yield from count_events(container, inventory, options)
+            return
         # -------------------------
         # Options (aligned with DFS)
         # -------------------------
@@ -38,12 +60,19 @@ class DLXEngine(EngineProtocol):
         max_rows_cap = options.get("max_rows_cap")  # optional global cap on candidate rows
         time_limit = float(options.get("time_limit", 0))  # 0/<=0 = no limit
         max_results = int(options.get("max_results", 1))
+        cancel = options.get("cancel")  # optional zero-arg callable; True stops the search
 
         # Status options (use StatusV2 like DFS)
         status_json = options.get("status_json")
         status_interval_ms = int(options.get("status_interval_ms", 1000))
         status_max_stack = int(options.get("status_max_stack", 512))
         status_phase = options.get("status_phase")
+        colour_pruning = bool(options.get("colour_pruning", False))
+        region_memo_path = options.get("region_memo_path")
+        region_memo = bool(options.get("region_memo", False)) or bool(region_memo_path)
+        region_memo_cells = int(options.get("region_memo_cells", 24))
+        profile_path = options.get("profile_path")
+        prof = PhaseProfiler("dlx") if options.get("profile") or profile_path else NULL_PROFILER
 
         # -------------------------
         # Run bookkeeping
@@ -64,7 +93,7 @@ class DLXEngine(EngineProtocol):
             container_coords = []
             container_cid = "container_empty"
 
-        container_cells = sorted(container_coords)
+        container_cells = order_cells(container_coords, options.get("cell_order", "lex"))  # column order
         container_set = set(container_cells)
         container_size = len(container_cells)
         sym_group = container_symmetry_group(container_cells)
@@ -80,10 +109,12 @@ class DLXEngine(EngineProtocol):
 
         # For StatusV2 snapshots (approximate view like DFS)
         current_stack_rows: List[Dict[str, Any]] = []  # list of rows_meta entries for current partial solution
+        # Completed fraction: level 0 is the piece combination, level d + 1 the search depth d
+        progress = SubtreeProgress(container_size // 4 + 1)
 
         # Piece index mapping for snapshot labels
-        pieces_dict = load_fcc_A_to_Y()
-        piece_names_sorted = sorted(pieces_dict.keys())
+        library = compiled_library()
+        piece_names_sorted = list(library.names)
         piece_name_to_idx = {name: idx for idx, name in enumerate(piece_names_sorted)}
 
         # -------------------------
@@ -110,13 +141,16 @@ class DLXEngine(EngineProtocol):
                     instance_id += 1
 
                 elapsed = now_ms() - start_time_ms
+                frac = progress.fraction()
                 metrics = Metrics(
                     nodes=int(nodes_explored),
                     pruned=0,
                     depth=int(len(current_stack_rows)),
                     solutions=int(solutions_found),
                     elapsed_ms=int(elapsed),
-                    best_depth=int(max_depth_reached) if max_depth_reached > 0 else None
+                    best_depth=int(max_depth_reached) if max_depth_reached > 0 else None,
+                    progress=round(frac, 6),
+                    eta_ms=progress.eta_ms(elapsed, frac)
                 )
                 return StatusV2(
                     version=2,
@@ -155,7 +189,9 @@ class DLXEngine(EngineProtocol):
         # Helpers
         # -------------------------
         def time_up() -> bool:
-            return time_limit > 0 and (time.time() - t0) >= time_limit
+            if time_limit > 0 and (time.time() - t0) >= time_limit:
+                return True
+            return cancel is not None and bool(cancel())
 
         # Generate all valid piece-combinations that sum to container size
         def generate_piece_combinations(csize: int, available_pieces: Dict[str, int]) -> List[Dict[str, int]]:
@@ -221,13 +257,40 @@ class DLXEngine(EngineProtocol):
         # Coordinate mapper for row/column integer ids
         mapper = CoordinateMapper()
         container_coord_ids = mapper.map_coordinates(container_cells)  # expected 0..N-1 mapping
+        # Colour-count feasibility of the uncovered columns against the remaining bag
+        colours = ColouringPruner([mapper.get_coordinate(i) for i in range(len(container_cells))],
+                                  library.orientations, inv) if colour_pruning else None
+        # Memoized solvability of the uncovered columns once few enough remain
+        solvability = cleanup.enter_context(RegionMemo(library.orientations, region_memo_path,
+                                                         digest=library.digest)) if region_memo else None
+        solvability_prunes = 0
+        # Per-depth node, candidate and prune counts across all piece combinations
+        tree = TreeStats(len(container_cells) // 4) if options.get("tree_stats") else None
+
+        # Prometheus textfile / JSONL time series, polled from the search counters
+        def metrics_counters() -> Dict[str, Any]:
+            counters = {"nodes_explored": nodes_explored, "solutions_found": solutions_found,
+                        "max_depth_reached": max_depth_reached,
+                        "pruned_nodes": solvability_prunes + (colours.prunes if colours else 0)}
+            frac = progress.fraction()
+            counters.update(progress=frac, eta_ms=progress.eta_ms((time.time() - t0) * 1000, frac))
+            if solvability is not None:
+                hits = solvability.hits + solvability.disk_hits
+                counters.update(cache_hits=hits, cache_misses=solvability.lookups - hits)
+            return counters
+
+        metrics_exporter = exporter_from_options(options, "dlx", container_cid)
+        if metrics_exporter:
+            metrics_exporter.start(metrics_counters)
 
         # -------------------------
         # Main combination loop
         # -------------------------
+        progress.branch(0, len(valid_combinations))
         for combo_idx, target_inventory in enumerate(valid_combinations):
             if time_up() or solutions_found >= max_results:
                 break
+            progress.at(0, combo_idx)
 
             # -------------------------
             # Candidate generation (bounded)
@@ -250,11 +313,7 @@ class DLXEngine(EngineProtocol):
             # Piece prioritization: fewest orientations first
             priorities = []
             for pid in target_inventory.keys():
-                try:
-                    oris = get_piece_orientations(pid)
-                    oc = len([o for o in oris if o])
-                except Exception:
-                    oc = 1
+                oc = len(library.orientations.get(pid, ())) or 1
                 priorities.append((oc, pid))
             priorities.sort()
             prioritized_pieces = [pid for _, pid in priorities]
@@ -281,54 +340,54 @@ class DLXEngine(EngineProtocol):
             prioritized_positions = sorted(container_cells, key=pos_priority)
 
             # Build candidate rows
-            for pid in prioritized_pieces:
-                if early_exit or time_up() or candidates_generated >= CANDIDATE_BUDGET:
-                    break
-                if target_inventory.get(pid, 0) <= 0:
-                    continue
-
-                try:
-                    orientations = get_piece_orientations(pid)
-                except KeyError:
-                    orientations = [[[0, 0, 0]]]
-
-                for oi, orient in enumerate(orientations):
+            with prof.phase("build_rows"):
+                for pid in prioritized_pieces:
                     if early_exit or time_up() or candidates_generated >= CANDIDATE_BUDGET:
                         break
-                    if not orient:
+                    if target_inventory.get(pid, 0) <= 0:
                         continue
-                    anchor = tuple(map(int, orient[0]))
 
-                    for c in prioritized_positions:
+                    orientations = library.orientations.get(pid, (((0, 0, 0),),))
+                    rel_tables = library.rel.get(pid, ((((0, 0, 0),),),))
+
+                    for oi, orient in enumerate(orientations):
                         if early_exit or time_up() or candidates_generated >= CANDIDATE_BUDGET:
                             break
-
-                        dx, dy, dz = c[0] - anchor[0], c[1] - anchor[1], c[2] - anchor[2]
-                        cov = tuple(sorted((u[0] + dx, u[1] + dy, u[2] + dz) for u in orient))
-                        if any(cc not in container_set for cc in cov):
-                            continue
-
-                        canon = canonical_atom_tuple(cov)  # dedup same footprint per piece/orientation
-                        key = (pid, canon)
-                        if key in seen_canon:
+                        if not orient:
                             continue
-                        seen_canon.add(key)
-
-                        # Map coordinates to integer ids
-                        try:
-                            coord_ids = mapper.map_coordinates(list(cov))
-                            cellset = frozenset(coord_ids)
-                        except KeyError:
-                            continue
-
-                        row_key = f"{pid}|o{oi}|t{dx},{dy},{dz}"
-                        row_id = mapper.map_row(row_key, pid, oi, (dx, dy, dz), list(cov))
-
-                        best_per_cellset[cellset] = row_id  # keep last (simple policy)
-                        candidates_generated += 1
-                        if max_rows_cap and candidates_generated >= int(max_rows_cap):
-                            early_exit = True
-                            break
+                        anchor = orient[0]
+                        rel0 = rel_tables[oi][0]
+
+                        for c in prioritized_positions:
+                            if early_exit or time_up() or candidates_generated >= CANDIDATE_BUDGET:
+                                break
+
+                            dx, dy, dz = c[0] - anchor[0], c[1] - anchor[1], c[2] - anchor[2]
+                            cov = tuple(sorted((c[0] + r[0], c[1] + r[1], c[2] + r[2]) for r in rel0))
+                            if any(cc not in container_set for cc in cov):
+                                continue
+
+                            canon = canonical_atom_tuple(cov)  # dedup same footprint per piece/orientation
+                            key = (pid, canon)
+                            if key in seen_canon:
+                                continue
+                            seen_canon.add(key)
+
+                            # Map coordinates to integer ids
+                            try:
+                                coord_ids = mapper.map_coordinates(list(cov))
+                                cellset = frozenset(coord_ids)
+                            except KeyError:
+                                continue
+
+                            row_key = f"{pid}|o{oi}|t{dx},{dy},{dz}"
+                            row_id = mapper.map_row(row_key, pid, oi, (dx, dy, dz), list(cov))
+
+                            best_per_cellset[cellset] = row_id  # keep last (simple policy)
+                            candidates_generated += 1
+                            if max_rows_cap and candidates_generated >= int(max_rows_cap):
+                                early_exit = True
+                                break
 
             if time_up():
                 break
@@ -360,34 +419,46 @@ class DLXEngine(EngineProtocol):
             row_id_to_index = {rid: idx for idx, rid in enumerate(rows_cols.keys())}
             index_to_row_id = {idx: rid for rid, idx in row_id_to_index.items()}
 
+            row_masks: Dict[int, int] = {}
             for rid, colset in rows_cols.items():
                 row_idx = row_id_to_index[rid]
                 col_indices = [cid for cid in colset if 0 <= cid < num_columns]
                 bitmap_state.set_row_columns(row_idx, col_indices)
+                row_masks[rid] = sum(1 << cid for cid in col_indices)
 
             solution_rows: List[int] = []
             piece_usage: Dict[str, int] = {p: 0 for p in target_inventory.keys()}
             cover_stack: List[Tuple[int, int]] = []  # (removed_cols_bitmap, removed_rows_bitmap)
+            covered_mask = 0
 
             # -------------------------
             # DLX recursive search
             # -------------------------
             def search() -> Iterator[List[int]]:
-                nonlocal nodes_explored, max_depth_reached, max_pieces_placed, current_stack_rows
+                nonlocal nodes_explored, max_depth_reached, max_pieces_placed, current_stack_rows, covered_mask
+                nonlocal solvability_prunes
 
                 # update status bookkeeping
                 nodes_explored += 1
                 max_depth_reached = max(max_depth_reached, len(solution_rows))
                 max_pieces_placed = max(max_pieces_placed, len(solution_rows))
 
+                depth = len(solution_rows)
+
                 # refresh snapshot stack (like DFS)
-                current_stack_rows = []
-                for row_id in solution_rows[-status_max_stack:]:
-                    if row_id in rows_meta:
-                        current_stack_rows.append(rows_meta[row_id])
+                with prof.phase("snapshot_copy", depth):
+                    current_stack_rows = []
+                    for row_id in solution_rows[-status_max_stack:]:
+                        if row_id in rows_meta:
+                            current_stack_rows.append(rows_meta[row_id])
+
+                if tree is not None:
+                    tree.nodes[depth] += 1
 
                 # time check
                 if time_up():
+                    if tree is not None:
+                        tree.prune("time", depth)
                     return
 
                 if bitmap_state.is_solved():
@@ -395,28 +466,61 @@ class DLXEngine(EngineProtocol):
                     return
 
                 if bitmap_state.has_empty_column():
+                    if tree is not None:
+                        tree.prune("dead_end", depth)
                     return
 
+                with prof.phase("prune_checks", depth):
+                    if colours is not None:
+                        remaining = {p: n - piece_usage.get(p, 0) for p, n in target_inventory.items()}
+                        if not colours.feasible(covered_mask, remaining):
+                            if tree is not None:
+                                tree.prune("colour", depth)
+                            return
+
+                    if solvability is not None:
+                        open_cols = [i for i in range(num_columns) if not covered_mask >> i & 1]
+                        if len(open_cols) <= region_memo_cells:
+                            remaining = {p: n - piece_usage.get(p, 0) for p, n in target_inventory.items()}
+                            if solvability.solvable([mapper.get_coordinate(i) for i in open_cols], remaining) is False:
+                                solvability_prunes += 1
+                                if tree is not None:
+                                    tree.prune("solvability", depth)
+                                return
+
                 # MRV column (bitmap_state chooses col with min candidates)
-                col, candidate_count = bitmap_state.choose_best_column()
-                if col == -1 or candidate_count == 0:
-                    return
+                with prof.phase("choose_column", depth):
+                    col, candidate_count = bitmap_state.choose_best_column()
+                    if col == -1 or candidate_count == 0:
+                        if tree is not None:
+                            tree.prune("dead_end", depth)
+                        return
 
-                candidate_indices = bitmap_state.get_column_candidates(col)
-                candidate_row_ids = [index_to_row_id[idx] for idx in candidate_indices]
-                candidate_row_ids = tie_shuffle(candidate_row_ids, rnd.randint(0, 2**31 - 1))
+                    candidate_indices = bitmap_state.get_column_candidates(col)
+                    candidate_row_ids = [index_to_row_id[idx] for idx in candidate_indices]
+                    candidate_row_ids = tie_shuffle(candidate_row_ids, rnd.randint(0, 2**31 - 1))
+                if tree is not None:
+                    tree.generated[depth] += len(candidate_row_ids)
 
-                for row_id in candidate_row_ids:
+                progress.branch(depth + 1, len(candidate_row_ids))
+                for ci, row_id in enumerate(candidate_row_ids):
+                    progress.at(depth + 1, ci)
                     piece_id = rows_meta[row_id]["piece"]
                     if piece_usage[piece_id] >= target_inventory.get(piece_id, 0):
+                        if tree is not None:
+                            tree.prune("inventory", depth)
                         continue
+                    if tree is not None:
+                        tree.tried[depth] += 1
 
-                    solution_rows.append(row_id)
-                    piece_usage[piece_id] += 1
+                    with prof.phase("cover", depth):
+                        solution_rows.append(row_id)
+                        piece_usage[piece_id] += 1
+                        covered_mask ^= row_masks[row_id]
 
-                    row_idx = row_id_to_index[row_id]
-                    removed_cols, removed_rows = bitmap_state.cover_row(row_idx)
-                    cover_stack.append((removed_cols, removed_rows))
+                        row_idx = row_id_to_index[row_id]
+                        removed_cols, removed_rows = bitmap_state.cover_row(row_idx)
+                        cover_stack.append((removed_cols, removed_rows))
 
                     for sol in search():
                         yield sol
@@ -424,13 +528,16 @@ class DLXEngine(EngineProtocol):
                             break
 
                     # backtrack
-                    removed_cols, removed_rows = cover_stack.pop()
-                    bitmap_state.uncover(removed_cols, removed_rows)
-                    piece_usage[piece_id] -= 1
-                    solution_rows.pop()
+                    with prof.phase("uncover", depth):
+                        removed_cols, removed_rows = cover_stack.pop()
+                        bitmap_state.uncover(removed_cols, removed_rows)
+                        piece_usage[piece_id] -= 1
+                        covered_mask ^= row_masks[row_id]
+                        solution_rows.pop()
 
                     if time_up():
                         return
+                progress.at(depth + 1, len(candidate_row_ids))  # whole subtree done
 
             # -------------------------
             # Enumerate solutions for this combination
@@ -460,7 +567,8 @@ class DLXEngine(EngineProtocol):
                     })
                     all_coords.extend(covered)
 
-                sid = canonical_state_signature(all_coords, sym_group)
+                with prof.phase("solution_signature", len(sol_rows)):
+                    sid = canonical_state_signature(all_coords, sym_group)
 
                 yield {
                     "type": "solution",
@@ -482,6 +590,8 @@ class DLXEngine(EngineProtocol):
 
             if time_up() or solutions_found >= max_results:
                 break
+        else:
+            progress.at(0, len(valid_combinations))
 
         # -------------------------
         # Finalize
@@ -491,6 +601,12 @@ class DLXEngine(EngineProtocol):
                 status_emitter.stop()
             except Exception:
                 pass
+        if solvability is not None:
+            solvability.close()
+        if metrics_exporter:
+            metrics_exporter.stop(metrics_counters())
+        if profile_path:
+            prof.write_collapsed(profile_path)
 
         yield {
             "type": "done",
@@ -499,6 +615,11 @@ class DLXEngine(EngineProtocol):
                 "nodes_explored": nodes_explored,
                 "time_elapsed": time.time() - t0,
                 "max_depth_reached": max_depth_reached,
-                "max_pieces_placed": max_pieces_placed
+                "max_pieces_placed": max_pieces_placed,
+                "progress": round(progress.fraction(), 6),
+                **({"colour_checks": colours.checks, "colour_prunes": colours.prunes} if colours is not None else {}),
+                **(dict(solvability.stats(), solvability_prunes=solvability_prunes) if solvability is not None else {}),
+                **({"tree_stats": tree.to_dict()} if tree is not None else {}),
+                **({"profile": prof.summary()} if prof.enabled else {}),
             }
         }
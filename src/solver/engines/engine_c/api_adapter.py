@@ -5,7 +5,13 @@ from ...engine_api import EngineProtocol, EngineOptions, SolveEvent
 from .lattice_fcc import Int3, validate_fcc_connectivity
 from .precompute import build_placement_data, validate_container_piece_fit
 from .search import dfs_solve
+from .ordering import ORDERINGS, SHUFFLE_POLICIES
 from .rand import Rng
+from ...cell_order import order_cells
+from ...preflight import preflight_done
+from ...table_cache import cached_table
+from ...profiler import NULL_PROFILER, PhaseProfiler
+from ....reporting.metrics import exporter_from_options
 import time
 import hashlib
 
@@ -34,14 +40,31 @@ class EngineCAdapter(EngineProtocol):
         # Extract configuration from options
         seed = options.get("seed", 20250907)
         flags = options.get("flags", {})
-        max_results = flags.get("max_results", 1)
-        time_budget_s = flags.get("time_budget_s", 300.0)
+        max_results = flags.get("max_results", options.get("max_results", 1))
+        time_budget_s = flags.get("time_budget_s", options.get("time_limit") or 300.0)
         pruning_level = flags.get("pruning_level", "basic")
         shuffle_policy = flags.get("shuffle", "ties_only")
+        ordering = options.get("ordering") or flags.get("ordering", "lcv")
+        ordering_compare = bool(options.get("ordering_compare") or flags.get("ordering_compare", False))
+        if shuffle_policy not in SHUFFLE_POLICIES:
+            raise ValueError(f"shuffle must be one of: {', '.join(SHUFFLE_POLICIES)}")
+        if ordering not in ORDERINGS:
+            raise ValueError(f"ordering must be one of: {', '.join(ORDERINGS)}")
+        rejected = preflight_done(container, inventory, options)
+        if rejected is not None:
+            done = self._emit_done(start_time, seed, 0, 0, 0)
+            done["metrics"].update(rejected["metrics"])
+            yield done
+            return
         snapshot_every_nodes = flags.get("snapshot_every_nodes", 10000)
+        profile_path = options.get("profile_path")
+        profiler = PhaseProfiler("engine-c") if options.get("profile") or profile_path else NULL_PROFILER
         
         # Extract container cells
         container_cells = [tuple(cell) for cell in container.get("coordinates", container.get("cells", []))]
+        cell_order = options.get("cell_order") or flags.get("cell_order")
+        if cell_order and container_cells:
+            container_cells = order_cells(container_cells, cell_order)  # default: input order
         if not container_cells:
             yield self._emit_done(start_time, seed, 0, 0, 0)
             return
@@ -63,6 +86,9 @@ class EngineCAdapter(EngineProtocol):
                 elif isinstance(piece_def, dict) and "cells" in piece_def:
                     piece_cells = [tuple(cell) for cell in piece_def["cells"]]
                     pieces_data[piece_id] = piece_cells
+                # StaticPieceDef from load_fcc_A_to_Y (orientations come from precompute)
+                elif getattr(piece_def, "orientations", None):
+                    pieces_data[piece_id] = list(piece_def.orientations[0])
         
         # Validate piece fit (temporarily disabled for debugging)
         # if not validate_container_piece_fit(container_cells, pieces_data, piece_inventory):
@@ -72,7 +98,9 @@ class EngineCAdapter(EngineProtocol):
         (
             candidates, covers_by_cell, candidate_meta, all_mask,
             index_of_cell, cells_by_index, piece_cell_counts
-        ) = build_placement_data(container_cells, pieces_data)
+        ) = cached_table(options, container,
+                         ("engine-c", cell_order, tuple(sorted((p, tuple(cs)) for p, cs in pieces_data.items()))),
+                         lambda: build_placement_data(container_cells, pieces_data))
         
         
         if not candidates:
@@ -90,7 +118,10 @@ class EngineCAdapter(EngineProtocol):
             candidates, covers_by_cell, candidate_meta, all_mask,
             cells_by_index, index_of_cell, piece_inventory,
             max_results, time_budget_s, pruning_level, shuffle_policy,
-            rng, snapshot_every_nodes, start_time, seed
+            rng, snapshot_every_nodes, start_time, seed,
+            cancel_flag=options.get("cancel"), ordering=ordering,
+            ordering_compare=ordering_compare, profiler=profiler, profile_path=profile_path,
+            metrics_exporter=exporter_from_options(options, "engine-c", self._compute_container_cid(container_cells))
         )
         
         # Yield events as they come from the search
@@ -100,20 +131,29 @@ class EngineCAdapter(EngineProtocol):
     def _run_interruptible_search(self, candidates, covers_by_cell, candidate_meta, all_mask,
                                  cells_by_index, index_of_cell, piece_inventory,
                                  max_results, time_budget_s, pruning_level, shuffle_policy,
-                                 rng, snapshot_every_nodes, start_time, seed):
+                                 rng, snapshot_every_nodes, start_time, seed,
+                                 cancel_flag=None, ordering="lcv", ordering_compare=False,
+                                 profiler=NULL_PROFILER, profile_path=None, metrics_exporter=None):
         """Run search with standard yield-after-progress pattern."""
         from .search import dfs_solve
         
         solutions_found = 0
         solution_placements = []
+        # Search counters as of the last progress callback, polled by the metrics exporter
+        counters = {"nodes_explored": 0, "solutions_found": 0, "max_depth_reached": 0}
+        if metrics_exporter:
+            metrics_exporter.start(lambda: dict(counters))
         
         def on_solution(placements):
             nonlocal solutions_found, solution_placements
             solutions_found += 1
+            counters["solutions_found"] = solutions_found
             solution_placements = placements  # Store the solution
         
         def on_progress(nodes, depth, elapsed):
             # Progress will be handled by the CLI layer
+            counters["nodes_explored"] = nodes
+            counters["max_depth_reached"] = max(counters["max_depth_reached"], depth)
             return True  # Continue search
         
         # Use the proper DFS search
@@ -132,8 +172,26 @@ class EngineCAdapter(EngineProtocol):
             rng=rng,
             snapshot_every_nodes=snapshot_every_nodes,
             on_solution=on_solution,
-            on_progress=on_progress
+            on_progress=on_progress,
+            cancel_flag=cancel_flag,
+            ordering=ordering,
+            profiler=profiler
         )
+        nodes_by_ordering = {ordering: stats["nodes"]}
+        if metrics_exporter:
+            metrics_exporter.stop({"nodes_explored": stats["nodes"], "solutions_found": solutions_found,
+                                   "max_depth_reached": stats["bestDepth"], "pruned_nodes": stats["pruned"]})
+        if ordering_compare and ordering != "index":
+            # Re-run without the heuristic (same seed and budgets) for comparison
+            baseline = dfs_solve(
+                candidates=candidates, covers_by_cell=covers_by_cell, candidate_meta=candidate_meta,
+                all_mask=all_mask, cells_by_index=cells_by_index, index_of_cell=index_of_cell,
+                inventory=piece_inventory, max_results=max_results, time_budget_s=time_budget_s,
+                pruning_level=pruning_level, shuffle_policy=shuffle_policy, rng=Rng(seed),
+                snapshot_every_nodes=snapshot_every_nodes, on_solution=lambda placements: None,
+                on_progress=on_progress, cancel_flag=cancel_flag, ordering="index"
+            )
+            nodes_by_ordering["index"] = baseline["nodes"]
         
         # Emit solution event if found
         if solutions_found > 0 and solution_placements:
@@ -148,7 +206,15 @@ class EngineCAdapter(EngineProtocol):
             }
         
         # Emit final done event
-        yield self._emit_done(start_time, seed, solutions_found, stats["nodes"], stats["pruned"])
+        done = self._emit_done(start_time, seed, solutions_found, stats["nodes"], stats["pruned"])
+        done["metrics"]["bestDepth"] = stats["bestDepth"]
+        done["metrics"]["ordering"] = ordering
+        done["metrics"]["nodes_by_ordering"] = nodes_by_ordering
+        if profiler.enabled:
+            done["metrics"]["profile"] = profiler.summary()
+            if profile_path:
+                profiler.write_collapsed(profile_path)
+        yield done
     
     def _emit_done(self, start_time: float, seed: int, solutions: int, nodes: int, pruned: int):
         """Helper to emit done event."""
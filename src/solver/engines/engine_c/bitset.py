@@ -8,6 +8,10 @@ def popcount(x: int) -> int:
     return bin(x).count('1')
 
 
+if hasattr(int, "bit_count"):  # Python 3.10+: native popcount
+    popcount = int.bit_count  # noqa: F811
+
+
 def bitset_from_indices(indices: List[int], max_bits: int) -> int:
     """Create bitset from list of bit indices."""
     result = 0
@@ -1,97 +1,206 @@
-"""Holes-first ordering strategy for target cell selection."""
+"""Holes-first target selection and least-constraining-value candidate ordering."""
 
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+from .bitset import popcount
 from .rand import Rng
 
+# Candidate ordering modes:
+#   "index"  - no heuristic; all candidates score equal (ties_only == full shuffle)
+#   "lcv"    - fewest live placements killed (overlaps, plus the piece's other
+#              placements when this is its last copy)
+#   "mincov" - largest minimum remaining coverage among neighbouring empty cells
+ORDERINGS = ("index", "lcv", "mincov")
+SHUFFLE_POLICIES = ("none", "ties_only", "full")
 
-def pick_target_cell(empty_bitset: int, covers_by_cell: List[List[int]], 
-                    feasible_mask: int) -> int:
+
+class ConflictTable:
+    """Bitset views of the candidate conflict structure.
+
+    ``cover_bits[cell]`` has bit ``k`` set for every candidate ``k`` covering
+    ``cell``; ``conflicts[k]`` is the union over ``k``'s cells, i.e. every
+    candidate that overlaps ``k`` (including ``k``). ``piece_bits[p]`` holds
+    all candidates of piece ``p``. ``neighbors[k]`` lists the cells outside
+    ``k`` that share some candidate with one of ``k``'s cells.
+
+    With these the live-candidate mask can be updated incrementally:
+    placing ``k`` leaves ``live & ~kill_mask(k, ...)``.
+    """
+
+    def __init__(self, candidates: List[int], covers_by_cell: List[List[int]],
+                 candidate_meta: List[Tuple[str, int, int]]):
+        self.candidate_meta = candidate_meta
+        cand_cells: List[List[int]] = [[] for _ in candidates]
+        self.cover_bits: List[int] = []
+        for cell_idx, covering in enumerate(covers_by_cell):
+            bits = 0
+            for k in covering:
+                bits |= 1 << k
+                cand_cells[k].append(cell_idx)
+            self.cover_bits.append(bits)
+
+        self.piece_bits: Dict[str, int] = {}
+        for k, (piece_id, _, _) in enumerate(candidate_meta):
+            self.piece_bits[piece_id] = self.piece_bits.get(piece_id, 0) | (1 << k)
+
+        reach = []  # cells reachable from each cell through one candidate
+        for covering in covers_by_cell:
+            bits = 0
+            for k in covering:
+                bits |= candidates[k]
+            reach.append(bits)
+
+        self.conflicts: List[int] = []
+        self.neighbors: List[Tuple[int, ...]] = []
+        for k, cells in enumerate(cand_cells):
+            conf = 0
+            near = 0
+            for c in cells:
+                conf |= self.cover_bits[c]
+                near |= reach[c]
+            near &= ~candidates[k]
+            self.conflicts.append(conf)
+            self.neighbors.append(tuple(i for i in range(len(covers_by_cell)) if (near >> i) & 1))
+
+    def kill_mask(self, cand_idx: int, inventory: Dict[str, int]) -> int:
+        """Candidates made infeasible by placing ``cand_idx`` (before decrementing inventory)."""
+        piece_id = self.candidate_meta[cand_idx][0]
+        mask = self.conflicts[cand_idx]
+        if inventory.get(piece_id, 0) <= 1:
+            mask |= self.piece_bits[piece_id]
+        return mask
+
+
+def pick_target_cell(empty_bitset: int, covers_by_cell: List[List[int]],
+                    feasible_mask: int, cover_bits: Optional[List[int]] = None) -> int:
     """
     Choose empty cell with fewest feasible candidates (holes-first strategy).
-    
+
     Args:
         empty_bitset: Bitset of currently empty cells
         covers_by_cell: For each cell index, list of candidate indices covering it
         feasible_mask: Bitset of currently feasible candidates
-        
+        cover_bits: Optional ``ConflictTable.cover_bits`` for popcount-based counting
+
     Returns:
-        Cell index with minimum feasible candidates, or -1 if none
+        Cell index with minimum feasible candidates, or -1 if none or if some
+        empty cell can no longer be covered (dead end)
     """
     min_candidates = float('inf')
     best_cell = -1
-    
+
     # Check all cells to find empty ones
     for cell_idx in range(len(covers_by_cell)):
         # Check if this cell is empty
         if empty_bitset & (1 << cell_idx):
             # Count feasible candidates for this empty cell
-            feasible_count = 0
-            for cand_idx in covers_by_cell[cell_idx]:
-                if cand_idx < 64 and (feasible_mask & (1 << cand_idx)):  # Limit to 64-bit for now
-                    feasible_count += 1
-            
+            if cover_bits is not None:
+                feasible_count = popcount(cover_bits[cell_idx] & feasible_mask)
+            else:
+                feasible_count = 0
+                for cand_idx in covers_by_cell[cell_idx]:
+                    if feasible_mask & (1 << cand_idx):
+                        feasible_count += 1
+
+            if feasible_count == 0:
+                return -1  # uncoverable hole
             # Update best if this cell has fewer candidates
-            if feasible_count < min_candidates and feasible_count > 0:
+            if feasible_count < min_candidates:
                 min_candidates = feasible_count
                 best_cell = cell_idx
-    
+
     return best_cell
 
 
-def order_candidates(candidate_ids: List[int], shuffle_policy: str, 
-                    rng: Rng) -> List[int]:
+def order_candidates(candidate_ids: List[int], shuffle_policy: str,
+                    rng: Rng, scores: Optional[Dict[int, int]] = None) -> List[int]:
     """
-    Order candidates with optional shuffling for tie-breaking.
-    
+    Order candidates by score (lower first) with optional shuffling.
+
     Args:
         candidate_ids: List of candidate indices
         shuffle_policy: "none", "ties_only", or "full"
         rng: Random number generator for shuffling
-        
+        scores: Optional candidate scores from ``compute_candidate_scores``;
+            without scores every candidate is a tie
+
     Returns:
         Ordered list of candidate indices
     """
     if not candidate_ids:
         return []
-    
-    # Base ordering: stable sort by candidate index (deterministic)
-    ordered = sorted(candidate_ids)
-    
+
+    # Base ordering: stable sort by (score, candidate index) (deterministic)
+    if scores:
+        ordered = sorted(candidate_ids, key=lambda c: (scores.get(c, 0), c))
+    else:
+        ordered = sorted(candidate_ids)
+
     if shuffle_policy == "none":
         return ordered
     elif shuffle_policy == "ties_only":
-        # For now, treat all as ties and shuffle
-        # TODO: Implement actual tie detection based on heuristic scores
-        return rng.shuffle(ordered.copy())
+        if not scores:
+            return rng.shuffle(ordered.copy())
+        # Shuffle within each run of equal scores
+        result: List[int] = []
+        i = 0
+        while i < len(ordered):
+            j = i + 1
+            s = scores.get(ordered[i], 0)
+            while j < len(ordered) and scores.get(ordered[j], 0) == s:
+                j += 1
+            run = ordered[i:j]
+            result.extend(rng.shuffle(run) if len(run) > 1 else run)
+            i = j
+        return result
     elif shuffle_policy == "full":
         return rng.shuffle(ordered.copy())
     else:
         raise ValueError(f"Unknown shuffle policy: {shuffle_policy}")
 
 
-def compute_candidate_scores(candidate_ids: List[int], 
-                           covers_by_cell: List[List[int]],
-                           empty_bitset: int) -> Dict[int, int]:
+def compute_candidate_scores(candidate_ids: List[int],
+                           table: ConflictTable,
+                           feasible_mask: int,
+                           empty_bitset: int,
+                           inventory: Dict[str, int],
+                           mode: str = "lcv") -> Dict[int, int]:
     """
     Compute heuristic scores for candidates (least constraining value).
-    
+
     Args:
         candidate_ids: List of candidate indices to score
-        covers_by_cell: Coverage information for each cell
+        table: Conflict structure of the candidate set
+        feasible_mask: Currently live candidates
         empty_bitset: Current empty cells
-        
+        inventory: Remaining piece counts
+        mode: One of ``ORDERINGS``
+
     Returns:
         Dictionary mapping candidate_id to score (lower is better)
     """
+    if mode == "index":
+        return {cand_id: 0 for cand_id in candidate_ids}
+    if mode not in ORDERINGS:
+        raise ValueError(f"Unknown ordering: {mode}")
+
     scores = {}
-    
     for cand_id in candidate_ids:
-        # Score based on how many future choices this candidate eliminates
-        # Lower score = less constraining = better
-        constraint_count = 0
-        
-        # This is a placeholder - would need actual candidate coverage data
-        # For now, use candidate index as a simple heuristic
-        scores[cand_id] = cand_id
-    
+        killed = table.kill_mask(cand_id, inventory) & feasible_mask
+        if mode == "lcv":
+            # Live placements this candidate eliminates (excluding itself)
+            scores[cand_id] = popcount(killed) - 1
+            continue
+        # mincov: prefer candidates whose tightest neighbouring hole stays widest
+        live_after = feasible_mask & ~killed
+        min_cov = None
+        for cell_idx in table.neighbors[cand_id]:
+            if (empty_bitset >> cell_idx) & 1:
+                cov = popcount(table.cover_bits[cell_idx] & live_after)
+                if min_cov is None or cov < min_cov:
+                    min_cov = cov
+                    if cov == 0:
+                        break
+        # no empty neighbours: constrains nothing, so rank it with the widest possible hole
+        scores[cand_id] = -(min_cov if min_cov is not None else popcount(live_after))
+
     return scores
@@ -5,7 +5,10 @@ from .lattice_fcc import Int3, fcc_rotations, apply_rot
 from .bitset import bitset_from_indices, all_bits_mask
 
 try:
-    from ....pieces.sphere_orientations import get_piece_orientations
+    from ....pieces.compiled import compiled_library
+
+    def get_piece_orientations(piece_id: str):
+        return compiled_library().orientations[piece_id]
 except ImportError:
     def get_piece_orientations(piece_id: str):
         return [[[0, 0, 0]]]  # Fallback
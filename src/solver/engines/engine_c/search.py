@@ -3,9 +3,10 @@
 import time
 from typing import List, Dict, Callable, Optional, Tuple
 from .bitset import bitset_intersects, bitset_difference, popcount
-from .ordering import pick_target_cell, order_candidates
+from .ordering import ConflictTable, pick_target_cell, order_candidates, compute_candidate_scores
 from .pruning.disconnected import is_disconnected
 from .rand import Rng
+from ...profiler import NULL_PROFILER
 
 
 class SearchState:
@@ -38,7 +39,9 @@ def dfs_solve(
     snapshot_every_nodes: int,
     on_solution: Callable,
     on_progress: Callable,
-    cancel_flag: Optional[Callable[[], bool]] = None
+    cancel_flag: Optional[Callable[[], bool]] = None,
+    ordering: str = "index",
+    profiler=NULL_PROFILER
 ) -> Dict:
     """
     Core DFS search with all Engine-C optimizations.
@@ -60,14 +63,18 @@ def dfs_solve(
         on_solution: Solution callback
         on_progress: Progress callback
         cancel_flag: Cancellation check function
+        ordering: Candidate ordering, "index", "lcv" or "mincov" (see ordering.py)
+        profiler: Phase profiler (see solver/profiler.py); no-op by default
         
     Returns:
         Search statistics dictionary
     """
     state = SearchState()
     remaining_inventory = inventory.copy()
+    table = ConflictTable(candidates, covers_by_cell, candidate_meta)
     
-    def search_recursive(occ_bitset: int, depth: int, solution_path: List[int] = None) -> bool:
+    def search_recursive(occ_bitset: int, depth: int, solution_path: List[int] = None,
+                         feasible_mask: Optional[int] = None) -> bool:
         """Recursive DFS implementation."""
         if solution_path is None:
             solution_path = []
@@ -149,16 +156,21 @@ def dfs_solve(
                 return True
             return False
         
-        # Pick target cell using holes-first strategy
-        feasible_mask = compute_feasible_candidates(
-            candidates, occ_bitset, remaining_inventory, candidate_meta
-        )
+        # Live candidates: maintained incrementally from the conflict table,
+        # computed from scratch only at the root
+        if feasible_mask is None:
+            with profiler.phase("feasible", depth):
+                feasible_mask = compute_feasible_candidates(
+                    candidates, occ_bitset, remaining_inventory, candidate_meta
+                )
         
         if feasible_mask == 0:
             state.nodes_pruned += 1
             return False  # No feasible candidates at all
         
-        target_cell = pick_target_cell(empty_bitset, covers_by_cell, feasible_mask)
+        # Pick target cell using holes-first strategy
+        with profiler.phase("pick_target", depth):
+            target_cell = pick_target_cell(empty_bitset, covers_by_cell, feasible_mask, table.cover_bits)
         if target_cell == -1:
             state.nodes_pruned += 1
             return False  # No valid target cell
@@ -174,7 +186,12 @@ def dfs_solve(
             return False  # No feasible candidates
         
         # Order candidates
-        ordered_candidates = order_candidates(covering_candidates, shuffle_policy, rng)
+        with profiler.phase("order_candidates", depth):
+            scores = None
+            if ordering != "index":
+                scores = compute_candidate_scores(covering_candidates, table, feasible_mask,
+                                                  empty_bitset, remaining_inventory, ordering)
+            ordered_candidates = order_candidates(covering_candidates, shuffle_policy, rng, scores)
         
         # Try each candidate
         for cand_idx in ordered_candidates:
@@ -202,12 +219,14 @@ def dfs_solve(
             #         state.nodes_pruned += 1
             #         continue
             
-            # Update inventory
+            # Update live candidates and inventory
+            with profiler.phase("kill_mask", depth):
+                child_feasible = feasible_mask & ~table.kill_mask(cand_idx, remaining_inventory)
             remaining_inventory[piece_id] -= 1
             
             # Recurse with updated solution path
             new_solution_path = solution_path + [cand_idx]
-            should_stop = search_recursive(new_occ, depth + 1, new_solution_path)
+            should_stop = search_recursive(new_occ, depth + 1, new_solution_path, child_feasible)
             
             # Restore inventory
             remaining_inventory[piece_id] += 1
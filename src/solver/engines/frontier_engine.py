@@ -0,0 +1,246 @@
+"""Frontier (broken-profile) dynamic-programming engine.
+
+Cells are swept in a fixed layer order. Every placement is anchored at its
+earliest cell in that order and spans at most ``W`` consecutive positions
+(the frontier width). At position ``i`` a state is
+
+    (bits of cells i .. i+W-1 already filled, remaining bag)
+
+and all partial tilings reaching the same state are merged: their counts are
+summed and up to ``max_results`` witnesses are kept. Advancing one position
+either skips a filled cell or fills the empty cell ``i`` with a placement
+anchored there. After the last cell the surviving state's count is the
+number of solutions, and its witnesses are emitted as solution events.
+
+Work is proportional to (cells x distinct states), so slab-like containers
+swept along their long axis stay cheap where DFS/DLX explore every placement
+order. The sweep axis is chosen to minimise ``W``.
+
+Options: ``max_results``, ``time_limit``, ``cancel``, ``progress_interval_ms``,
+``count_only`` (report ``solutions_total``/``solutions_unique`` without
+witnesses), ``max_states`` (give up once a layer exceeds this many states,
+0 = unlimited; default 2,000,000), ``metrics_prom``/``metrics_jsonl``.
+"""
+
+from __future__ import annotations
+import time
+from itertools import permutations
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ..engine_api import EngineProtocol, EngineOptions, SolveEvent
+from ...pieces.compiled import compiled_library
+from ...io.solution_sig import canonical_state_signature
+from ...solver.symbreak import container_symmetry_group
+from ...solver.preflight import preflight_done
+from ...solver.counting import CountStopped, SolutionCounter, container_symmetries
+from ...solver.placement_gen import PlacementRow, enumerate_placements
+from ...solver.table_cache import cached_table
+from ...reporting.metrics import exporter_from_options
+
+I3 = Tuple[int, int, int]
+
+
+def sweep_order(cells: Sequence[I3], rows: Sequence[PlacementRow]) -> Tuple[List[I3], int, str]:
+    """Cell order (lexicographic over an axis permutation) with the smallest
+    frontier width; returns (order, width, label)."""
+    best = None
+    for perm in permutations(range(3)):
+        order = sorted(cells, key=lambda c: tuple(c[a] for a in perm))
+        pos = {c: i for i, c in enumerate(order)}
+        width = 1
+        for row in rows:
+            ps = [pos[c] for c in row[3]]
+            width = max(width, max(ps) - min(ps) + 1)
+        label = "".join("ijk"[a] for a in perm)
+        if best is None or width < best[1]:
+            best = (order, width, label)
+    return best
+
+
+class FrontierEngine(EngineProtocol):
+    name = "frontier"
+
+    def solve(self, container, inventory, pieces, options: EngineOptions) -> Iterator[SolveEvent]:
+        rejected = preflight_done(container, inventory, options)
+        if rejected is not None:
+            yield rejected
+            return
+        t0 = time.time()
+        max_results = int(options.get("max_results", 1))
+        time_limit = float(options.get("time_limit", 0) or 0)
+        cancel = options.get("cancel")
+        count_only = bool(options.get("count_only", False))
+        max_states = int(options.get("max_states", 2_000_000))
+        progress_ms = int(options.get("progress_interval_ms", 0) or 0)
+
+        coords = container.get("coordinates") or container.get("cells", [])
+        cells = sorted(tuple(int(x) for x in c) for c in coords)
+        container_cid = container.get("cid_sha256", f"container_{hash(str(container))}")
+        counts = inventory.get("pieces", inventory)
+        counts = {k: int(v) for k, v in counts.items() if int(v) > 0}
+        piece_ids = sorted(counts)
+        slot = {p: s for s, p in enumerate(piece_ids)}
+        library = compiled_library()
+
+        n = len(cells)
+
+        def layout():
+            rows = enumerate_placements(cells, library.orientations, piece_ids)
+            order, width, axes = sweep_order(cells, rows) if rows else (cells, 1, "ijk")
+            pos = {c: i for i, c in enumerate(order)}
+            # anchored[i]: (placement, frontier mask relative to i, bag slot)
+            anchored: List[List[Tuple[int, int, int]]] = [[] for _ in range(n)]
+            for q, (piece, _, _, covered) in enumerate(rows):
+                ps = [pos[c] for c in covered]
+                lo = min(ps)
+                anchored[lo].append((q, sum(1 << (p - lo) for p in ps), slot[piece]))
+            return rows, order, width, axes, anchored
+
+        rows, order, width, axes, anchored = cached_table(options, container, ("frontier", tuple(piece_ids)), layout)
+
+        keep = 0 if count_only else max(0, max_results)
+        # state -> [count, witnesses]; a witness is a cons list (placement, parent)
+        states: Dict[Tuple[int, Tuple[int, ...]], list] = {(0, tuple(counts[p] for p in piece_ids)): [1, [None]]}
+        transitions = 0
+        peak_states = 1
+        stopped: Optional[str] = None
+        last_tick = t0
+        solutions_found = 0
+
+        # Prometheus textfile / JSONL time series, polled from the sweep counters
+        def metrics_counters() -> Dict[str, Any]:
+            return {"nodes_explored": transitions, "solutions_found": solutions_found,
+                    "frontier_states": len(states), "peak_states": peak_states}
+
+        metrics_exporter = exporter_from_options(options, "frontier", container_cid)
+        if metrics_exporter:
+            metrics_exporter.start(metrics_counters)
+
+        def add(key, count, witness_list):
+            entry = nxt.get(key)
+            if entry is None:
+                nxt[key] = [count, witness_list[:keep]]
+            else:
+                entry[0] += count
+                room = keep - len(entry[1])
+                if room > 0:
+                    entry[1].extend(witness_list[:room])
+
+        def out_of_budget() -> Optional[str]:
+            if time_limit > 0 and time.time() - t0 >= time_limit:
+                return "time_limit"
+            if cancel is not None and cancel():
+                return "cancelled"
+            return None
+
+        if n % 4 != 0 or sum(counts.values()) * 4 < n:
+            states = {}
+
+        for i in range(n):
+            stopped = out_of_budget()
+            if stopped is not None:
+                break
+            if progress_ms and (time.time() - last_tick) * 1000 >= progress_ms:
+                last_tick = time.time()
+                yield {"type": "tick", "t_ms": int((last_tick - t0) * 1000),
+                       "metrics": {"nodes_explored": transitions, "position": i, "frontier_states": len(states)}}
+            nxt: Dict[Tuple[int, Tuple[int, ...]], list] = {}
+            remaining = n - i
+            for (mask, bag), (count, wits) in states.items():
+                transitions += 1
+                # one position can expand ~1M states (each up to ~1k placements):
+                # poll the budget inside it too
+                if (transitions & 0xFF) == 0:
+                    stopped = out_of_budget()
+                    if stopped is not None:
+                        break
+                if mask & 1:
+                    add((mask >> 1, bag), count, wits)
+                    continue
+                # cells still to fill from here on need enough pieces
+                if sum(bag) * 4 < remaining - bin(mask).count("1"):
+                    continue
+                for q, qmask, s in anchored[i]:
+                    if qmask & mask or bag[s] == 0:
+                        continue
+                    nb = bag[:s] + (bag[s] - 1,) + bag[s + 1:]
+                    add(((mask | qmask) >> 1, nb), count, [(q, w) for w in wits])
+                if max_states and len(nxt) > max_states:
+                    stopped = "max_states"
+                    break
+            if stopped is not None:
+                break
+            states = nxt
+            peak_states = max(peak_states, len(states))
+            if not states:
+                break
+
+        total = 0
+        witnesses: List = []
+        if stopped is None:
+            for (mask, _), (count, wits) in states.items():
+                total += count
+                witnesses.extend(wits)
+
+        sym_group = container_symmetry_group(cells)
+        for w in witnesses[:keep]:
+            placements = []
+            pieces_used: Dict[str, int] = {}
+            all_coords: List[I3] = []
+            while w is not None:
+                q, w = w
+                piece, o, t, covered = rows[q]
+                pieces_used[piece] = pieces_used.get(piece, 0) + 1
+                placements.append({"piece": piece, "ori": int(o), "t": list(t),
+                                   "cells_ijk": [list(c) for c in covered]})
+                all_coords.extend(covered)
+            placements.reverse()
+            yield {
+                "type": "solution",
+                "t_ms": int((time.time() - t0) * 1000),
+                "solution": {
+                    "containerCidSha256": container_cid,
+                    "lattice": "fcc",
+                    "piecesUsed": pieces_used,
+                    "placements": placements,
+                    "sid_state_sha256": "frontier_state",
+                    "sid_route_sha256": "frontier_route",
+                    "sid_state_canon_sha256": canonical_state_signature(all_coords, sym_group),
+                },
+            }
+            solutions_found += 1
+
+        metrics: Dict[str, Any] = {
+            "solutions_found": solutions_found,
+            "nodes_explored": transitions,
+            "time_elapsed": time.time() - t0,
+            "max_depth_reached": n // 4 if total else 0,
+            "max_pieces_placed": n // 4 if total else 0,
+            "frontier_width": width,
+            "sweep_axes": axes,
+            "peak_states": peak_states,
+            "complete": stopped is None,
+        }
+        if stopped is not None:
+            metrics["stopped"] = stopped
+        else:
+            metrics["solutions_total"] = total
+        if count_only:
+            metrics["count_only"] = True
+            symmetries = container_symmetries(cells)
+            metrics["symmetry_group_order"] = len(symmetries)
+            if stopped is None:
+                left = time_limit - (time.time() - t0) if time_limit > 0 else 0.0
+                counter = SolutionCounter(cells, library.orientations, counts,
+                                          time_limit=max(left, 1e-6) if time_limit > 0 else 0.0,
+                                          cancel=cancel)
+                try:
+                    unique, fixed = counter.count_unique(symmetries, total)
+                    metrics["solutions_unique"] = unique
+                    metrics["fixed_by_symmetry"] = fixed
+                except CountStopped as e:
+                    metrics["complete"] = False
+                    metrics["stopped"] = str(e)
+        if metrics_exporter:
+            metrics_exporter.stop(metrics_counters())
+        yield {"type": "done", "t_ms": int((time.time() - t0) * 1000), "metrics": metrics}
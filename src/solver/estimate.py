@@ -0,0 +1,207 @@
+"""Knuth / Purdom search-tree size estimation for run planning.
+
+A probe walks one random root-to-leaf path of the DFS tree. At each node it
+generates the children exactly as DFS does (target cell, then every
+placement of every remaining piece that covers it) and runs the same
+node-entry checks (mod 4, hole pruning, colour pruning). If the path meets
+``d_0, d_1, ..., d_k`` children, the probe's estimate of the tree size is
+
+    1 + d_0 + d_0 d_1 + ... + d_0 d_1 ... d_(k-1)
+
+and its estimate of the number of solution leaves is ``d_0 ... d_(k-1)`` if
+it ends in a full packing that passes the R6 gate, otherwise 0. Both are
+unbiased (Knuth 1975). The mean over many independent probes is the
+estimate, with a normal-approximation 95% interval from the standard
+error. The per-probe values are heavy-tailed, so the interval is only
+reliable once the probe count is large. Purdom's partial backtracking
+(``width`` > 1) follows up to ``width`` children at each level instead of
+one and weights each by ``d / width``, which lowers the variance.
+
+Probes are split into batches run on a process pool; every batch has its
+own seed, so results depend on ``seed``, ``probes`` and ``batch`` but not
+on the worker count. ``calibrate_s`` runs the real DFS engine that long to
+measure nodes/s and converts the estimate to wall-clock time.
+
+This estimates one DFS pass without restarts, with ``target_policy``
+"window" (the default).
+"""
+
+from __future__ import annotations
+import math
+import multiprocessing as mp
+import random
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..pieces.compiled import compiled_library
+from .cell_order import order_cells
+from .colouring import ColouringPruner
+from .components import empty_components
+from .engines.dfs_engine import BitmaskDFSState, _connected_r6, mrv_window_target
+from .engines.engine_c.bitset import popcount
+from .region_shapes import ShapeIndex
+
+I3 = Tuple[int, int, int]
+
+
+class TreeProber:
+    """Random DFS-tree probes for one container, inventory and set of pruning options."""
+
+    def __init__(self, cells: Sequence[Sequence[int]], counts: Dict[str, int], options: Dict[str, Any]):
+        lib = compiled_library()
+        self.counts = {p: int(n) for p, n in counts.items() if int(n) > 0}
+        self.state = BitmaskDFSState(order_cells(cells, options.get("cell_order", "lex")))
+        self.orientations = {p: lib.orientations[p] for p in self.counts}
+        self.rel = {p: lib.rel[p] for p in self.counts}
+        self.mrv_window = int(options.get("mrv_window", 0))
+        self.hole_pruning = "lt4" if options.get("hole4") else options.get("hole_pruning", "none")
+        self.shapes = ShapeIndex(lib.orientations, keep=lambda ori: _connected_r6(list(map(tuple, ori)))) \
+            if self.hole_pruning == "shape" else None
+        cells_in_order = [self.state.index_to_cell[i] for i in range(self.state.num_cells)]
+        self.colours = ColouringPruner(cells_in_order, lib.orientations, self.counts) \
+            if options.get("colour_pruning") else None
+
+    def _pruned(self, bag: Dict[str, int]) -> bool:
+        st = self.state
+        if (st.count_empty_cells() & 3) != 0:
+            return True
+        mode = self.hole_pruning
+        if mode == "single_component" and st.has_holes_single_component():
+            return True
+        if mode in ("lt4", "shape") and st.has_holes_lt4():
+            return True
+        if self.shapes is not None:
+            for comp in empty_components(st.get_empty_mask(), st.neighbor_masks):
+                size = popcount(comp)
+                if size > 8:
+                    break
+                cells = [st.index_to_cell[i] for i in range(st.num_cells) if comp >> i & 1]
+                if not self.shapes.fillable(cells, bag):
+                    return True
+        return self.colours is not None and not self.colours.feasible(st.occupied_mask, bag)
+
+    def children(self, bag: Dict[str, int]) -> List[Tuple[str, Tuple[I3, ...]]]:
+        """DFS's candidates at the current node: (piece, covered cells) per valid anchored placement."""
+        st = self.state
+        target = mrv_window_target(st, self.mrv_window)
+        if target is None:
+            return []
+        tx, ty, tz = target
+        out = []
+        for p, n in bag.items():
+            if n <= 0:
+                continue
+            for o, ori in enumerate(self.orientations[p]):
+                for a in range(len(ori)):
+                    covered = tuple((tx + rx, ty + ry, tz + rz) for rx, ry, rz in self.rel[p][o][a])
+                    if all(c in st.cell_to_index and not st.is_occupied(st.cell_to_index[c]) for c in covered):
+                        out.append((p, covered))
+        return out
+
+    def probe(self, rng: random.Random, width: int = 1) -> Tuple[float, float, int]:
+        """One probe: (tree-size estimate, solution-count estimate, depth reached)."""
+        self.state.occupied_mask = 0
+        return self._walk(rng, dict(self.counts), [], 1.0, max(1, width), 0)
+
+    def _walk(self, rng, bag, placed, weight, width, depth) -> Tuple[float, float, int]:
+        st = self.state
+        if st.count_empty_cells() == 0:
+            ok = all(_connected_r6(list(c)) for c in placed)
+            return weight, (weight if ok else 0.0), depth
+        if self._pruned(bag):
+            return weight, 0.0, depth
+        kids = self.children(bag)
+        if not kids:
+            return weight, 0.0, depth
+        follow = rng.sample(kids, min(width, len(kids)))
+        w = weight * len(kids) / len(follow)
+        nodes, sols, deepest = weight, 0.0, depth
+        for piece, covered in follow:
+            mask = sum(1 << st.cell_to_index[c] for c in covered)
+            st.occupied_mask |= mask
+            bag[piece] -= 1
+            placed.append(covered)
+            n, s, d = self._walk(rng, bag, placed, w, width, depth + 1)
+            placed.pop()
+            bag[piece] += 1
+            st.occupied_mask &= ~mask
+            nodes, sols, deepest = nodes + n, sols + s, max(deepest, d)
+        return nodes, sols, deepest
+
+
+_PROBER: Optional[TreeProber] = None
+
+
+def _init_worker(cells, counts, options) -> None:
+    global _PROBER
+    _PROBER = TreeProber(cells, counts, options)
+
+
+def _run_batch(args: Tuple[int, int, int]) -> List[Tuple[float, float, int]]:
+    seed, n, width = args
+    rng = random.Random(seed)
+    return [_PROBER.probe(rng, width) for _ in range(n)]
+
+
+def _stats(values: Sequence[float]) -> Dict[str, float]:
+    n = len(values)
+    mean = sum(values) / n
+    var = sum((v - mean) ** 2 for v in values) / (n - 1) if n > 1 else 0.0
+    se = math.sqrt(var / n)
+    return {"mean": mean, "stderr": se, "ci95_low": max(0.0, mean - 1.96 * se), "ci95_high": mean + 1.96 * se}
+
+
+def measure_nodes_per_second(container: Dict[str, Any], counts: Dict[str, int],
+                             options: Dict[str, Any], seconds: float) -> float:
+    """Nodes/s of the DFS engine on this container with the same options."""
+    from .registry import get_engine
+    opts = {k: v for k, v in options.items() if k not in ("status_json", "metrics_prom", "metrics_jsonl")}
+    opts.update(time_limit=seconds, max_results=1 << 30, preflight=False)
+    t0 = time.time()
+    done = list(get_engine("dfs").solve(container, {"pieces": counts}, {}, opts))[-1]
+    elapsed = max(time.time() - t0, 1e-9)
+    return done["metrics"].get("nodes_explored", 0) / elapsed
+
+
+def estimate_tree(container: Dict[str, Any], counts: Dict[str, int], options: Optional[Dict[str, Any]] = None,
+                  probes: int = 1000, batch: int = 50, workers: int = 0, width: int = 1, seed: int = 0,
+                  calibrate_s: float = 0.0, nodes_per_second: Optional[float] = None) -> Dict[str, Any]:
+    """Estimate DFS tree size, solution leaves and run time for ``container`` and ``counts``.
+
+    ``workers``: process count (0 = one per CPU, 1 = in this process).
+    """
+    options = dict(options or {})
+    cells = [tuple(int(v) for v in c) for c in (container.get("coordinates") or container.get("cells", []))]
+    sizes = [min(batch, probes - i) for i in range(0, probes, batch)]
+    jobs = [(seed * 1_000_003 + k, n, width) for k, n in enumerate(sizes)]
+    t0 = time.time()
+    workers = workers or mp.cpu_count()
+    if workers == 1 or len(jobs) == 1:
+        _init_worker(cells, counts, options)
+        results = [_run_batch(j) for j in jobs]
+    else:
+        with mp.get_context().Pool(min(workers, len(jobs)), _init_worker, (cells, counts, options)) as pool:
+            results = pool.map(_run_batch, jobs)
+    samples = [r for res in results for r in res]
+    probe_s = time.time() - t0
+
+    nodes = _stats([s[0] for s in samples])
+    sols = _stats([s[1] for s in samples])
+    depths = [s[2] for s in samples]
+    report: Dict[str, Any] = {
+        "probes": len(samples),
+        "width": width,
+        "nodes": {k: round(v, 1) for k, v in nodes.items()},
+        "solutions": {k: round(v, 3) for k, v in sols.items()},
+        "probes_reaching_solution": sum(1 for s in samples if s[1] > 0),
+        "mean_probe_depth": round(sum(depths) / len(depths), 2),
+        "max_probe_depth": max(depths),
+        "probe_seconds": round(probe_s, 3),
+    }
+    if nodes_per_second is None and calibrate_s > 0:
+        nodes_per_second = measure_nodes_per_second(container, counts, options, calibrate_s)
+    if nodes_per_second:
+        report["nodes_per_second"] = round(nodes_per_second, 1)
+        report["seconds"] = {k: round(nodes[k] / nodes_per_second, 1)
+                             for k in ("mean", "ci95_low", "ci95_high")}
+    return report
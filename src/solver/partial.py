@@ -0,0 +1,188 @@
+"""Anytime best partial packings and local search to improve them.
+
+When a container has no exact cover, or none is found within budget, the
+fullest partial packing is still informative: it shows how close the
+container is to solvable and where the holes are. ``BestPartial`` keeps the
+fullest non-overlapping placement set seen so far and renders it as a
+``best_partial`` event::
+
+    {"type": "best_partial", "t_ms": ..., "partial": {
+        "containerCidSha256": ..., "lattice": "fcc", "placements": [...],
+        "piecesUsed": {...}, "cellsFilled": 36, "cellsTotal": 40,
+        "fillRatio": 0.9, "emptyCells": [[i, j, k], ...], "source": "search"}}
+
+``LocalSearch`` improves a partial packing by large-neighbourhood search:
+remove ``k`` placements next to the holes, refill greedily (most constrained
+empty cell first, random placement among those covering it), and keep the
+result when it fills at least as many cells (sideways moves let it drift
+across plateaus).
+"""
+
+from __future__ import annotations
+import random
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+
+from ..coords.symmetry_fcc import NEIGHBORS
+from .placement_gen import PlacementRow, enumerate_placements
+
+I3 = Tuple[int, int, int]
+
+
+def _placement_dict(row: PlacementRow) -> Dict[str, Any]:
+    piece, ori, t, covered = row
+    return {"piece": piece, "ori": int(ori), "t": list(map(int, t)),
+            "cells_ijk": [list(map(int, c)) for c in covered]}
+
+
+class BestPartial:
+    """Fullest partial packing seen so far."""
+
+    def __init__(self, cells: Sequence[I3], container_cid: str):
+        self.cells = sorted(tuple(c) for c in cells)
+        self.container_cid = container_cid
+        self.rows: List[PlacementRow] = []
+        self.filled = 0
+        self.source = "search"
+        self.dirty = False
+
+    def offer(self, rows: Iterable[PlacementRow], source: str = "search") -> bool:
+        """Record ``rows`` if they fill more cells than the current best."""
+        rows = list(rows)
+        filled = sum(len(r[3]) for r in rows)
+        if filled <= self.filled:
+            return False
+        self.rows, self.filled, self.source, self.dirty = rows, filled, source, True
+        return True
+
+    def as_partial(self) -> Dict[str, Any]:
+        used: Dict[str, int] = {}
+        covered: Set[I3] = set()
+        for piece, _, _, cs in self.rows:
+            used[piece] = used.get(piece, 0) + 1
+            covered.update(cs)
+        total = len(self.cells)
+        return {
+            "containerCidSha256": self.container_cid,
+            "lattice": "fcc",
+            "placements": [_placement_dict(r) for r in self.rows],
+            "piecesUsed": used,
+            "cellsFilled": self.filled,
+            "cellsTotal": total,
+            "fillRatio": round(self.filled / total, 4) if total else 0.0,
+            "emptyCells": [list(c) for c in self.cells if c not in covered],
+            "source": self.source,
+        }
+
+    def event(self, t_ms: int) -> Dict[str, Any]:
+        self.dirty = False
+        return {"type": "best_partial", "t_ms": int(t_ms), "partial": self.as_partial()}
+
+
+class LocalSearch:
+    """Destroy-and-repair search over the placements of one container."""
+
+    def __init__(self, cells: Sequence[I3], orientations: Dict[str, Sequence[Sequence[I3]]],
+                 piece_counts: Dict[str, int], seed: int = 0):
+        self.cells = sorted(tuple(c) for c in cells)
+        index = {c: i for i, c in enumerate(self.cells)}
+        self.counts = {p: int(n) for p, n in piece_counts.items() if int(n) > 0}
+        self.rows = enumerate_placements(self.cells, orientations, sorted(self.counts))
+        self.row_index = {(r[0], r[3]): q for q, r in enumerate(self.rows)}
+        self.masks = [sum(1 << index[c] for c in r[3]) for r in self.rows]
+        self.covers: List[List[int]] = [[] for _ in self.cells]
+        for q, r in enumerate(self.rows):
+            for c in r[3]:
+                self.covers[index[c]].append(q)
+        near = []
+        for c in self.cells:
+            m = 0
+            for d in NEIGHBORS:
+                j = index.get((c[0] + d[0], c[1] + d[1], c[2] + d[2]))
+                if j is not None:
+                    m |= 1 << j
+            near.append(m)
+        self.near = near
+        self.full = (1 << len(self.cells)) - 1
+        self.rng = random.Random(seed)
+        self.moves = 0
+
+    def rows_of(self, placements: Iterable[Tuple[str, Sequence[I3]]]) -> List[int]:
+        """Placement indices of ``(piece, cells)`` pairs; unknown ones are dropped."""
+        out = []
+        for piece, cs in placements:
+            q = self.row_index.get((piece, tuple(sorted(tuple(c) for c in cs))))
+            if q is not None:
+                out.append(q)
+        return out
+
+    def _repair(self, chosen: List[int]) -> List[int]:
+        mask = 0
+        avail = dict(self.counts)
+        for q in chosen:
+            mask |= self.masks[q]
+            avail[self.rows[q][0]] -= 1
+        chosen = list(chosen)
+        dead = 0
+        while True:
+            best_opts = None
+            free = self.full & ~mask & ~dead
+            while free:
+                low = free & -free
+                i = low.bit_length() - 1
+                free ^= low
+                opts = [q for q in self.covers[i] if not self.masks[q] & mask and avail[self.rows[q][0]] > 0]
+                if not opts:
+                    dead |= low  # unfillable given the rest; leave it as a hole
+                    continue
+                if best_opts is None or len(opts) < len(best_opts):
+                    best_opts = opts
+                    if len(opts) == 1:
+                        break
+            if best_opts is None:
+                return chosen
+            q = self.rng.choice(best_opts)
+            chosen.append(q)
+            mask |= self.masks[q]
+            avail[self.rows[q][0]] -= 1
+
+    def _filled(self, chosen: List[int]) -> int:
+        return sum(len(self.rows[q][3]) for q in chosen)
+
+    def run(self, start: List[int], budget_s: float, k: int = 2,
+            cancel=None) -> Iterator[List[PlacementRow]]:
+        """Improve ``start`` for ``budget_s`` seconds, yielding each strictly
+        better packing as a list of placement rows."""
+        deadline = time.time() + budget_s
+        best = self._filled(start)
+        current = self._repair(start)
+        cur_filled = self._filled(current)
+        if cur_filled > best:
+            best = cur_filled
+            yield [self.rows[q] for q in current]
+        while time.time() < deadline and cur_filled < len(self.cells):
+            if cancel is not None and cancel():
+                return
+            self.moves += 1
+            mask = 0
+            for q in current:
+                mask |= self.masks[q]
+            holes = self.full & ~mask
+            hole_near = 0
+            h = holes
+            while h:
+                low = h & -h
+                hole_near |= self.near[low.bit_length() - 1]
+                h ^= low
+            touching = [q for q in current if self.masks[q] & hole_near] or current
+            drop = set(self.rng.sample(touching, min(k, len(touching))))
+            # occasionally widen the neighbourhood with a random far placement
+            if len(current) > len(drop) and self.rng.random() < 0.2:
+                drop.add(self.rng.choice(current))
+            candidate = self._repair([q for q in current if q not in drop])
+            filled = self._filled(candidate)
+            if filled >= cur_filled:
+                current, cur_filled = candidate, filled
+                if filled > best:
+                    best = filled
+                    yield [self.rows[q] for q in current]
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Tuple, Dict, Set
+from typing import List, Tuple, Dict, Set, Sequence
 from ..solver.heuristics import tie_shuffle
 from ..solver.symbreak import anchor_rule_filter, container_symmetry_group
 
 I3 = Tuple[int, int, int]
+# (piece, ori, translation, cells) of one placement
+PlacementRow = Tuple[str, int, I3, Tuple[I3, ...]]
 
 @dataclass(frozen=True)
 class Placement:
@@ -32,7 +34,9 @@ def for_target(target: I3, occ, bag, lib: Dict[str, object], container_set: Set[
         List of valid placements covering the target cell
     """
     cands: List[Placement] = []
-    
+    from ..pieces.compiled import compiled_library
+    compiled = compiled_library()
+
     # Generate candidates for each available piece
     for pid, count in bag.to_dict().items():
         if count <= 0:
@@ -42,13 +46,9 @@ def for_target(target: I3, occ, bag, lib: Dict[str, object], container_set: Set[
         if not pdef:
             continue
             
-        # Get static orientations from 4-sphere data
-        from ..pieces.sphere_orientations import get_piece_orientations
-        try:
-            orientations = get_piece_orientations(pid)
-        except KeyError:
-            # Fallback for pieces not in data
-            orientations = [[[0, 0, 0]]]
+        # Get static orientations from the compiled 4-sphere library
+        # (fallback for pieces not in data)
+        orientations = compiled.orientations.get(pid, (((0, 0, 0),),))
         
         # Try each orientation of the piece
         for oi, orient in enumerate(orientations):
@@ -116,3 +116,21 @@ def for_target(target: I3, occ, bag, lib: Dict[str, object], container_set: Set[
     
     # Apply tie-shuffle for deterministic ordering
     return tie_shuffle(cands, seed)
+
+
+def enumerate_placements(cells: Sequence[I3], orientations: Dict[str, Sequence[Sequence[I3]]],
+                         pieces: Sequence[str]) -> List[PlacementRow]:
+    """Every in-container placement of ``pieces``, one per distinct footprint."""
+    inside = set(cells)
+    rows: List[PlacementRow] = []
+    seen = set()
+    for piece in pieces:
+        for o, ori in enumerate(orientations.get(piece, ())):
+            a0 = ori[0]
+            for c in cells:
+                t = (c[0] - a0[0], c[1] - a0[1], c[2] - a0[2])
+                covered = tuple(sorted((u[0] + t[0], u[1] + t[1], u[2] + t[2]) for u in ori))
+                if all(x in inside for x in covered) and (piece, covered) not in seen:
+                    seen.add((piece, covered))
+                    rows.append((piece, o, t, covered))
+    return rows
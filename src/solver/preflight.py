@@ -0,0 +1,311 @@
+"""Static infeasibility preflight shared by the engines.
+
+Cheap necessary conditions checked before any search, from the same
+placement tables the engines use. The first failing check is returned as a
+proof that no solution exists:
+
+* ``size_not_multiple_of_4``   -- every piece covers 4 cells
+* ``inventory_too_small``      -- fewer than cells/4 pieces in the inventory
+* ``uncoverable_cell``         -- no placement of any library piece covers a cell
+* ``cell_needs_missing_piece`` -- a cell is covered only by pieces not in the inventory
+* ``component_size``           -- cells linked by inventory placements form a
+  group whose size is not a multiple of 4 (placements never span groups)
+* ``colouring_parity``         -- for a 2-colouring ``(a . x) mod 2`` of the
+  lattice, no choice of cells/4 inventory pieces, each placed somewhere in
+  the container, has the container's colour imbalance
+
+Containers below ``NUMPY_MIN_CELLS`` cells are checked in pure Python, so a
+default solve of a small puzzle does not import NumPy. Larger containers
+use the vectorised placement table. Both paths run the same checks and
+give the same reasons.
+
+``preflight_done`` turns a failure into the engines' ``done`` event with
+``infeasible_reason``; engines call it first unless ``options["preflight"]``
+is false.
+"""
+
+from __future__ import annotations
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from ..pieces.compiled import compiled_library
+from .table_cache import cached_table
+
+I3 = Tuple[int, int, int]
+
+# Linear 2-colourings of the lattice: colour(x) = (a . x) mod 2
+COLOURINGS: Tuple[I3, ...] = ((1, 0, 0), (0, 1, 0), (0, 0, 1), (1, 1, 0), (1, 0, 1), (0, 1, 1), (1, 1, 1))
+# Containers at least this large use the NumPy placement table
+NUMPY_MIN_CELLS = 512
+
+Failure = Optional[Tuple[str, str]]
+
+
+@dataclass
+class PreflightResult:
+    feasible: bool
+    reason: Optional[str] = None
+    detail: str = ""
+    checks: List[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"feasible": self.feasible, "reason": self.reason, "detail": self.detail,
+                "checks": list(self.checks), "elapsed_ms": round(self.elapsed_ms, 3)}
+
+
+def _achievable(values: Dict[str, Set[int]], counts: Dict[str, int], need: int) -> Set[int]:
+    """Imbalance sums reachable with exactly ``need`` pieces, piece p used at
+    most ``counts[p]`` times and contributing one of ``values[p]`` per copy.
+
+    ``reach[u]`` is a bitset of sums (offset by ``4 * need``) using ``u`` pieces."""
+    off = 4 * need
+    reach = [0] * (need + 1)
+    reach[0] = 1 << off
+    for p, vals in values.items():
+        nxt = list(reach)
+        frontier = reach
+        for _ in range(min(counts[p], need)):
+            step = [0] * (need + 1)
+            for u in range(need):
+                x = frontier[u]
+                if x:
+                    acc = 0
+                    for v in vals:
+                        acc |= x << v if v >= 0 else x >> -v
+                    step[u + 1] = acc
+            frontier = step
+            for u in range(need + 1):
+                nxt[u] |= step[u]
+        reach = nxt
+    bits = reach[need]
+    return {i - off for i in range(bits.bit_length()) if (bits >> i) & 1}
+
+
+def placement_rows(cells: Sequence[I3]) -> Tuple[List[int], List[Tuple[int, ...]]]:
+    """Pure-Python ``placement_table``: ``(piece_index, cell_indices)`` lists."""
+    lib = compiled_library()
+    index = {c: i for i, c in enumerate(sorted(cells))}
+    row_piece: List[int] = []
+    row_cells: List[Tuple[int, ...]] = []
+    get = index.get
+    for p, name in enumerate(lib.names):
+        for ori in lib.orientations[name]:
+            # offsets of atoms 1..3 from atom 0; every piece has 4 atoms
+            (x0, y0, z0), (x1, y1, z1), (x2, y2, z2), (x3, y3, z3) = ori
+            d1, d2, d3 = (x1 - x0, y1 - y0, z1 - z0), (x2 - x0, y2 - y0, z2 - z0), (x3 - x0, y3 - y0, z3 - z0)
+            for (x, y, z), i in index.items():
+                j = get((x + d1[0], y + d1[1], z + d1[2]))
+                if j is None:
+                    continue
+                k = get((x + d2[0], y + d2[1], z + d2[2]))
+                if k is None:
+                    continue
+                m = get((x + d3[0], y + d3[1], z + d3[2]))
+                if m is None:
+                    continue
+                row_piece.append(p)
+                row_cells.append((i, j, k, m))
+    return row_piece, row_cells
+
+
+def placement_table(cells: Sequence[I3]):
+    """All in-container placements of every library piece, vectorised over the
+    compiled orientation arrays: ``(piece_index[R], cell_index[R, 4])`` with
+    cells indexed in ``sorted(cells)`` order."""
+    import numpy as np
+    lib = compiled_library()
+    flat = lib.flat.astype(np.int64)                      # (O, 4, 3)
+    ori_piece = np.repeat(np.arange(len(lib.names)), lib.ori_counts)
+    C = np.array(sorted(cells), dtype=np.int64).reshape(-1, 3)
+    lo = C.min(axis=0)
+    span = C.max(axis=0) - lo + 1
+    scale = np.array([span[1] * span[2], span[2], 1], dtype=np.int64)
+    grid = np.full(int(span.prod()), -1, dtype=np.int64)  # bounding-box cell -> cell index
+    grid[(C - lo) @ scale] = np.arange(len(C))
+    rel = flat - flat[:, :1, :]                           # offsets from atom 0
+    pts = C[None, :, None, :] + rel[:, None, :, :] - lo   # (O, n, 4, 3) anchored at every cell
+    inb = ((pts >= 0) & (pts < span)).all(axis=-1)
+    pos = np.where(inb, grid[np.where(inb, pts @ scale, 0)], -1)
+    o_idx, c_idx = np.nonzero((pos >= 0).all(axis=-1))
+    return ori_piece[o_idx], pos[o_idx, c_idx]
+
+
+def _missing_piece_detail(cell: I3, by: List[str]) -> str:
+    return f"{list(cell)} is covered only by {','.join(by)}, none in the inventory"
+
+
+def _colouring_detail(a: I3, target: int, need: int) -> str:
+    return f"colouring {a}: container imbalance {target} not reachable with {need} inventory pieces"
+
+
+def _component_detail(sizes: List[int]) -> str:
+    return f"{len(sizes)} placement-connected groups, sizes {sorted(sizes)}"
+
+
+def _checks_python(cells: List[I3], counts: Dict[str, int], need: int, checks: List[str]) -> Failure:
+    lib = compiled_library()
+    n = len(cells)
+    row_piece, row_cells = placement_rows(cells)
+    covered_by: List[Set[int]] = [set() for _ in range(n)]
+    for p, (i, j, k, m) in zip(row_piece, row_cells):
+        covered_by[i].add(p)
+        covered_by[j].add(p)
+        covered_by[k].add(p)
+        covered_by[m].add(p)
+    in_inv = [counts.get(name, 0) > 0 for name in lib.names]
+
+    checks.append("coverage")
+    for i, by in enumerate(covered_by):
+        if not by:
+            return "uncoverable_cell", f"no placement covers {list(cells[i])}"
+    for i, by in enumerate(covered_by):
+        if not any(in_inv[p] for p in by):
+            return "cell_needs_missing_piece", _missing_piece_detail(cells[i], [lib.names[p] for p in sorted(by)])
+
+    rows = [(p, cs) for p, cs in zip(row_piece, row_cells) if in_inv[p]]
+
+    checks.append("components")
+    parent = list(range(n))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for _, (i, j, k, m) in rows:
+        r = find(i)
+        parent[find(j)] = r
+        parent[find(k)] = r
+        parent[find(m)] = r
+    sizes: Dict[int, int] = {}
+    for i in range(n):
+        r = find(i)
+        sizes[r] = sizes.get(r, 0) + 1
+    if any(s % 4 for s in sizes.values()):
+        return "component_size", _component_detail(list(sizes.values()))
+
+    checks.append("colouring")
+    for a in COLOURINGS:
+        sign = [1 if (c[0] * a[0] + c[1] * a[1] + c[2] * a[2]) & 1 else -1 for c in cells]
+        target = sum(sign)
+        by_piece: Dict[int, Set[int]] = {}
+        for p, (i, j, k, m) in rows:
+            vals = by_piece.get(p)
+            if vals is None:
+                vals = by_piece[p] = set()
+            vals.add(sign[i] + sign[j] + sign[k] + sign[m])
+        values = {lib.names[p]: vals for p, vals in by_piece.items()}
+        if target not in _achievable(values, counts, need):
+            return "colouring_parity", _colouring_detail(a, target, need)
+    return None
+
+
+def _checks_numpy(cells: List[I3], counts: Dict[str, int], need: int, checks: List[str]) -> Failure:
+    import numpy as np
+    lib = compiled_library()
+    n = len(cells)
+    row_piece, row_cells = placement_table(cells)
+    covers = np.zeros((len(lib.names), n), dtype=bool)
+    covers[row_piece[:, None], row_cells] = True
+    in_inv = np.array([counts.get(p, 0) > 0 for p in lib.names])
+
+    checks.append("coverage")
+    none = np.nonzero(~covers.any(axis=0))[0]
+    if len(none):
+        return "uncoverable_cell", f"no placement covers {list(cells[none[0]])}"
+    missing = np.nonzero(~covers[in_inv].any(axis=0))[0]
+    if len(missing):
+        c = int(missing[0])
+        return "cell_needs_missing_piece", _missing_piece_detail(cells[c], [lib.names[i] for i in np.nonzero(covers[:, c])[0]])
+
+    keep = in_inv[row_piece]
+    row_piece, row_cells = row_piece[keep], row_cells[keep]
+
+    checks.append("components")
+    # label propagation: every cell takes the smallest label of any placement through it
+    labels = np.arange(n)
+    while True:
+        low = labels[row_cells].min(axis=1)
+        new = labels.copy()
+        np.minimum.at(new, row_cells, low[:, None])
+        if np.array_equal(new, labels):
+            break
+        labels = new[new]  # pointer jumping
+    sizes = np.unique(labels, return_counts=True)[1].tolist()
+    if any(s % 4 for s in sizes):
+        return "component_size", _component_detail(sizes)
+
+    checks.append("colouring")
+    C = np.array(cells, dtype=np.int64)
+    for a in COLOURINGS:
+        sign = np.where((C @ np.array(a)) & 1, 1, -1)    # +1 / -1 per cell
+        target = int(sign.sum())
+        imb = sign[row_cells].sum(axis=1)
+        values: Dict[str, Set[int]] = {}
+        for code in np.unique(row_piece * 16 + imb + 8).tolist():  # imbalance in -4..4
+            values.setdefault(lib.names[code // 16], set()).add(code % 16 - 8)
+        if target not in _achievable(values, counts, need):
+            return "colouring_parity", _colouring_detail(a, target, need)
+    return None
+
+
+def preflight(cells: Sequence[I3], piece_counts: Dict[str, int],
+              use_numpy: Optional[bool] = None) -> PreflightResult:
+    """Run the checks in order and stop at the first proof of infeasibility.
+    ``use_numpy`` defaults to ``len(cells) >= NUMPY_MIN_CELLS``."""
+    t0 = time.perf_counter()
+    res = PreflightResult(feasible=True)
+
+    def fail(reason: str, detail: str) -> PreflightResult:
+        res.feasible, res.reason, res.detail = False, reason, detail
+        res.elapsed_ms = (time.perf_counter() - t0) * 1000
+        return res
+
+    cells = sorted(set(tuple(int(v) for v in c) for c in cells))
+    counts = {p: int(n) for p, n in piece_counts.items() if int(n) > 0}
+    n = len(cells)
+
+    res.checks.append("size")
+    if n % 4 != 0:
+        return fail("size_not_multiple_of_4", f"{n} cells")
+    need = n // 4
+    res.checks.append("inventory_total")
+    if sum(counts.values()) < need:
+        return fail("inventory_too_small", f"{sum(counts.values())} pieces for {n} cells (need {need})")
+    if n == 0:
+        return res
+
+    if use_numpy is None:
+        use_numpy = n >= NUMPY_MIN_CELLS
+    failure = (_checks_numpy if use_numpy else _checks_python)(cells, counts, need, res.checks)
+    if failure is not None:
+        return fail(*failure)
+    res.elapsed_ms = (time.perf_counter() - t0) * 1000
+    return res
+
+
+def preflight_done(container: Dict[str, Any], inventory: Dict[str, Any],
+                   options: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The ``done`` event for an infeasible instance, or None to go ahead."""
+    if not options.get("preflight", True):
+        return None
+    coords = container.get("coordinates") or container.get("cells", [])
+    counts = inventory.get("pieces", inventory)
+    key = ("preflight", tuple(sorted((p, int(n)) for p, n in counts.items() if int(n) > 0)))
+    res = cached_table(options, container, key, lambda: preflight(coords, counts))
+    if res.feasible:
+        return None
+    metrics: Dict[str, Any] = {
+        "solutions_found": 0,
+        "nodes_explored": 0,
+        "time_elapsed": res.elapsed_ms / 1000.0,
+        "infeasible_reason": res.reason,
+        "infeasible_detail": res.detail,
+        "preflight_ms": round(res.elapsed_ms, 3),
+    }
+    if options.get("count_only"):
+        metrics.update({"count_only": True, "complete": True, "solutions_total": 0, "solutions_unique": 0})
+    return {"type": "done", "t_ms": int(res.elapsed_ms), "metrics": metrics}
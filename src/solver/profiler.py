@@ -0,0 +1,133 @@
+"""Hot-path phase profiler for the search engines.
+
+Engines bracket the phases of a node (candidate generation, placement
+validation, hole checks, target selection, snapshot copies, ...) with
+``prof.phase(name, depth)``. Nested phases charge their time to the
+innermost one, so every nanosecond is counted once:
+
+    with prof.phase("candidates", depth):
+        ...
+        ok = valid(pl)   # valid = prof.wrap("is_valid_placement", fn, depth)
+
+When profiling is off, engines use ``NULL_PROFILER``: ``phase`` returns a
+shared do-nothing context and ``wrap`` returns the function unchanged, so
+the instrumented hot path costs one attribute lookup and call per phase.
+
+``summary`` gives per-phase totals for the ``done`` metrics. The time
+outside every phase is reported as ``unattributed_ms``: generator
+overhead, consumers of yielded events and uninstrumented code.
+``write_collapsed`` writes ``engine;depth_N;phase;subphase <us>`` lines,
+the collapsed-stack format read by flamegraph.pl and speedscope.
+"""
+
+from __future__ import annotations
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, List, Tuple
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class NullProfiler:
+    """Stand-in used when profiling is disabled."""
+
+    enabled = False
+
+    def phase(self, name: str, depth: int = 0) -> _NullSpan:
+        return _NULL_SPAN
+
+    def wrap(self, name: str, fn: Callable, depth: int = 0) -> Callable:
+        return fn
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class _Span:
+    __slots__ = ("prof", "name", "depth")
+
+    def __init__(self, prof: "PhaseProfiler", name: str, depth: int):
+        self.prof, self.name, self.depth = prof, name, depth
+
+    def __enter__(self):
+        self.prof._stack.append([self.name, self.depth, perf_counter_ns(), 0])
+        return self
+
+    def __exit__(self, *exc):
+        self.prof._pop()
+        return False
+
+
+class PhaseProfiler:
+    enabled = True
+
+    def __init__(self, engine: str):
+        self.engine = engine
+        self._stack: List[list] = []
+        # (depth, phase path) -> [self ns, calls]
+        self._frames: Dict[Tuple[int, Tuple[str, ...]], List[int]] = {}
+        self._t0 = perf_counter_ns()
+
+    def phase(self, name: str, depth: int = 0) -> _Span:
+        return _Span(self, name, depth)
+
+    def wrap(self, name: str, fn: Callable, depth: int = 0) -> Callable:
+        span = _Span(self, name, depth)
+
+        def timed(*args, **kwargs):
+            with span:
+                return fn(*args, **kwargs)
+        return timed
+
+    def _pop(self) -> None:
+        name, depth, t0, child = self._stack.pop()
+        dt = perf_counter_ns() - t0
+        if self._stack:
+            self._stack[-1][3] += dt
+            depth = self._stack[0][1]  # nested phases stay under their outer phase's depth
+        key = (depth, tuple(f[0] for f in self._stack) + (name,))
+        acc = self._frames.get(key)
+        if acc is None:
+            self._frames[key] = [dt - child, 1]
+        else:
+            acc[0] += dt - child
+            acc[1] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-phase self time and call counts plus wall and unattributed time."""
+        phases: Dict[str, List[int]] = {}
+        for (_, path), (ns, calls) in self._frames.items():
+            acc = phases.setdefault(path[-1], [0, 0])
+            acc[0] += ns
+            acc[1] += calls
+        wall = perf_counter_ns() - self._t0
+        attributed = sum(ns for ns, _ in phases.values())
+        return {
+            "wall_ms": round(wall / 1e6, 3),
+            "unattributed_ms": round((wall - attributed) / 1e6, 3),
+            "phases": {name: {"ms": round(ns / 1e6, 3), "calls": calls}
+                       for name, (ns, calls) in sorted(phases.items(), key=lambda kv: -kv[1][0])},
+        }
+
+    def collapsed(self) -> List[str]:
+        lines = []
+        for (depth, path), (ns, _) in sorted(self._frames.items()):
+            us = ns // 1000
+            if us > 0:
+                lines.append(";".join((self.engine, f"depth_{depth}") + path) + f" {us}")
+        return lines
+
+    def write_collapsed(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for line in self.collapsed():
+                f.write(line + "\n")
@@ -0,0 +1,183 @@
+"""Solvability memo for small remaining regions.
+
+Deep in a search the empty region left over (a dozen to a few dozen cells)
+recurs across branches, restarts, runs and even containers, often rotated
+or translated. ``RegionMemo`` answers "can this bag exactly fill this
+region?" once per region and remembers the answer.
+
+Keys are ``(canonical shape, bag signature)``:
+
+* the shape is the lexicographically smallest translation-normalised image
+  of the cells under the 24 FCC rotations (``ROTATIONS_24``); every piece's
+  orientation set is closed under those rotations, so solvability is too
+* the bag signature lists the pieces in the bag with counts capped at the
+  region's piece need (more copies than can fit change nothing)
+
+Lookups go to a bounded in-memory LRU first, then to an optional SQLite
+file shared across runs and processes. Rows in the file are tagged with
+the piece library's digest, so a file reused with another library misses
+instead of answering for the wrong pieces. Misses are decided by a small
+exact-cover search with a node budget. Results it cannot decide within
+the budget are not stored. Writes are committed every 100 solves and on
+``close``; engines close the memo even when their generator is abandoned.
+
+Solvability is plain exact cover by library placements. An engine with
+extra acceptance rules (the DFS R6 gate) can still prune on ``False``.
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import sqlite3
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Tuple
+
+from ..coords.symmetry_fcc import ROTATIONS_24, apply_rot
+from .components import RegionBudgetExceeded
+from .placement_gen import enumerate_placements
+
+I3 = Tuple[int, int, int]
+Shape = Tuple[I3, ...]
+BagSig = Tuple[Tuple[str, int], ...]
+
+
+def _normalize(cells) -> Shape:
+    cells = sorted(cells)
+    o = cells[0]
+    return tuple((c[0] - o[0], c[1] - o[1], c[2] - o[2]) for c in cells)
+
+
+def canonical_region(cells: Sequence[I3]) -> Shape:
+    """Smallest translation-normalised rotation of ``cells``."""
+    return min(_normalize([apply_rot(R, c) for c in cells]) for R in ROTATIONS_24)
+
+
+def bag_signature(counts: Dict[str, int], need: int) -> BagSig:
+    return tuple((p, min(int(n), need)) for p, n in sorted(counts.items()) if int(n) > 0)
+
+
+def orientations_digest(orientations: Dict[str, Sequence[Sequence[I3]]]) -> str:
+    """sha256 of a piece set, for libraries other than ``compiled_library()``."""
+    h = hashlib.sha256()
+    for name in sorted(orientations):
+        h.update(json.dumps([name, [[list(c) for c in ori] for ori in orientations[name]]]).encode("utf-8"))
+    return h.hexdigest()
+
+
+class RegionMemo:
+    """``digest`` identifies the piece library; engines pass ``compiled_library().digest``."""
+
+    def __init__(self, orientations: Dict[str, Sequence[Sequence[I3]]], path: Optional[str] = None,
+                 cache_size: int = 100_000, node_budget: int = 20_000, digest: Optional[str] = None):
+        self.orientations = orientations
+        self.digest = digest or orientations_digest(orientations)
+        self.cache_size = cache_size
+        self.node_budget = node_budget
+        self._lru: "OrderedDict[Tuple[Shape, BagSig], bool]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            self._db = sqlite3.connect(path, timeout=30)
+            self._db.execute("CREATE TABLE IF NOT EXISTS solvability (library TEXT NOT NULL, key TEXT NOT NULL, "
+                             "solvable INTEGER NOT NULL, PRIMARY KEY (library, key))")
+            self._db.commit()
+        self.lookups = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.solved = 0
+        self.undecided = 0
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.commit()
+            self._db.close()
+            self._db = None
+
+    def __enter__(self) -> "RegionMemo":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def solvable(self, cells: Sequence[I3], counts: Dict[str, int]) -> Optional[bool]:
+        """Whether ``counts`` can exactly fill ``cells``; None if the search
+        ran out of budget."""
+        self.lookups += 1
+        if not cells:
+            return True
+        if len(cells) % 4:
+            return False
+        shape = canonical_region(cells)
+        bag = bag_signature(counts, len(cells) // 4)
+        key = (shape, bag)
+        hit = self._lru.get(key)
+        if hit is not None:
+            self._lru.move_to_end(key)
+            self.hits += 1
+            return hit
+        db_key = None
+        if self._db is not None:
+            db_key = json.dumps([shape, bag], separators=(",", ":"))
+            row = self._db.execute("SELECT solvable FROM solvability WHERE library = ? AND key = ?",
+                                   (self.digest, db_key)).fetchone()
+            if row is not None:
+                self.disk_hits += 1
+                self._remember(key, bool(row[0]))
+                return bool(row[0])
+        res = self._search(shape, dict(bag))
+        if res is None:
+            self.undecided += 1
+            return None
+        self.solved += 1
+        self._remember(key, res)
+        if db_key is not None:
+            self._db.execute("INSERT OR REPLACE INTO solvability (library, key, solvable) VALUES (?, ?, ?)",
+                             (self.digest, db_key, int(res)))
+            if self.solved % 100 == 0:
+                self._db.commit()
+        return res
+
+    def _remember(self, key, value: bool) -> None:
+        self._lru[key] = value
+        if len(self._lru) > self.cache_size:
+            self._lru.popitem(last=False)
+
+    def _search(self, shape: Shape, counts: Dict[str, int]) -> Optional[bool]:
+        pieces = sorted(counts)
+        slot = {p: s for s, p in enumerate(pieces)}
+        index = {c: i for i, c in enumerate(shape)}
+        covers = [[] for _ in shape]
+        for piece, _, _, cs in enumerate_placements(shape, self.orientations, pieces):
+            m = sum(1 << index[c] for c in cs)
+            for c in cs:
+                covers[index[c]].append((m, slot[piece]))
+        full = (1 << len(shape)) - 1
+        dead = set()
+        nodes = 0
+
+        def rec(mask: int, bag: Tuple[int, ...]) -> bool:
+            nonlocal nodes
+            if mask == full:
+                return True
+            if (mask, bag) in dead:
+                return False
+            nodes += 1
+            if nodes > self.node_budget:
+                raise RegionBudgetExceeded()
+            free = ~mask & full
+            cell = (free & -free).bit_length() - 1
+            for m, s in covers[cell]:
+                if not m & mask and bag[s]:
+                    if rec(mask | m, bag[:s] + (bag[s] - 1,) + bag[s + 1:]):
+                        return True
+            dead.add((mask, bag))
+            return False
+
+        try:
+            return rec(0, tuple(counts[p] for p in pieces))
+        except RegionBudgetExceeded:
+            return None
+
+    def stats(self) -> Dict[str, int]:
+        return {"solvability_lookups": self.lookups, "solvability_hits": self.hits,
+                "solvability_disk_hits": self.disk_hits, "solvability_solved": self.solved,
+                "solvability_undecided": self.undecided}
@@ -0,0 +1,70 @@
+"""Lookup of which pieces can fill a small isolated empty region.
+
+A 4-cell empty component must be filled by a single piece covering exactly
+its cells, and an 8-cell component by exactly two. ``ShapeIndex`` maps
+translation-normalised shapes to the piece types that fill them:
+
+* 4 cells: a hash index built once from every orientation in the compiled
+  library (``sphere_orientations.PIECES``)
+* 8 cells: a pair table of ``(piece, piece)`` fills, derived from the
+  4-cell index the first time each 8-cell shape is seen
+
+``fillable`` then checks a component against the current bag with one
+lookup. An optional ``keep`` predicate restricts the orientations indexed,
+e.g. to those the engine's final gate accepts.
+"""
+
+from __future__ import annotations
+from typing import Callable, Dict, FrozenSet, Optional, Sequence, Tuple
+
+I3 = Tuple[int, int, int]
+Shape = Tuple[I3, ...]
+
+
+def normalize(cells: Sequence[Sequence[int]]) -> Shape:
+    """Sorted cells translated so the smallest one is the origin."""
+    cells = sorted(tuple(c) for c in cells)
+    o = cells[0]
+    return tuple((c[0] - o[0], c[1] - o[1], c[2] - o[2]) for c in cells)
+
+
+class ShapeIndex:
+    def __init__(self, orientations: Dict[str, Sequence[Sequence[I3]]],
+                 keep: Optional[Callable[[Sequence[I3]], bool]] = None):
+        four: Dict[Shape, set] = {}
+        for piece, oris in orientations.items():
+            for ori in oris:
+                if keep is None or keep(ori):
+                    four.setdefault(normalize(ori), set()).add(piece)
+        self.four: Dict[Shape, FrozenSet[str]] = {s: frozenset(p) for s, p in four.items()}
+        self.pairs: Dict[Shape, FrozenSet[Tuple[str, str]]] = {}
+
+    def pair_fills(self, shape: Shape) -> FrozenSet[Tuple[str, str]]:
+        """Unordered piece pairs that tile an 8-cell ``shape``."""
+        hit = self.pairs.get(shape)
+        if hit is not None:
+            return hit
+        cells = set(shape)
+        first = shape[0]  # covered by the piece whose normalised origin lands on it
+        out = set()
+        for s4, pieces in self.four.items():
+            part = {(first[0] + c[0], first[1] + c[1], first[2] + c[2]) for c in s4}
+            if not part <= cells:
+                continue
+            rest = self.four.get(normalize(cells - part))
+            if rest:
+                out.update(tuple(sorted((a, b))) for a in pieces for b in rest)
+        self.pairs[shape] = hit = frozenset(out)
+        return hit
+
+    def fillable(self, cells: Sequence[I3], counts: Dict[str, int]) -> bool:
+        """False if a 4- or 8-cell region cannot be filled from ``counts``;
+        other sizes are not judged."""
+        if len(cells) == 4:
+            return any(counts.get(p, 0) > 0 for p in self.four.get(normalize(cells), ()))
+        if len(cells) == 8:
+            for a, b in self.pair_fills(normalize(cells)):
+                if counts.get(a, 0) >= (2 if a == b else 1) and counts.get(b, 0) > 0:
+                    return True
+            return False
+        return True
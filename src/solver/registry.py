@@ -1,16 +1,34 @@
-from typing import Dict
+from typing import Dict, List, Tuple
+import importlib
 from .engine_api import EngineProtocol
-from .engines.current_engine import CurrentEngine
-from .engines.dfs_engine import DFSEngine
-from .engines.dlx_engine import DLXEngine
 
-ENGINES = {
-    "dfs": DFSEngine(),
-    "dlx": DLXEngine(),
+# name -> (module relative to this package, class name). Engines are imported
+# on first lookup so that a CLI run only pays for the engine it uses.
+_ENGINE_SPECS: Dict[str, Tuple[str, str]] = {
+    "dfs": (".engines.dfs_engine", "DFSEngine"),
+    "dlx": (".engines.dlx_engine", "DLXEngine"),
+    "frontier": (".engines.frontier_engine", "FrontierEngine"),
+    "engine-c": (".engines.engine_c.api_adapter", "EngineCAdapter"),
 }
 
+_INSTANCES: Dict[str, EngineProtocol] = {}
+
+def register_engine(name: str, module: str, cls_name: str) -> None:
+    """Register an engine lazily by module path and class name."""
+    _ENGINE_SPECS[name] = (module, cls_name)
+    _INSTANCES.pop(name, None)
+
+def available_engines() -> List[str]:
+    return list(_ENGINE_SPECS.keys())
+
 def get_engine(name: str) -> EngineProtocol:
+    engine = _INSTANCES.get(name)
+    if engine is not None:
+        return engine
     try:
-        return ENGINES[name]
+        module, cls_name = _ENGINE_SPECS[name]
     except KeyError:
-        raise SystemExit(f"--engine must be one of: {', '.join(ENGINES.keys())}")
+        raise SystemExit(f"--engine must be one of: {', '.join(_ENGINE_SPECS.keys())}")
+    cls = getattr(importlib.import_module(module, __package__), cls_name)
+    engine = _INSTANCES[name] = cls()
+    return engine
@@ -0,0 +1,100 @@
+"""Restart schedules and knowledge kept across DFS restarts.
+
+Schedules yield node budgets per attempt:
+
+* ``fixed``      -- ``base, base, base, ...``
+* ``luby``       -- ``base * (1, 1, 2, 1, 1, 2, 4, 1, ...)`` (Luby et al. 1993)
+* ``geometric``  -- ``base * factor**i``
+
+``DeadStateCache`` remembers (occupancy, remaining bag) states whose subtree
+was exhausted without a solution; such a state has no solution no matter
+which attempt reaches it again. ``FailureStats`` counts failed subtrees per
+piece and per target cell, decayed at every restart, and is used to bias
+ordering in later attempts (fail-prone pieces later, fail-prone cells first).
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterator, Tuple
+
+SCHEDULES = ("fixed", "luby", "geometric")
+
+
+def luby(i: int) -> int:
+    """The i-th term (1-based) of the Luby sequence 1,1,2,1,1,2,4,1,1,2,..."""
+    if i < 1:
+        raise ValueError("luby index starts at 1")
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while True:
+        if i == (1 << k) - 1:
+            return 1 << (k - 1)
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+
+
+def restart_budgets(kind: str, base: int, factor: float = 1.5) -> Iterator[int]:
+    """Infinite iterator of per-attempt node budgets."""
+    if kind not in SCHEDULES:
+        raise ValueError(f"restart schedule must be one of: {', '.join(SCHEDULES)}")
+    base = max(1, int(base))
+    i = 0
+    while True:
+        i += 1
+        if kind == "fixed":
+            yield base
+        elif kind == "luby":
+            yield base * luby(i)
+        else:
+            yield max(1, int(base * factor ** (i - 1)))
+
+
+StateKey = Tuple[int, Tuple[Tuple[str, int], ...]]
+
+
+class DeadStateCache:
+    """Bounded set of states proven to have no solution (oldest evicted first)."""
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max(0, int(max_entries))
+        self._dead: Dict[StateKey, None] = {}
+        self.hits = 0
+
+    @staticmethod
+    def key(occupied_mask: int, bag_counts: Dict[str, int]) -> StateKey:
+        return occupied_mask, tuple(sorted((p, n) for p, n in bag_counts.items() if n > 0))
+
+    def __contains__(self, key: StateKey) -> bool:
+        if key in self._dead:
+            self.hits += 1
+            return True
+        return False
+
+    def add(self, key: StateKey) -> None:
+        if self.max_entries == 0:
+            return
+        if len(self._dead) >= self.max_entries:
+            del self._dead[next(iter(self._dead))]
+        self._dead[key] = None
+
+    def __len__(self) -> int:
+        return len(self._dead)
+
+
+class FailureStats:
+    """Decaying failure counts per piece and per target cell."""
+
+    def __init__(self, decay: float = 0.5):
+        self.decay = decay
+        self.piece: Dict[str, float] = {}
+        self.cell: Dict[int, float] = {}
+
+    def record(self, piece: str, cell_idx: int) -> None:
+        self.piece[piece] = self.piece.get(piece, 0.0) + 1.0
+        self.cell[cell_idx] = self.cell.get(cell_idx, 0.0) + 1.0
+
+    def on_restart(self) -> None:
+        self.piece = {p: v * self.decay for p, v in self.piece.items() if v * self.decay >= 0.01}
+        self.cell = {c: v * self.decay for c, v in self.cell.items() if v * self.decay >= 0.01}
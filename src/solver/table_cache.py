@@ -0,0 +1,59 @@
+"""Per-container tables reused across solves in one process.
+
+Warm workers (``src/service/workers.py``) run many jobs on the same few
+containers, and every solve used to rebuild its placement tables from the
+container cells. With ``options["table_cache"]`` set to a ``TableCache``,
+engines look those tables up by the container's ``cid_sha256`` first:
+
+* the preflight result per inventory
+* DFS ``CoverageCounts`` per cell order and inventory (reset at each root)
+* the frontier engine's placement rows and sweep order per piece set
+* engine-c's placement data per cell order and piece set
+
+Without the option, or for a container without a cid, nothing is cached.
+Cached tables are shared between solves and are not mutated, except
+``CoverageCounts``, which a solve resets before use. Solves that share a
+cache must therefore not run concurrently.
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional
+
+
+class TableCache:
+    """Tables keyed by container cid, then by ``key``; at most ``max_containers`` cids."""
+
+    def __init__(self, max_containers: int = 16):
+        self.max_containers = max_containers
+        self._by_cid: "OrderedDict[str, Dict[Hashable, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._by_cid)
+
+    def get(self, cid: str, key: Hashable, build: Callable[[], Any]) -> Any:
+        tables = self._by_cid.get(cid)
+        if tables is None:
+            tables = self._by_cid[cid] = {}
+            if len(self._by_cid) > self.max_containers:
+                self._by_cid.popitem(last=False)
+        else:
+            self._by_cid.move_to_end(cid)
+        if key in tables:
+            self.hits += 1
+            return tables[key]
+        self.misses += 1
+        value = tables[key] = build()
+        return value
+
+
+def cached_table(options: Mapping[str, Any], container: Mapping[str, Any], key: Hashable,
+                 build: Callable[[], Any]) -> Any:
+    """``build()``, through ``options["table_cache"]`` when there is one."""
+    cache: Optional[TableCache] = options.get("table_cache")
+    cid = container.get("cid_sha256")
+    if cache is None or not cid:
+        return build()
+    return cache.get(cid, key, build)
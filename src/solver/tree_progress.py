@@ -0,0 +1,56 @@
+"""Completion fraction of an exhaustive search from root-branch accounting.
+
+A node at depth ``d`` with ``radix[d]`` children, currently exploring child
+``cursor[d]``, has finished ``cursor[d] / radix[d]`` of its subtree, not
+counting the child in progress. Read as a mixed-radix number, the cursors
+down the current path give the completed fraction of the whole tree::
+
+    sum over d of cursor[d] / (radix[0] * radix[1] * ... * radix[d])
+
+Each child is weighted equally, whatever the size of its subtree. The
+fraction is exact at child boundaries near the root, and it reaches 1 only
+when the search is exhausted. Engines call ``branch`` once per expanded node
+and ``at`` once per child, both O(1). ``fraction`` is O(depth) and is only
+computed when a status snapshot or metrics sample is taken, from another
+thread. A torn read there costs at most one level of accuracy.
+
+``eta_ms`` extrapolates linearly from the elapsed time. It is ``None``
+until some of the tree is complete.
+"""
+
+from __future__ import annotations
+from typing import Optional
+
+
+class SubtreeProgress:
+    __slots__ = ("radix", "cursor", "top")
+
+    def __init__(self, max_depth: int):
+        size = max_depth + 2
+        self.radix = [1] * size
+        self.cursor = [0] * size
+        self.top = -1
+
+    def branch(self, depth: int, children: int) -> None:
+        """The node at ``depth`` is about to explore ``children`` children."""
+        self.radix[depth] = max(1, children)
+        self.cursor[depth] = 0
+        self.top = depth
+
+    def at(self, depth: int, index: int) -> None:
+        """The node at ``depth`` moves on to child ``index``; earlier children are done."""
+        self.cursor[depth] = index
+        self.top = depth
+
+    def fraction(self) -> float:
+        f, w = 0.0, 1.0
+        for d in range(min(self.top, len(self.radix) - 1) + 1):
+            w /= self.radix[d]
+            f += self.cursor[d] * w
+        return min(f, 1.0)
+
+    def eta_ms(self, elapsed_ms: float, fraction: Optional[float] = None) -> Optional[int]:
+        f = self.fraction() if fraction is None else fraction
+        if f <= 0.0:
+            return None
+        return int(elapsed_ms * (1.0 - f) / f)
@@ -0,0 +1,95 @@
+"""Search-tree shape statistics by depth.
+
+``TreeStats`` keeps fixed per-depth arrays, sized once from the container
+(one level per placed piece), so that updates are plain list increments:
+
+* ``nodes``      -- search nodes entered at each depth
+* ``generated``  -- candidate placements that fit the empty cells at each depth
+* ``tried``      -- candidates actually placed and recursed into
+* ``prunes``     -- nodes or candidates cut at each depth, by reason
+
+Prune reasons (engines report those that apply to them):
+
+* ``mod4``        -- empty cell count not a multiple of 4
+* ``hole``        -- hole pruning (``--hole-pruning``)
+* ``colour``      -- lattice-colour counts (``--colour-pruning``)
+* ``solvability`` -- region memo says the rest cannot be filled
+* ``dead_state``  -- state already exhausted (learned restarts)
+* ``dead_end``    -- target cell with no candidate / empty DLX column
+* ``inventory``   -- piece no longer in the bag
+* ``overlap``     -- placement attempt leaves the container or hits a placed piece
+* ``r6``          -- DFS final per-piece connectivity gate
+* ``time``        -- time limit or cancellation
+
+``to_dict`` trims the arrays to the deepest level reached and adds the
+effective branching factor ``nodes[d + 1] / nodes[d]``. ``render`` turns
+one or more such dicts into text tables for side-by-side comparison.
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Sequence
+
+PRUNE_REASONS = ("mod4", "hole", "colour", "solvability", "dead_state", "dead_end",
+                 "inventory", "overlap", "r6", "time")
+
+
+class TreeStats:
+    __slots__ = ("nodes", "generated", "tried", "prunes")
+
+    def __init__(self, max_depth: int):
+        size = max_depth + 2  # depth 0 .. max_depth, plus the leaf below a full packing
+        self.nodes = [0] * size
+        self.generated = [0] * size
+        self.tried = [0] * size
+        self.prunes: Dict[str, List[int]] = {r: [0] * size for r in PRUNE_REASONS}
+
+    def prune(self, reason: str, depth: int, n: int = 1) -> None:
+        self.prunes[reason][depth] += n
+
+    def to_dict(self) -> Dict[str, Any]:
+        top = max((d for d, n in enumerate(self.nodes) if n), default=-1) + 1
+        return {
+            "nodes": self.nodes[:top],
+            "generated": self.generated[:top],
+            "tried": self.tried[:top],
+            "branching": [round(self.nodes[d + 1] / self.nodes[d], 3) if self.nodes[d] else 0.0
+                          for d in range(top)],
+            "prunes": {r: a[:top] for r, a in self.prunes.items() if any(a[:top])},
+        }
+
+
+def _table(title: str, columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> List[str]:
+    widths = [max(len(str(c)), *(len(str(r[i])) for r in rows)) if rows else len(str(c))
+              for i, c in enumerate(columns)]
+    out = [title, "  ".join(str(c).rjust(w) for c, w in zip(columns, widths))]
+    out.extend("  ".join(str(v).rjust(w) for v, w in zip(r, widths)) for r in rows)
+    return out
+
+
+def render(stats: Sequence[Dict[str, Any]], labels: Optional[Sequence[str]] = None) -> str:
+    """Text tables of one or more ``TreeStats.to_dict()`` results, one column group per run."""
+    labels = list(labels or [f"run{i + 1}" for i in range(len(stats))])
+    depth = max((len(s["nodes"]) for s in stats), default=0)
+
+    def at(arr: Sequence[Any], d: int) -> Any:
+        return arr[d] if d < len(arr) else 0
+
+    many = len(stats) > 1
+    cols = ["depth"]
+    for label in labels:
+        prefix = f"{label}:" if many else ""
+        cols += [f"{prefix}nodes", f"{prefix}gen", f"{prefix}tried", f"{prefix}branch"]
+    rows = [[d] + [v for s in stats for v in (at(s["nodes"], d), at(s["generated"], d),
+                                              at(s["tried"], d), at(s["branching"], d))]
+            for d in range(depth)]
+    rows.append(["total"] + [v for s in stats for v in (sum(s["nodes"]), sum(s["generated"]),
+                                                        sum(s["tried"]), "")])
+    lines = _table("nodes by depth", cols, rows)
+
+    reasons = [r for r in PRUNE_REASONS if any(r in s["prunes"] for s in stats)]
+    if reasons:
+        cols = ["depth"] + [f"{label}:{r}" if many else r for label in labels for r in reasons]
+        rows = [[d] + [at(s["prunes"].get(r, ()), d) for s in stats for r in reasons] for d in range(depth)]
+        rows.append(["total"] + [sum(s["prunes"].get(r, ())) for s in stats for r in reasons])
+        lines += [""] + _table("prunes by depth and reason", cols, rows)
+    return "\n".join(lines)
@@ -0,0 +1,214 @@
+"""Solution verification, single and in bulk.
+
+``ContainerVerifier`` is built once per container: cell index map and
+full mask. Each placement is then one lookup in a
+``(piece, ori, t) -> mask`` cache, and the packing check is::
+
+    mask & covered == 0      for every placement (no overlap)
+    covered == full          at the end (exact cover)
+
+followed by the canonical SID comparison. A valid packing covers exactly
+the container, so the recomputed SID is computed once per container.
+``check`` returns ``None`` for a valid solution and otherwise the same
+message ``cli.verify`` prints.
+
+``verify_many`` re-verifies a stream of stored solutions on a process
+pool. Solutions are cut into chunks of one container each. Workers keep a
+verifier per container, so the container, piece tables and SID are built
+once per worker, not once per solution. Results come back
+in completion order, one dict per solution.
+"""
+
+from __future__ import annotations
+import json
+import multiprocessing as mp
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..io.container import load_container
+from ..io.solution_sig import canonical_state_signature
+from ..pieces.compiled import compiled_library
+from .symbreak import container_symmetry_group
+
+I3 = Tuple[int, int, int]
+
+
+class ContainerVerifier:
+    """Checks solutions against one container."""
+
+    def __init__(self, container: Dict[str, Any], check_sid: bool = True):
+        cells = sorted(tuple(int(v) for v in c) for c in container["coordinates"])
+        self.cid = container.get("cid_sha256")
+        self.cells = cells
+        self.index = {c: i for i, c in enumerate(cells)}
+        self.full = (1 << len(cells)) - 1
+        self.orientations = compiled_library().orientations
+        self.check_sid = check_sid
+        self._sid: Optional[str] = None
+        self._masks: Dict[Tuple[str, int, I3], Any] = {}
+
+    def _placement_mask(self, piece: str, ori: int, t: I3) -> Any:
+        """Bitmask of a placement, or an error message."""
+        key = (piece, ori, t)
+        mask = self._masks.get(key)
+        if mask is not None:
+            return mask
+        oris = self.orientations.get(piece)
+        if not oris:
+            return f"unknown piece {piece}"
+        if not 0 <= ori < len(oris):
+            return f"invalid orientation index {ori} for piece {piece}"
+        mask = 0
+        for u in oris[ori]:
+            c = (u[0] + t[0], u[1] + t[1], u[2] + t[2])
+            i = self.index.get(c)
+            if i is None:
+                return f"cell {c} not in container"
+            mask |= 1 << i
+        self._masks[key] = mask
+        return mask
+
+    def check(self, solution: Dict[str, Any]) -> Optional[str]:
+        cid = solution.get("containerCidSha256")
+        if cid and self.cid and cid != self.cid:
+            return f"container cid mismatch: solution {cid}, container {self.cid}"
+        covered = 0
+        for pl in solution.get("placements", []):
+            try:
+                piece, ori, t = pl["piece"], int(pl["ori"]), tuple(int(v) for v in pl["t"])
+            except (KeyError, TypeError, ValueError):
+                return f"malformed placement {pl}"
+            mask = self._placement_mask(piece, ori, t)
+            if isinstance(mask, str):
+                return mask
+            clash = mask & covered
+            if clash:
+                return f"overlap at {self.cells[(clash & -clash).bit_length() - 1]}"
+            covered |= mask
+        if covered != self.full:
+            missing = [c for i, c in enumerate(self.cells) if not covered >> i & 1]
+            return f"missing cells: {missing}"
+        if self.check_sid:
+            if self._sid is None:
+                self._sid = canonical_state_signature(set(self.cells), container_symmetry_group(self.cells))
+            recomputed = self._sid
+            stored = solution.get("sid_state_canon_sha256")
+            if stored != recomputed:
+                return f"canonical sid mismatch\nstored: {stored}\nrecomputed: {recomputed}"
+        return None
+
+
+# --- stored solutions -------------------------------------------------------
+
+def iter_stored_solutions(source: str) -> Iterator[Tuple[str, Dict[str, Any], Optional[str]]]:
+    """(label, solution, container path hint) for every solution under ``source``.
+
+    ``source`` is a directory of solution JSON files (searched recursively)
+    or a JSONL store: one solution per line, or ``ballpuzzle-solve-batch``
+    result records whose ``solutions`` list is verified against the
+    record's ``container``.
+    """
+    path = Path(source)
+    if path.is_dir():
+        for f in sorted(path.rglob("*.json")):
+            try:
+                sol = json.loads(f.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                yield str(f), {"_error": f"unreadable: {e}"}, None
+                continue
+            if isinstance(sol, dict) and "placements" in sol:
+                yield str(f), sol, None
+        return
+    with open(path, "r", encoding="utf-8") as fp:
+        for n, line in enumerate(fp, 1):
+            line = line.strip()
+            if not line:
+                continue
+            label = f"{source}:{n}"
+            try:
+                rec = json.loads(line)
+            except ValueError as e:
+                yield label, {"_error": f"unreadable: {e}"}, None
+                continue
+            if "placements" in rec:
+                yield label, rec, None
+            for k, sol in enumerate(rec.get("solutions") or []):
+                if sol:
+                    yield f"{label}#{k}", sol, rec.get("container")
+
+
+def index_containers(paths: Iterable[str]) -> Dict[str, str]:
+    """cid -> container path."""
+    out: Dict[str, str] = {}
+    for p in paths:
+        try:
+            out.setdefault(load_container(p)["cid_sha256"], p)
+        except Exception:
+            continue
+    return out
+
+
+_VERIFIERS: Dict[str, ContainerVerifier] = {}
+
+
+def _verifier(container_path: str, check_sid: bool) -> ContainerVerifier:
+    key = f"{container_path}:{check_sid}"
+    v = _VERIFIERS.get(key)
+    if v is None:
+        if len(_VERIFIERS) >= 64:
+            _VERIFIERS.clear()
+        v = _VERIFIERS[key] = ContainerVerifier(load_container(container_path), check_sid)
+    return v
+
+
+def _verify_chunk(args: Tuple[Optional[str], Optional[str], List[Tuple[str, Dict[str, Any]]], bool]) -> List[Dict[str, Any]]:
+    cid, container_path, items, check_sid = args
+    if container_path is None:
+        return [{"source": label, "cid": cid, "ok": False, "error": sol.get("_error") or "container not found"}
+                for label, sol in items]
+    try:
+        verifier = _verifier(container_path, check_sid)
+    except Exception as e:
+        return [{"source": label, "cid": cid, "ok": False, "error": f"container {container_path}: {e}"}
+                for label, _sol in items]
+    out = []
+    for label, sol in items:
+        error = sol.get("_error") or verifier.check(sol)
+        out.append({"source": label, "cid": cid, "ok": error is None, "error": error})
+    return out
+
+
+def _chunks(solutions: Iterable[Tuple[str, Dict[str, Any], Optional[str]]], containers: Dict[str, str],
+            chunk: int, check_sid: bool):
+    key, items = None, []
+    for label, sol, hint in solutions:
+        cid = sol.get("containerCidSha256")
+        path = containers.get(cid) if cid else None
+        if path is None and hint:
+            path = hint
+        if (cid, path) != key or len(items) >= chunk:
+            if items:
+                yield (key[0], key[1], items, check_sid)
+            key, items = (cid, path), []
+        items.append((label, sol))
+    if items:
+        yield (key[0], key[1], items, check_sid)
+
+
+def verify_many(solutions: Iterable[Tuple[str, Dict[str, Any], Optional[str]]], containers: Dict[str, str],
+                workers: int = 0, chunk: int = 256, check_sid: bool = True) -> Iterator[Dict[str, Any]]:
+    """Verify stored solutions; yields ``{"source", "cid", "ok", "error"}`` per solution.
+
+    ``containers`` maps cid to container path; a solution whose cid is not
+    in it falls back to the path hint from its store record.
+    ``workers``: process count (0 = one per CPU, 1 = in this process).
+    """
+    jobs = _chunks(solutions, containers, chunk, check_sid)
+    workers = workers or mp.cpu_count()
+    if workers == 1:
+        for job in jobs:
+            yield from _verify_chunk(job)
+        return
+    with mp.get_context().Pool(workers) as pool:
+        for results in pool.imap_unordered(_verify_chunk, jobs):
+            yield from results
@@ -0,0 +1,22 @@
+"""Inputs shared across the test modules."""
+
+import pytest
+
+
+def slab_cells(length):
+    """Cells of the 2 x 2 x ``length`` slab at the origin."""
+    return [[i, j, k] for i in range(2) for j in range(2) for k in range(length)]
+
+
+@pytest.fixture
+def one_each():
+    """Inventory of pieces A..Y, one copy each."""
+    return {chr(ord('A') + i): 1 for i in range(25)}
+
+
+@pytest.fixture
+def slab():
+    """``slab(length)``: the 2 x 2 x ``length`` slab container, cid ``slab<length>``."""
+    def make(length):
+        return {"cid_sha256": f"slab{length}", "coordinates": slab_cells(length)}
+    return make
@@ -0,0 +1,69 @@
+"""LCV candidate ordering tests for Engine-C."""
+
+import pytest
+from src.solver.engines.engine_c.api_adapter import EngineCAdapter
+from src.solver.engines.engine_c.ordering import (
+    ConflictTable, compute_candidate_scores, order_candidates, pick_target_cell
+)
+from src.solver.engines.engine_c.rand import Rng
+
+
+def _toy_table():
+    # 4 cells; candidate 0 covers {0,1}, 1 covers {1,2}, 2 covers {2,3}, 3 covers {0}
+    candidates = [0b0011, 0b0110, 0b1100, 0b0001]
+    covers_by_cell = [[0, 3], [0, 1], [1, 2], [2]]
+    meta = [("A", 0, 0), ("B", 0, 1), ("C", 0, 2), ("D", 0, 0)]
+    return candidates, covers_by_cell, meta, ConflictTable(candidates, covers_by_cell, meta)
+
+
+def test_conflict_table_and_lcv_scores():
+    _, covers_by_cell, _, table = _toy_table()
+    assert table.conflicts[0] == 0b1011  # overlaps 0, 1 and 3
+    assert table.conflicts[2] == 0b0110
+    inv = {"A": 1, "B": 1, "C": 1, "D": 1}
+    scores = compute_candidate_scores([0, 1, 2, 3], table, 0b1111, 0b1111, inv, "lcv")
+    assert scores == {0: 2, 1: 2, 2: 1, 3: 1}
+    assert order_candidates([0, 1, 2, 3], "none", Rng(1), scores) == [2, 3, 0, 1]
+    assert pick_target_cell(0b1111, covers_by_cell, 0b1111, table.cover_bits) == 3
+    assert pick_target_cell(0b1111, covers_by_cell, 0b1011, table.cover_bits) == -1  # cell 3 uncoverable
+
+
+def test_ties_only_shuffles_within_equal_scores():
+    scores = {c: (0 if c < 5 else 1) for c in range(10)}
+    for seed in range(5):
+        ordered = order_candidates(list(range(10)), "ties_only", Rng(seed), scores)
+        assert sorted(ordered[:5]) == [0, 1, 2, 3, 4]
+        assert sorted(ordered[5:]) == [5, 6, 7, 8, 9]
+
+
+@pytest.mark.parametrize("ordering", ["lcv", "mincov"])
+def test_done_metrics_report_nodes_with_and_without_ordering(ordering):
+    from src.io.container import load_container
+    from src.pieces.library_fcc_v1 import load_fcc_A_to_Y
+    container = load_container("data/containers/v1/16 cell container.fcc.json")
+    inventory = {"pieces": {chr(ord('A') + i): 1 for i in range(25)}}
+    options = {"seed": 2, "flags": {"ordering": ordering, "ordering_compare": True, "time_budget_s": 30}}
+    events = list(EngineCAdapter().solve(container, inventory, load_fcc_A_to_Y(), options))
+    metrics = events[-1]["metrics"]
+    assert metrics["solutions"] == 1
+    assert metrics["ordering"] == ordering
+    assert set(metrics["nodes_by_ordering"]) == {ordering, "index"}
+    assert metrics["nodes_by_ordering"][ordering] == metrics["nodes"]
+
+
+def test_unknown_ordering_rejected():
+    with pytest.raises(ValueError):
+        list(EngineCAdapter().solve({"cells": [[0, 0, 0]]}, {"pieces": {}}, {}, {"flags": {"ordering": "bogus"}}))
+
+
+def test_cli_ordering_flags_reach_engine_c(tmp_path):
+    import json
+    import subprocess
+    import sys
+    events = tmp_path / "events.jsonl"
+    subprocess.check_call([sys.executable, "-m", "cli.solve", "data/containers/v1/16 cell container.fcc.json",
+                           "--engine", "engine-c", "--ordering", "mincov", "--ordering-compare",
+                           "--solution", str(tmp_path / "solution.json"), "--eventlog", str(events)])
+    done = [json.loads(line) for line in events.read_text().splitlines()][-1]
+    assert done["metrics"]["ordering"] == "mincov"
+    assert set(done["metrics"]["nodes_by_ordering"]) == {"mincov", "index"}
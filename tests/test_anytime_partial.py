@@ -0,0 +1,57 @@
+from pathlib import Path
+
+from src.io.container import load_container
+from src.io.schema import validate_instance
+from src.pieces.compiled import compiled_library
+from src.solver.partial import BestPartial, LocalSearch
+from src.solver.registry import get_engine
+
+ROOT = Path(__file__).parent.parent
+SHAPE100 = str(ROOT / "data" / "containers" / "v1" / "Shape_3.fcc.json")
+
+
+def _cells(container):
+    return sorted(tuple(c) for c in container["coordinates"])
+
+
+def _check_packing(placements, cells, counts):
+    seen = set()
+    used = {}
+    for p in placements:
+        for c in map(tuple, p["cells_ijk"]):
+            assert c in cells and c not in seen
+            seen.add(c)
+        used[p["piece"]] = used.get(p["piece"], 0) + 1
+    assert all(n <= counts[p] for p, n in used.items())
+    return len(seen)
+
+
+def test_dfs_anytime_emits_best_partial_events(one_each):
+    container = load_container(SHAPE100)
+    events = list(get_engine("dfs").solve(container, {"pieces": one_each}, {},
+                                          {"anytime": True, "time_limit": 1, "best_partial_interval_ms": 0}))
+    partials = [e for e in events if e["type"] == "best_partial"]
+    assert partials
+    fills = [e["partial"]["cellsFilled"] for e in partials]
+    assert fills == sorted(fills)
+    cells = set(_cells(container))
+    for e in partials:
+        validate_instance("snapshot.schema.json", {"v": 1, **e})
+        part = e["partial"]
+        assert _check_packing(part["placements"], cells, one_each) == part["cellsFilled"]
+        assert len(part["emptyCells"]) == part["cellsTotal"] - part["cellsFilled"]
+    assert events[-1]["metrics"]["best_partial_cells"] == fills[-1]
+
+
+def test_local_search_improves_monotonically(one_each):
+    cells = _cells(load_container(SHAPE100))
+    ls = LocalSearch(cells, compiled_library().orientations, one_each, seed=3)
+    best = BestPartial(cells, "cid")
+    fills = []
+    for rows in ls.run([], budget_s=1.0, k=2):
+        assert best.offer(rows, source="local_search")
+        fills.append(best.filled)
+    assert fills and fills == sorted(set(fills))
+    part = best.as_partial()
+    assert part["source"] == "local_search"
+    assert _check_packing(part["placements"], set(cells), one_each) == best.filled >= 80
@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import pytest
+
+from src.coords.symmetry_fcc import NEIGHBORS
+from src.io.container import load_container
+from src.solver.cell_order import CELL_ORDERS, _hilbert, order_cells, placement_spread
+from src.solver.registry import get_engine
+
+ROOT = Path(__file__).parent.parent
+SHAPE16 = str(ROOT / "data" / "containers" / "v1" / "16 cell container.fcc.json")
+
+
+def test_hilbert_curve_is_a_unit_step_bijection():
+    pts = {_hilbert(x, y, z, 2): (x, y, z) for x in range(4) for y in range(4) for z in range(4)}
+    assert sorted(pts) == list(range(64))
+    for i in range(63):
+        assert sum(abs(a - b) for a, b in zip(pts[i], pts[i + 1])) == 1
+
+
+def test_every_order_is_a_permutation_and_bfs_steps_to_neighbours():
+    cells = [tuple(c) for c in load_container(SHAPE16)["coordinates"]]
+    for method in CELL_ORDERS:
+        assert sorted(order_cells(cells, method)) == sorted(cells)
+    assert order_cells(cells, "lex") == sorted(cells)
+    bfs = order_cells(cells, "bfs")
+    for i, c in enumerate(bfs[1:], 1):
+        assert any(tuple(a - b for a, b in zip(c, p)) in NEIGHBORS for p in bfs[:i])
+    with pytest.raises(ValueError):
+        order_cells(cells, "spiral")
+
+
+def test_placement_spread():
+    order = [(0, 0, k) for k in range(70)]
+    spread = placement_spread(order, [[(0, 0, 0), (0, 0, 1)], [(0, 0, 62), (0, 0, 65)]])
+    assert spread == {"mean_bit_span": 3.0, "mean_words": 1.5}
+
+
+@pytest.mark.parametrize("engine", ["dfs", "dlx"])
+def test_engines_accept_cell_order(engine, one_each):
+    container = load_container(SHAPE16)
+    for method in ("bfs", "hilbert"):
+        events = list(get_engine(engine).solve(container, {"pieces": one_each}, {},
+                                               {"cell_order": method, "time_limit": 1, "max_results": 1}))
+        assert events[-1]["type"] == "done"
+        for ev in events:
+            if ev["type"] == "solution":
+                covered = sorted(tuple(c) for p in ev["solution"]["placements"] for c in p["cells_ijk"])
+                assert covered == sorted(tuple(c) for c in container["coordinates"])
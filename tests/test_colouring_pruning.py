@@ -0,0 +1,48 @@
+import random
+
+from src.pieces.compiled import compiled_library
+from src.solver.colouring import ColouringPruner
+from src.solver.counting import SolutionCounter
+from src.solver.placement_gen import enumerate_placements
+from src.solver.registry import get_engine
+
+INV = {"A": 4, "E": 4, "D": 4}
+
+
+
+def test_pruner_never_rejects_a_solvable_state(slab):
+    lib = compiled_library()
+    cells = [tuple(c) for c in slab(8)["coordinates"]]
+    inv = dict(INV)
+    pruner = ColouringPruner(cells, lib.orientations, inv)
+    rows = enumerate_placements(cells, lib.orientations, sorted(inv))
+    rng = random.Random(3)
+    for _ in range(150):
+        used, bag = set(), dict(inv)
+        for piece, _, _, covered in rng.sample(rows, len(rows)):
+            if rng.random() < 0.3 and bag[piece] and not used & set(covered):
+                used |= set(covered)
+                bag[piece] -= 1
+        mask = sum(1 << i for i, c in enumerate(cells) if c in used)
+        rest = [c for c in cells if c not in used]
+        if not pruner.feasible(mask, bag):
+            assert SolutionCounter(rest, lib.orientations, bag).count() == 0
+    assert pruner.checks > pruner.prunes > 0
+
+
+def test_dlx_still_solves_with_fewer_nodes(slab):
+    runs = {}
+    for flag in (False, True):
+        events = list(get_engine("dlx").solve(slab(12), {"pieces": INV}, {},
+                                              {"max_results": 3, "seed": 7, "colour_pruning": flag}))
+        runs[flag] = events
+    plain, pruned = runs[False][-1]["metrics"], runs[True][-1]["metrics"]
+    assert pruned["solutions_found"] == plain["solutions_found"] == 3
+    assert pruned["colour_prunes"] > 0 and "colour_prunes" not in plain
+    assert pruned["nodes_explored"] < plain["nodes_explored"]
+
+
+def test_dfs_reports_colour_metrics(slab):
+    done = list(get_engine("dfs").solve(slab(12), {"pieces": INV}, {},
+                                        {"time_limit": 1, "colour_pruning": True}))[-1]
+    assert done["metrics"]["colour_checks"] >= done["metrics"]["colour_prunes"] > 0
@@ -0,0 +1,40 @@
+import numpy as np
+
+from src.pieces.compiled import compiled_library, CompiledPieceLibrary
+from src.pieces.library_fcc_v1 import load_fcc_A_to_Y
+from src.pieces.sphere_orientations import PIECES
+
+
+def test_compiled_library_is_cached_and_matches_source():
+    lib = compiled_library()
+    assert compiled_library() is lib
+    assert lib.names == tuple(sorted(PIECES))
+    for name, oris in PIECES.items():
+        assert [list(map(list, o)) for o in lib.orientations[name]] == oris
+    assert load_fcc_A_to_Y()["A"].orientations == lib.orientations["A"]
+    assert load_fcc_A_to_Y()["A"] is lib.piece_defs()["A"]
+
+
+def test_arrays_offsets_and_relative_tables():
+    lib = compiled_library()
+    assert lib.array.dtype == np.int8
+    assert lib.array.shape == (len(lib.names), max(lib.ori_counts), 4, 3)
+    assert lib.offsets[-1] == lib.flat.shape[0] == sum(lib.ori_counts)
+    assert not lib.flat.flags.writeable
+    for name in ("A", "K", "Y"):
+        for o, ori in enumerate(lib.orientations[name]):
+            row = lib.flat_index(name, o)
+            assert lib.flat[row].tolist() == [list(c) for c in ori]
+            for a, anchor in enumerate(ori):
+                rel = lib.rel[name][o][a]
+                assert rel[a] == (0, 0, 0)
+                assert lib.rel_array[row, a].tolist() == [list(r) for r in rel]
+                assert tuple(tuple(x + y for x, y in zip(anchor, r)) for r in rel) == ori
+
+
+def test_digest_tracks_content():
+    lib = compiled_library()
+    assert lib.digest == CompiledPieceLibrary(PIECES).digest
+    changed = dict(PIECES)
+    changed["A"] = PIECES["A"][:2]
+    assert CompiledPieceLibrary(changed).digest != lib.digest
@@ -0,0 +1,89 @@
+from pathlib import Path
+
+from src.coords.symmetry_fcc import NEIGHBORS, apply_rot
+from src.io.container import load_container
+from src.pieces.compiled import compiled_library
+from src.solver.counting import SolutionCounter, container_symmetries
+from src.solver.registry import get_engine
+from src.solver.symbreak import container_symmetry_group
+
+ROOT = Path(__file__).parent.parent
+SHAPE16 = str(ROOT / "data" / "containers" / "v1" / "16 cell container.fcc.json")
+
+
+def _enumerate(counter):
+    """Plain exhaustive enumeration, no memo: the reference for the counter."""
+    sols = []
+
+    def rec(mask, bag, chosen):
+        if mask == counter.full:
+            sols.append(frozenset((counter.pieces[counter.placement_slot[q]],
+                                   tuple(sorted(counter.cells[i] for i in counter.placement_cells[q])))
+                                  for q in chosen))
+            return
+        free = ~mask & counter.full
+        cell = (free & -free).bit_length() - 1
+        for q in counter.covers[cell]:
+            s = counter.placement_slot[q]
+            if bag[s] and not counter.placement_mask[q] & mask:
+                bag[s] -= 1
+                rec(mask | counter.placement_mask[q], bag, chosen + [q])
+                bag[s] += 1
+
+    rec(0, list(counter.bag0), [])
+    return sols
+
+
+def test_memoized_and_burnside_counts_match_enumeration(one_each):
+    cells = sorted(NEIGHBORS)  # 12-cell shell, invariant under all 24 rotations
+    group = container_symmetry_group(cells)
+    assert len(group) == 24
+    counter = SolutionCounter(cells, compiled_library().orientations, one_each)
+    total = counter.count()
+    unique, fixed = counter.count_unique(group, total)
+    sols = _enumerate(counter)
+    orbits = {min(tuple(sorted((p, tuple(sorted(apply_rot(R, c) for c in cs))) for p, cs in s))
+                  for R in group) for s in sols}
+    assert total == len(sols) > 0
+    assert unique == len(orbits)
+    assert sum(fixed.values()) == 24 * unique
+
+
+def test_engines_count_only_mode(one_each):
+    container = load_container(SHAPE16)
+    inventory = {"pieces": one_each}
+    results = []
+    for name in ("dfs", "dlx"):
+        events = list(get_engine(name).solve(container, inventory, {}, {"count_only": True}))
+        assert [e["type"] for e in events] == ["done"]
+        results.append(events[0]["metrics"])
+    assert results[1]["solutions_total"] > 0 and results[0]["solutions_total"] == 0  # DFS's R6 gate rejects all
+    assert results[1]["complete"] and results[1]["memo_hits"] > 0
+    assert results[1]["solutions_unique"] == results[1]["solutions_total"]  # no rotation fixes this container
+
+
+def test_dfs_count_matches_its_exhaustive_enumeration(slab):
+    container = slab(3)
+    cells = container["coordinates"]
+    inventory = {"pieces": {p: 1 for p in "ABCDEFGHIJKL"}}
+    dfs = get_engine("dfs")
+    solutions = {frozenset((p["piece"], tuple(sorted(map(tuple, p["cells_ijk"])))) for p in ev["solution"]["placements"])
+                 for ev in dfs.solve(container, inventory, {}, {"max_results": 10**6, "pivot_cycle": False})
+                 if ev["type"] == "solution"}
+    metrics = list(dfs.solve(container, inventory, {}, {"count_only": True}))[-1]["metrics"]
+    raw = SolutionCounter([tuple(c) for c in cells], compiled_library().orientations, inventory["pieces"]).count()
+    assert metrics["solutions_total"] == len(solutions) < raw
+
+
+def test_unique_count_uses_symmetries_of_off_centre_containers(one_each):
+    shell = sorted(NEIGHBORS)
+    shifted = [(i + 5, j + 3, k - 2) for i, j, k in shell]
+    assert len(container_symmetry_group(shifted)) == 1  # rotations about the origin miss it
+    assert len(container_symmetries(shifted)) == 24
+    counter = SolutionCounter(shell, compiled_library().orientations, one_each)
+    unique, _ = counter.count_unique(container_symmetry_group(shell), counter.count())
+    container = {"cid_sha256": "shell", "coordinates": [list(c) for c in shifted]}
+    for name in ("dlx", "frontier"):
+        metrics = list(get_engine(name).solve(container, {"pieces": one_each}, {}, {"count_only": True}))[-1]["metrics"]
+        assert metrics["symmetry_group_order"] == 24
+        assert metrics["solutions_unique"] == unique < metrics["solutions_total"]
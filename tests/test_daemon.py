@@ -0,0 +1,137 @@
+import json, queue, socket, tempfile, threading, time, os
+from pathlib import Path
+
+import pytest
+
+from src.service.daemon import Job, SolverDaemon
+from src.service.server import dispatch, make_server
+
+ROOT = Path(__file__).parent.parent
+SHAPE16 = str(ROOT / "data" / "containers" / "v1" / "16 cell container.fcc.json")
+SHAPE100 = str(ROOT / "data" / "containers" / "v1" / "Shape_3.fcc.json")
+
+
+@pytest.fixture(scope="module")
+def daemon():
+    d = SolverDaemon(workers=1, containers_dir=str(ROOT / "data" / "containers" / "v1")).start()
+    yield d
+    d.stop()
+
+
+def test_daemon_streams_solution_and_end(daemon):
+    job = daemon.submit({"container": SHAPE16, "engine": "dlx", "options": {"time_limit": 20}})
+    events = list(daemon.stream(job))
+    types = [e["type"] for e in events]
+    assert types[-2:] == ["done", "end"]
+    assert "solution" in types
+    assert events[-1]["status"] == "done"
+
+
+def test_daemon_resolves_container_by_cid(daemon):
+    cid = json.loads(Path(SHAPE16).read_text(encoding="utf-8"))["cid"]
+    container = daemon.resolve_container({"cid": cid})
+    assert len(container["cells"]) == 16
+    with pytest.raises(ValueError):
+        daemon.resolve_container({"cid": "sha256:" + "0" * 64})
+
+
+def test_dispatch_rejects_bad_requests_with_an_error_record(daemon, tmp_path):
+    bad = tmp_path / "bad.json"
+    bad.write_text(json.dumps({"version": "1.0", "lattice": "fcc", "cells": "nope"}), encoding="utf-8")
+    for request in ({"op": "solve", "container": str(bad)}, ["x"]):
+        replies = list(dispatch(daemon, request, lambda: None))
+        assert len(replies) == 1 and replies[0]["type"] == "error"
+    with pytest.raises(ValueError):
+        daemon.resolve_container({"container": str(bad)})
+
+
+def test_daemon_cancels_running_job(daemon):
+    job = daemon.submit({"container": SHAPE100, "engine": "dfs", "options": {"time_limit": 60}})
+    deadline = time.time() + 10
+    while job.status != "running" and time.time() < deadline:
+        time.sleep(0.05)
+    t0 = time.time()
+    assert daemon.cancel(job.id)
+    events = list(daemon.stream(job))
+    assert events[-1]["status"] == "cancelled"
+    assert time.time() - t0 < 10
+
+
+def test_daemon_runs_and_cancels_engine_c(daemon):
+    job = daemon.submit({"container": SHAPE100, "engine": "engine-c", "options": {"time_limit": 60}})
+    deadline = time.time() + 10
+    while job.status != "running" and time.time() < deadline:
+        time.sleep(0.05)
+    assert daemon.cancel(job.id)
+    assert list(daemon.stream(job))[-1]["status"] == "cancelled"
+
+
+def test_slow_clients_get_a_bounded_event_queue():
+    d = SolverDaemon(workers=1)
+    d._running = True
+    job = Job(id="job-1", engine="dfs", container={}, inventory={}, options={}, events=queue.Queue(4))
+    for t in range(10):
+        d._deliver(job, {"type": "tick", "t_ms": t})
+    assert job.events.qsize() == 4 and job.dropped_ticks == 6
+    job.cancel_requested = True  # nobody reads an abandoned stream: nothing may block
+    d._deliver(job, {"type": "solution"})
+    d._deliver(job, None)
+    assert [job.events.get_nowait() for _ in range(4)][-1] is None
+
+
+def test_relay_waits_for_a_warming_worker_outside_the_lock():
+    class WarmingWorker:  # WarmWorker's readiness protocol, with a slow start-up
+        ready = False
+
+        def wait_ready(self, timeout=None):
+            if not self.ready:
+                time.sleep(1.0)
+                self.ready = True
+            return True
+
+        def submit(self, *job):
+            self.wait_ready()
+
+        def recv(self):
+            return ("end", "job-1", "done", None)
+
+    d = SolverDaemon(workers=1)
+    d._running = True
+    d._workers = [WarmingWorker()]
+    job = Job(id="job-1", engine="dfs", container={}, inventory={}, options={})
+    d._jobs[job.id] = job
+    d._pending.put(job)
+    relay = threading.Thread(target=d._relay_loop, args=(0,), daemon=True)
+    relay.start()
+    time.sleep(0.2)
+    t0 = time.time()
+    assert d.cancel(job.id) and d.status()["queued"] == 1
+    assert time.time() - t0 < 0.5
+    assert list(d.stream(job))[-1]["status"] == "cancelled"
+    d._running = False
+    d._pending.put(None)
+    relay.join(5)
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets unavailable")
+def test_unix_socket_protocol(daemon):
+    path = os.path.join(tempfile.mkdtemp(), "bp.sock")
+    server = make_server(daemon, unix_path=path)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        def call(req):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+                s.connect(path)
+                s.sendall((json.dumps(req) + "\n").encode())
+                with s.makefile("r", encoding="utf-8") as f:
+                    return [json.loads(line) for line in f]
+
+        status = call({"op": "status"})[0]
+        assert status["workers"] == 1
+        lines = call({"op": "solve", "container": SHAPE16, "engine": "dlx", "options": {"time_limit": 20}})
+        assert lines[0]["type"] == "accepted"
+        assert lines[-1]["type"] == "end" and lines[-1]["status"] == "done"
+        assert call({"op": "solve", "engine": "dlx"})[0]["type"] == "error"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,64 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from src.io.container import load_container
+from src.pieces.compiled import compiled_library
+from src.solver.coverage import CoverageCounts
+from src.solver.engines.dfs_engine import DFSEngine
+
+ROOT = Path(__file__).parent.parent
+SHAPE16 = str(ROOT / "data" / "containers" / "v1" / "16 cell container.fcc.json")
+
+
+def _brute_counts(cov):
+    counts = [0] * cov.num_cells
+    for q, cells in enumerate(cov.placement_cells):
+        if all(cov.empty[i] for i in cells) and cov.avail[cov.placement_piece[q]] > 0:
+            for i in cells:
+                counts[i] += 1
+    return counts
+
+
+def test_incremental_counts_match_recount(one_each):
+    cells = sorted(tuple(c) for c in load_container(SHAPE16)["cells"])
+    cov = CoverageCounts(cells, compiled_library().orientations, {**one_each, "A": 2})
+    rng = random.Random(7)
+    stack = []
+    for _ in range(200):
+        if stack and rng.random() < 0.4:
+            q = stack.pop()
+            cov.unplace(cov.placement_cells[q], cov.placement_piece[q])
+        else:
+            live = [q for q in range(len(cov.placement_cells)) if cov.feasible(q)]
+            if not live:
+                continue
+            q = rng.choice(live)
+            stack.append(q)
+            cov.place(cov.placement_cells[q], cov.placement_piece[q])
+        brute = _brute_counts(cov)
+        for i in range(cov.num_cells):
+            assert (i in cov.buckets[cov.count[i]]) == cov.empty[i]
+            if cov.empty[i]:
+                assert cov.count[i] == brute[i]
+        best = cov.min_cell()
+        if best is not None:
+            n = min(cov.count[i] for i in range(cov.num_cells) if cov.empty[i])
+            assert best == (min(i for i in range(cov.num_cells) if cov.empty[i] and cov.count[i] == n), n)
+
+
+def test_dfs_coverage_policy_runs_and_reports(slab):
+    events = list(DFSEngine().solve(slab(3), {"pieces": {chr(ord('A') + i): 1 for i in range(12)}}, None,
+                                    {"seed": 1, "time_limit": 5, "target_policy": "coverage"}))
+    metrics = events[-1]["metrics"]
+    assert events[-1]["type"] == "done"
+    assert [e["type"] for e in events[:-1]] == ["solution"]
+    assert len(events[0]["solution"]["placements"]) == 3
+    assert metrics["target_policy"] == "coverage"
+    assert metrics["dead_ends"] > 0
+
+
+def test_dfs_rejects_unknown_target_policy(one_each):
+    with pytest.raises(ValueError):
+        list(DFSEngine().solve(load_container(SHAPE16), {"pieces": one_each}, None, {"target_policy": "bogus"}))
@@ -0,0 +1,60 @@
+import itertools
+from pathlib import Path
+
+import pytest
+
+from src.io.container import load_container
+from src.solver.engines.dfs_engine import DFSEngine
+from src.solver.restarts import DeadStateCache, FailureStats, luby, restart_budgets
+
+ROOT = Path(__file__).parent.parent
+SHAPE16 = str(ROOT / "data" / "containers" / "v1" / "16 cell container.fcc.json")
+
+
+def test_schedules():
+    assert [luby(i) for i in range(1, 16)] == [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8]
+    assert list(itertools.islice(restart_budgets("luby", 10), 7)) == [10, 10, 20, 10, 10, 20, 40]
+    assert list(itertools.islice(restart_budgets("geometric", 100, 2.0), 4)) == [100, 200, 400, 800]
+    assert list(itertools.islice(restart_budgets("fixed", 5), 3)) == [5, 5, 5]
+    with pytest.raises(ValueError):
+        next(restart_budgets("bogus", 10))
+
+
+def test_dead_state_cache_and_failure_decay():
+    cache = DeadStateCache(max_entries=2)
+    k1 = DeadStateCache.key(0b1, {"A": 1, "B": 0})
+    assert k1 == DeadStateCache.key(0b1, {"A": 1})
+    cache.add(k1)
+    cache.add(DeadStateCache.key(0b10, {}))
+    cache.add(DeadStateCache.key(0b100, {}))
+    assert k1 not in cache and len(cache) == 2
+    assert DeadStateCache.key(0b100, {}) in cache and cache.hits == 1
+
+    stats = FailureStats(decay=0.5)
+    stats.record("A", 3)
+    stats.record("A", 3)
+    stats.on_restart()
+    assert stats.piece["A"] == 1.0 and stats.cell[3] == 1.0
+
+
+def test_dfs_luby_restarts_keep_dead_states():
+    container = load_container(SHAPE16)
+    inventory = {"pieces": {chr(ord('A') + i): 1 for i in range(25)}}
+    events = list(DFSEngine().solve(container, inventory, None, {
+        "seed": 1, "time_limit": 3, "target_policy": "coverage",
+        "restart_schedule": "luby", "restart_base": 50}))
+    metrics = events[-1]["metrics"]
+    assert metrics["restart_schedule"] == "luby"
+    assert metrics["restart_count"] > 0
+    assert metrics["dead_states"] > 0
+
+
+def test_dfs_learned_restarts_find_solution_and_report_ttfs():
+    # Two parallel straight rows: solvable with two D pieces
+    cells = [[x, y, 0] for x in range(4) for y in range(2)]
+    events = list(DFSEngine().solve({"cells": cells}, {"pieces": {"D": 2}}, None, {
+        "seed": 3, "time_limit": 10, "restart_schedule": "luby", "restart_base": 1}))
+    metrics = events[-1]["metrics"]
+    assert metrics["solutions_found"] == 1
+    assert metrics["first_solution_ms"] is not None
+    assert metrics["restart_count"] > 0  # budgets 1, 1, 2 are too small for a depth-2 solution
@@ -0,0 +1,25 @@
+import pytest
+
+from src.solver.estimate import estimate_tree
+
+# Exhaustive DFS on slab(4) with {"M": 4}: 37 nodes, 9 solutions.
+
+
+@pytest.mark.parametrize("width", [1, 2])
+def test_estimate_brackets_exact_tree(width, slab):
+    res = estimate_tree(slab(4), {"M": 4}, probes=400, workers=1, width=width, seed=1)
+    assert res["nodes"]["ci95_low"] <= 37 <= res["nodes"]["ci95_high"]
+    assert res["solutions"]["ci95_low"] <= 9 <= res["solutions"]["ci95_high"]
+    assert res["probes_reaching_solution"] > 0 and res["max_probe_depth"] == 4
+
+
+def test_estimate_independent_of_worker_count(slab):
+    a = estimate_tree(slab(4), {"M": 4}, probes=60, batch=20, workers=1, seed=3)
+    b = estimate_tree(slab(4), {"M": 4}, probes=60, batch=20, workers=2, seed=3)
+    assert a["nodes"] == b["nodes"] and a["solutions"] == b["solutions"]
+
+
+def test_estimate_converts_to_seconds(slab):
+    res = estimate_tree(slab(4), {"M": 4}, probes=50, workers=1, nodes_per_second=10.0)
+    assert res["seconds"]["mean"] == round(res["nodes"]["mean"] / 10.0, 1)
+    assert "seconds" not in estimate_tree(slab(4), {"M": 4}, probes=50, workers=1)
@@ -0,0 +1,54 @@
+import gzip
+import json
+
+import pytest
+
+from src.io.event_index import EventLogReader, IndexedEventWriter, build_index, index_path, load_index
+from src.io.snapshot import open_eventlog, write_event
+
+
+def _write_log(path, n=500, every=50):
+    with IndexedEventWriter(str(path), every=every) as w:
+        for i in range(n):
+            w.write_event({"v": 1, "type": "solution" if i % 97 == 3 else "tick", "t_ms": i * 10, "i": i})
+        w.write_event({"v": 1, "type": "done", "t_ms": n * 10, "metrics": {"ok": True}})
+
+
+@pytest.mark.parametrize("name", ["events.jsonl", "events.jsonl.gz"])
+def test_reader_seeks_by_time_solution_and_type(tmp_path, name):
+    path = tmp_path / name
+    _write_log(path)
+    r = EventLogReader(str(path))
+    ns = [e["n"] for e in r.entries]
+    assert ns[0] == 0 and max(b - a for a, b in zip(ns, ns[1:])) <= 50
+    assert [e["n"] for e in r.entries if e["type"] == "solution"] == list(range(3, 500, 97))
+    assert next(r.at_time(1234))["i"] == 124
+    assert r.solution(2)["i"] == 3 + 2 * 97 and r.solution(99) is None
+    assert r.last("done")["metrics"] == {"ok": True}
+    it = r.events(r.entries[3]["offset"])
+    assert [next(it)["i"], next(it)["i"]] == [r.entries[3]["n"], r.entries[3]["n"] + 1]
+    if name.endswith(".gz"):
+        with gzip.open(path, "rt") as fp:  # independent members still read as one gzip file
+            assert sum(1 for _ in fp) == 501
+
+
+def test_build_index_matches_writer(tmp_path):
+    path = tmp_path / "events.jsonl"
+    _write_log(path)
+    written = load_index(str(path))
+    (tmp_path / "events.jsonl.idx").unlink()
+    assert build_index(str(path), every=50) == len(written)
+    assert load_index(str(path)) == written
+
+
+def test_open_eventlog_indexes_only_when_asked(tmp_path):
+    plain = tmp_path / "a.jsonl"
+    with open_eventlog(str(plain)) as fp:
+        write_event({"type": "done", "metrics": {}}, fp)
+    assert json.loads(plain.read_text()) == {"v": 1, "type": "done", "metrics": {}}
+    assert not (tmp_path / "a.jsonl.idx").exists()
+    indexed = tmp_path / "b.jsonl"
+    with open_eventlog(str(indexed), 100) as fp:
+        write_event({"type": "done", "t_ms": 5, "metrics": {}}, fp)
+    assert load_index(str(indexed)) == [{"n": 0, "t_ms": 5, "type": "done", "offset": 0}]
+    assert index_path(str(indexed)).endswith(".jsonl.idx")
@@ -0,0 +1,78 @@
+import io
+import json
+import logging
+import tracemalloc
+
+import pytest
+
+from src.io.eventlog import ConsoleSink, EventLevel, EventLogger, EventSink, JsonlSink, QueueSink
+
+
+def test_ring_buffer_is_bounded_and_filters():
+    log = EventLogger(console_output=False, max_events=3)
+    for i in range(5):
+        log.log_piece_placed("A", [[0, 0, i]], i)
+    log.log_solution_found("sid", 4)
+    assert len(log.events) == 3 and log.events_logged == 6
+    assert [e["data"]["depth"] for e in log.get_events("piece_placed")] == [3, 4]
+    assert log.get_events(level=EventLevel.INFO)[0]["event_type"] == "solution_found"
+
+
+def test_sinks_and_levels(tmp_path):
+    console = io.StringIO()
+    text, jsonl = tmp_path / "log.txt", tmp_path / "log.jsonl"
+    with EventLogger(log_file=str(text), console_output=False, level=EventLevel.INFO,
+                     sinks=[ConsoleSink(EventLevel.WARNING, console), QueueSink(JsonlSink(str(jsonl)), block=True)]) as log:
+        log.log_pruning("hole", 3)        # below the logger level: dropped everywhere
+        log.log_solver_start("dfs", 16, 4)
+        log.warning("budget", "running low", {"left_s": 1.5})
+    assert "[budget] running low" in console.getvalue() and "solver_start" not in console.getvalue()
+    lines = text.read_text().splitlines()
+    assert len(lines) == 2 and " - ballpuzzle - INFO - [solver_start] Starting solver with dfs engine" in lines[0]
+    records = [json.loads(line) for line in jsonl.read_text().splitlines()]
+    assert [r["event_type"] for r in records] == ["solver_start", "budget"]
+    assert records[1]["data"] == {"left_s": 1.5}
+
+
+def test_file_sinks_write_through_before_close(tmp_path):
+    text, jsonl = tmp_path / "log.txt", tmp_path / "log.jsonl"
+    log = EventLogger(log_file=str(text), console_output=False, sinks=[JsonlSink(str(jsonl))])
+    log.info("budget", "running low")
+    assert "[budget] running low" in text.read_text()
+    assert json.loads(jsonl.read_text())["event_type"] == "budget"
+    log.close()
+
+
+def test_sinks_must_implement_emit():
+    class Silent(EventSink):
+        pass
+
+    with pytest.raises(TypeError):
+        Silent()
+
+
+def test_suppressed_events_allocate_nothing():
+    log = EventLogger(console_output=False, level=EventLevel.WARNING)
+    coords = [[0, 0, 0]]
+    log.log_piece_placed("A", coords, 1)
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        for depth in range(1000):
+            log.log_piece_placed("A", coords, depth)
+            log.log_solver_start("dfs", 16, 4)
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak - before < 1024 and not log.events
+
+
+def test_does_not_touch_shared_logger_handlers():
+    shared = logging.getLogger("ballpuzzle")
+    handler = logging.NullHandler()
+    shared.addHandler(handler)
+    try:
+        EventLogger(console_output=True, log_file=None)
+        assert handler in shared.handlers
+    finally:
+        shared.removeHandler(handler)
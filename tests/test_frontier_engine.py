@@ -0,0 +1,58 @@
+import time
+from pathlib import Path
+
+from src.io.container import load_container
+from src.pieces.compiled import compiled_library
+from src.solver.counting import SolutionCounter
+from src.solver.registry import available_engines, get_engine
+
+ROOT = Path(__file__).parent.parent
+SHAPE16 = str(ROOT / "data" / "containers" / "v1" / "16 cell container.fcc.json")
+SHAPE1 = str(ROOT / "data" / "containers" / "v1" / "Shape_1.fcc.json")
+
+
+
+def test_frontier_is_registered():
+    assert "frontier" in available_engines()
+    assert get_engine("frontier").name == "frontier"
+
+
+def test_frontier_count_matches_memoized_counter(one_each):
+    container = load_container(SHAPE16)
+    done = list(get_engine("frontier").solve(container, {"pieces": one_each}, {}, {"count_only": True}))[-1]
+    cells = [tuple(c) for c in container["coordinates"]]
+    expected = SolutionCounter(cells, compiled_library().orientations, one_each).count()
+    assert done["metrics"]["complete"]
+    assert done["metrics"]["solutions_total"] == done["metrics"]["solutions_unique"] == expected
+
+
+def test_frontier_witnesses_are_distinct_valid_solutions(slab):
+    container = slab(12)
+    inventory = {"pieces": {"A": 4, "E": 4, "D": 4}}
+    events = list(get_engine("frontier").solve(container, inventory, {}, {"max_results": 5}))
+    sols = [e["solution"] for e in events if e["type"] == "solution"]
+    done = events[-1]["metrics"]
+    assert len(sols) == done["solutions_found"] == min(5, done["solutions_total"]) > 0
+    want = sorted(map(tuple, container["coordinates"]))
+    keys = set()
+    for sol in sols:
+        covered = sorted(tuple(c) for p in sol["placements"] for c in p["cells_ijk"])
+        assert covered == want
+        assert all(n <= inventory["pieces"][p] for p, n in sol["piecesUsed"].items())
+        keys.add(frozenset((p["piece"], tuple(map(tuple, p["cells_ijk"]))) for p in sol["placements"]))
+    assert len(keys) == len(sols)
+    assert done["frontier_width"] < len(want)
+
+
+def test_frontier_state_cap_reports_incomplete(one_each, slab):
+    events = list(get_engine("frontier").solve(slab(12), {"pieces": one_each}, {},
+                                               {"count_only": True, "max_states": 1000}))
+    assert events[-1]["metrics"]["complete"] is False
+    assert events[-1]["metrics"]["stopped"] == "max_states"
+
+
+def test_frontier_time_limit_is_checked_within_a_position(one_each):
+    t0 = time.time()
+    done = list(get_engine("frontier").solve(load_container(SHAPE1), {"pieces": one_each}, {}, {"time_limit": 1}))[-1]
+    assert done["metrics"]["stopped"] == "time_limit"
+    assert time.time() - t0 < 2.5  # one position alone used to take several seconds here
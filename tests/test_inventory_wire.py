@@ -56,3 +56,10 @@ def test_cli_pieces_overrides_inventory(tmp_path):
 
     sol = json.loads(sol_path.read_text(encoding="utf-8"))
     assert sol["piecesUsed"] == {"A": 1, "C": 3}
+
+def test_resolve_inventory_precedence():
+    from src.io.inventory import resolve_inventory
+    inv_path = Path("tests/data/inventory.mini.json")
+    assert resolve_inventory("a=1, C=3", str(inv_path)) == {"A": 1, "C": 3}
+    assert resolve_inventory(None, str(inv_path)) == {k: int(v) for k, v in json.loads(inv_path.read_text())["pieces"].items()}
+    assert resolve_inventory() == {chr(ord('A') + i): 1 for i in range(25)}
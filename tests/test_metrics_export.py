@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+from src.io.container import load_container
+from src.reporting.metrics import MetricsCollector, prometheus_text
+from src.solver.registry import get_engine
+
+SHAPE16 = "data/containers/v1/16 cell container.fcc.json"
+
+
+def test_collector_sample_and_prometheus_text():
+    collector = MetricsCollector()
+    collector.start_collection()
+    collector.update({"nodes_explored": 500, "solutions_found": 1, "frontier_states": 7})
+    sample = collector.sample()
+    assert sample["nodes_explored"] == 500 and sample["frontier_states"] == 7
+    assert collector.metrics.first_solution_time is not None
+    collector.update({"nodes_explored": 500})
+    assert collector.sample()["nodes_per_second"] == 0.0  # nothing new since the last sample
+    text = prometheus_text(sample, {"engine": 'd"fs'})
+    assert '# TYPE ballpuzzle_nodes_explored_total counter' in text
+    assert 'ballpuzzle_nodes_explored_total{engine="d\\"fs"} 500' in text
+    assert 'ballpuzzle_frontier_states{engine="d\\"fs"} 7' in text
+    assert "ballpuzzle_ts" not in text
+
+
+@pytest.mark.parametrize("engine", ["dfs", "dlx", "frontier", "engine-c"])
+def test_engines_export_metrics(engine, tmp_path, one_each):
+    prom, jsonl = tmp_path / "solver.prom", tmp_path / "solver.jsonl"
+    options = {"metrics_prom": str(prom), "metrics_jsonl": str(jsonl), "metrics_interval_ms": 100,
+               "time_limit": 1, "seed": 2}
+    if engine == "engine-c":
+        from src.pieces.library_fcc_v1 import load_fcc_A_to_Y
+        from src.solver.engines.engine_c.api_adapter import EngineCAdapter
+        events = list(EngineCAdapter().solve(load_container(SHAPE16), {"pieces": one_each}, load_fcc_A_to_Y(), options))
+        nodes = events[-1]["metrics"]["nodes"]
+    else:
+        events = list(get_engine(engine).solve(load_container(SHAPE16), {"pieces": one_each}, {}, options))
+        nodes = events[-1]["metrics"]["nodes_explored"]
+    last = json.loads(jsonl.read_text().splitlines()[-1])
+    assert last["engine"] == engine and last["nodes_explored"] == nodes and last["rss_bytes"] >= 0
+    assert f'ballpuzzle_nodes_explored_total{{container="{last["container"]}",engine="{engine}"}} {nodes}' \
+        in prom.read_text()
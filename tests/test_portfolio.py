@@ -0,0 +1,40 @@
+import json
+from pathlib import Path
+
+from src.io.container import load_container
+from src.service.portfolio import DEFAULT_PORTFOLIO, build_members, load_portfolio, race
+from src.solver.registry import get_engine
+
+ROOT = Path(__file__).parent.parent
+SHAPE16 = str(ROOT / "data" / "containers" / "v1" / "16 cell container.fcc.json")
+INVENTORY = {"pieces": {chr(ord('A') + i): 1 for i in range(25)}}
+
+
+def test_build_members_cycles_configs_and_diversifies_seeds(tmp_path):
+    cfg = tmp_path / "portfolio.json"
+    cfg.write_text(json.dumps([{"engine": "dlx"}, {"engine": "dfs", "options": {"seed": 7, "hole_pruning": "lt4"}}]))
+    configs = load_portfolio(str(cfg))
+    members = build_members(configs, 4, {"seed": 100, "hole_pruning": "none"})
+    assert [m.engine for m in members] == ["dlx", "dfs", "dlx", "dfs"]
+    assert [m.options["seed"] for m in members] == [100, 7, 102, 8]
+    assert members[1].options["hole_pruning"] == "lt4" and members[0].options["hole_pruning"] == "none"
+    assert len(build_members(DEFAULT_PORTFOLIO, 0, {})) == 1
+
+
+def test_first_solution_wins_and_others_are_cancelled():
+    container = load_container(SHAPE16)
+    # DFS's final R6 gate rejects every packing of this container, so the DFS member
+    # cannot finish before its time limit: DLX wins deterministically
+    dfs_count = list(get_engine("dfs").solve(container, INVENTORY, {}, {"count_only": True}))[-1]["metrics"]
+    assert dfs_count["solutions_total"] == 0
+    members = build_members([{"engine": "dlx", "options": {}},
+                             {"engine": "dfs", "options": {"hole_pruning": "lt4"}}], 2, {"time_limit": 60})
+    events = list(race(container, INVENTORY, members, max_results=1))
+    solutions = [e for e in events if e["type"] == "solution"]
+    assert len(solutions) == 1 and solutions[0]["member"] == 0
+    done = events[-1]
+    assert done["type"] == "done"
+    report = done["metrics"]["portfolio"]
+    assert report["winner"]["engine"] == "dlx"
+    assert [m["status"] for m in report["members"]] == ["won", "cancelled"]
+    assert done["metrics"]["solutions_found"] == 1
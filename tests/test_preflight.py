@@ -0,0 +1,68 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.io.container import load_container
+from src.pieces.compiled import compiled_library
+from src.solver.counting import SolutionCounter
+from src.pieces.library_fcc_v1 import load_fcc_A_to_Y
+from src.solver.engines.engine_c.api_adapter import EngineCAdapter
+from src.solver.preflight import preflight
+from src.solver.registry import get_engine
+
+ROOT = Path(__file__).parent.parent
+SHAPE16 = str(ROOT / "data" / "containers" / "v1" / "16 cell container.fcc.json")
+LINE8 = [(0, 0, k) for k in range(8)]
+
+
+def test_real_containers_pass(one_each):
+    res = preflight(load_container(SHAPE16)["coordinates"], one_each)
+    assert res.feasible and res.checks[-1] == "colouring"
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_each_check_gives_its_reason(use_numpy, one_each):
+    def reason(cells, counts):
+        return preflight(cells, counts, use_numpy=use_numpy).reason
+    assert reason(LINE8[:6], one_each) == "size_not_multiple_of_4"
+    assert reason(LINE8, {"D": 1}) == "inventory_too_small"
+    assert reason([(0, 0, 0), (5, 5, 5), (6, 5, 5), (7, 5, 5)], one_each) == "uncoverable_cell"
+    assert preflight(LINE8, {"A": 2}, use_numpy=use_numpy).detail == \
+        preflight(LINE8, {"A": 2}, use_numpy=not use_numpy).detail
+    assert reason(LINE8, {"A": 2}) == "cell_needs_missing_piece"
+    two_sixes = [(0, 0, k) for k in range(6)] + [(9, 9, k) for k in range(6)]
+    assert reason(two_sixes, {"D": 3, "A": 3}) == "component_size"
+    assert reason(LINE8, {"D": 2}) is None
+
+
+def test_small_solve_does_not_import_numpy():
+    code = ("import sys; from src.solver.registry import get_engine; "
+            "c = {'cid_sha256': 'x', 'coordinates': [[0, 0, k] for k in range(8)]}; "
+            "list(get_engine('dfs').solve(c, {'pieces': {'D': 2}}, {}, {})); "
+            "print('numpy' in sys.modules)")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT, check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_colouring_parity_is_a_proof():
+    cells = [(0, 0, -1), (0, 1, -2), (0, 1, -1), (1, -2, 4), (1, -1, 2), (1, -1, 3),
+             (1, 1, -1), (2, -2, 2), (2, -1, 2), (2, -1, 3), (2, 0, 2), (3, -1, 2)]
+    res = preflight(cells, {"M": 3})
+    assert res.reason == "colouring_parity"
+    assert preflight(cells, {"M": 3}, use_numpy=True).detail == res.detail
+    assert res.checks == ["size", "inventory_total", "coverage", "components", "colouring"]
+    assert SolutionCounter(cells, compiled_library().orientations, {"M": 3}).count() == 0
+
+
+def test_engines_emit_done_with_infeasible_reason():
+    container = load_container(SHAPE16)
+    for name in ("dfs", "dlx", "frontier"):
+        events = list(get_engine(name).solve(container, {"pieces": {"A": 4}}, {}, {}))
+        assert [e["type"] for e in events] == ["done"]
+        assert events[0]["metrics"]["infeasible_reason"] == "cell_needs_missing_piece"
+        assert events[0]["metrics"]["solutions_found"] == 0
+    events = list(EngineCAdapter().solve(container, {"pieces": {"A": 4}}, load_fcc_A_to_Y(), {}))
+    assert [e["type"] for e in events] == ["done"]
+    assert events[0]["metrics"]["infeasible_reason"] == "cell_needs_missing_piece"
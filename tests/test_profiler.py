@@ -0,0 +1,44 @@
+import time
+
+import pytest
+
+from src.io.container import load_container
+from src.solver.profiler import NULL_PROFILER, PhaseProfiler
+from src.solver.registry import get_engine
+
+SHAPE16 = "data/containers/v1/16 cell container.fcc.json"
+
+
+def test_nested_phases_count_self_time_once():
+    prof = PhaseProfiler("t")
+    slow = prof.wrap("inner", lambda: time.sleep(0.02), depth=3)
+    with prof.phase("outer", 3):
+        time.sleep(0.01)
+        slow()
+        slow()
+    phases = prof.summary()["phases"]
+    assert phases["inner"]["calls"] == 2 and phases["outer"]["calls"] == 1
+    assert phases["inner"]["ms"] >= 40 and 10 <= phases["outer"]["ms"] < 40
+    stacks = dict(line.rsplit(" ", 1) for line in prof.collapsed())
+    assert set(stacks) == {"t;depth_3;outer", "t;depth_3;outer;inner"}
+
+
+def test_null_profiler_is_a_no_op():
+    fn = len
+    assert NULL_PROFILER.wrap("x", fn) is fn
+    with NULL_PROFILER.phase("x", 1):
+        pass
+    assert not NULL_PROFILER.enabled
+
+
+@pytest.mark.parametrize("engine", ["dfs", "dlx"])
+def test_engines_report_profile_and_write_collapsed_stacks(engine, tmp_path, one_each):
+    path = tmp_path / "profile.folded"
+    done = list(get_engine(engine).solve(load_container(SHAPE16), {"pieces": one_each}, {},
+                                         {"profile_path": str(path), "time_limit": 1}))[-1]
+    prof = done["metrics"]["profile"]
+    assert prof["phases"] and prof["wall_ms"] >= prof["unattributed_ms"]
+    lines = path.read_text().splitlines()
+    assert lines and all(line.startswith(f"{engine};depth_") for line in lines)
+    plain = list(get_engine(engine).solve(load_container(SHAPE16), {"pieces": one_each}, {}, {"time_limit": 1}))[-1]
+    assert "profile" not in plain["metrics"]
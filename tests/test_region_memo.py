@@ -0,0 +1,61 @@
+import sqlite3
+
+from src.coords.symmetry_fcc import ROTATIONS_24, apply_rot
+from src.pieces.compiled import compiled_library
+from src.solver.counting import SolutionCounter
+from src.solver.region_memo import RegionMemo, canonical_region
+from src.solver.registry import get_engine
+
+SLAB8 = [(i, j, k) for i in range(2) for j in range(2) for k in range(8)]
+
+
+def test_canonical_region_is_rotation_and_translation_invariant():
+    base = canonical_region(SLAB8)
+    for R in ROTATIONS_24:
+        moved = [tuple(a + b for a, b in zip(apply_rot(R, c), (5, -2, 9))) for c in SLAB8]
+        assert canonical_region(moved) == base
+
+
+def test_memo_matches_counter_and_hits_for_rotated_regions(tmp_path):
+    lib = compiled_library()
+    memo = RegionMemo(lib.orientations, str(tmp_path / "regions.sqlite"))
+    for inv in ({"A": 2, "E": 2, "D": 2}, {"C": 4}, {"M": 4}):
+        expected = SolutionCounter(SLAB8, lib.orientations, inv).count() > 0
+        assert memo.solvable(SLAB8, inv) is expected
+        rotated = [apply_rot(ROTATIONS_24[7], c) for c in SLAB8]
+        assert memo.solvable(rotated, dict(inv, Z=0)) is expected
+    assert memo.solved == 3 and memo.hits == 3
+    memo.close()
+
+    again = RegionMemo(lib.orientations, str(tmp_path / "regions.sqlite"))
+    assert again.solvable(SLAB8, {"C": 4}) is (SolutionCounter(SLAB8, lib.orientations, {"C": 4}).count() > 0)
+    assert again.disk_hits == 1 and again.solved == 0
+    again.close()
+
+
+def test_engines_report_solvability_metrics(slab):
+    for name in ("dfs", "dlx"):
+        done = list(get_engine(name).solve(slab(12), {"pieces": {"A": 4, "E": 4, "D": 4}}, {},
+                                           {"region_memo": True, "region_memo_cells": 16, "time_limit": 2}))[-1]
+        m = done["metrics"]
+        assert m["solvability_lookups"] > 0
+        assert m["solvability_lookups"] >= m["solvability_hits"] + m["solvability_solved"]
+
+
+def test_memo_file_is_keyed_by_library_and_survives_abandoned_solves(tmp_path, slab):
+    lib = compiled_library()
+    path = str(tmp_path / "regions.sqlite")
+    with RegionMemo(lib.orientations, path, digest=lib.digest) as memo:
+        assert memo.solvable(SLAB8, {"C": 4}) is not None
+    with RegionMemo(lib.orientations, path, digest="other") as other:
+        other.solvable(SLAB8, {"C": 4})
+        assert other.disk_hits == 0 and other.solved == 1
+
+    for name in ("dfs", "dlx"):
+        stored = str(tmp_path / f"{name}.sqlite")
+        events = get_engine(name).solve(slab(4), {"pieces": {"D": 4}}, {},
+                                        {"region_memo_path": stored, "region_memo_cells": 16, "max_results": 100})
+        assert next(events)["type"] == "solution"
+        events.close()  # abandoned before done, after fewer than 100 solves: nothing committed yet
+        with sqlite3.connect(stored) as db:
+            assert db.execute("SELECT COUNT(*) FROM solvability WHERE library = ?", (lib.digest,)).fetchone()[0] > 0
@@ -0,0 +1,40 @@
+from src.pieces.compiled import compiled_library
+from src.solver.components import RegionTilings
+from src.solver.engines.dfs_engine import _connected_r6
+from src.solver.region_shapes import ShapeIndex, normalize
+from src.solver.registry import get_engine
+
+LINE4 = [(3, 1, k) for k in range(5, 9)]
+CUBE = [(i, j, k) for i in range(2) for j in range(2) for k in range(2)]
+
+
+def _r6(ori):
+    return _connected_r6(list(map(tuple, ori)))
+
+
+def test_four_cell_lookup_against_bag():
+    index = ShapeIndex(compiled_library().orientations, keep=_r6)
+    assert index.four[normalize(LINE4)] == {"D"}
+    assert index.fillable(LINE4, {"D": 1})
+    assert not index.fillable(LINE4, {"A": 3, "D": 0})
+    assert index.fillable(LINE4 + [(3, 1, 9)], {})  # sizes other than 4 and 8 are not judged
+
+
+def test_pair_table_matches_exhaustive_tilings():
+    lib = compiled_library()
+    index = ShapeIndex(lib.orientations, keep=_r6)
+    regions = RegionTilings(lib.orientations, {p: 2 for p in lib.names},
+                            placement_filter=lambda r: _connected_r6(list(r[3])))
+    for cells in (CUBE, [(0, j, k) for j in range(2) for k in range(4)]):
+        usages = regions.tilings(cells, tuple(2 for _ in regions.pieces))
+        expected = {tuple(p for p, n in zip(regions.pieces, u) for _ in range(n)) for u in usages}
+        assert index.pair_fills(normalize(cells)) == expected
+    assert index.fillable(CUBE, {"F": 2}) and index.fillable(CUBE, {"L": 1, "W": 1})
+    assert not index.fillable(CUBE, {"A": 8}) and not index.fillable(CUBE, {"F": 1})
+
+
+def test_dfs_shape_mode_reports_prunes(slab):
+    done = list(get_engine("dfs").solve(slab(12), {"pieces": {"C": 6, "W": 6}}, {},
+                                        {"hole_pruning": "shape", "time_limit": 1, "preflight": False}))[-1]
+    assert done["metrics"]["shape_prunes"] > 0
+    assert done["metrics"]["shape_pairs_cached"] > 0
@@ -0,0 +1,61 @@
+import json, time
+from pathlib import Path
+
+from src.io.container import load_container
+from src.pieces.library_fcc_v1 import load_fcc_A_to_Y
+from src.service.batch import (BatchJob, expand_matrix, finished_job_ids, job_id,
+                               order_jobs, predicted_difficulty, run_batch)
+
+ROOT = Path(__file__).parent.parent
+SHAPE16 = str(ROOT / "data" / "containers" / "v1" / "16 cell container.fcc.json")
+SHAPE100 = str(ROOT / "data" / "containers" / "v1" / "Shape_3.fcc.json")
+INVENTORY = {"pieces": {chr(ord('A') + i): 1 for i in range(25)}}
+
+
+def _jobs(path, variants):
+    container = load_container(path)
+    return [BatchJob(id=job_id(container, e, o, INVENTORY), path=path, container=container,
+                     engine=e, options=o, inventory=INVENTORY) for e, o in variants]
+
+
+def test_expand_matrix_product():
+    variants = expand_matrix(["dfs", "dlx"], ["seed=1,2", "hole_pruning=none,lt4"], {"time_limit": 5})
+    assert len(variants) == 8
+    assert variants[0] == ("dfs", {"time_limit": 5, "seed": 1, "hole_pruning": "none"})
+    assert len({job_id({"cid": "x"}, e, o, INVENTORY) for e, o in variants}) == 8
+
+
+def test_ordering_largest_and_difficulty():
+    small, large = _jobs(SHAPE16, [("dlx", {})]) + _jobs(SHAPE100, [("dlx", {})])
+    assert [j.cells for j in order_jobs([small, large], "largest")] == [100, 16]
+    lib = load_fcc_A_to_Y()
+    pieces = INVENTORY["pieces"]
+    small.difficulty = predicted_difficulty(small.container, lib, pieces)
+    large.difficulty = predicted_difficulty(large.container, lib, pieces)
+    assert order_jobs([small, large], "difficulty")[0] is large
+
+
+def test_batch_writes_results_and_resumes(tmp_path):
+    results = str(tmp_path / "results.jsonl")
+    jobs = _jobs(SHAPE16, [("dlx", {"seed": 1, "max_results": 1, "time_limit": 20}),
+                           ("dlx", {"seed": 2, "max_results": 1, "time_limit": 20})])
+    summary = run_batch(jobs, results, workers=2)
+    assert summary["done"] == 2
+    records = [json.loads(line) for line in open(results, encoding="utf-8")]
+    assert {r["job"] for r in records} == {j.id for j in jobs}
+    assert all(r["status"] == "done" and r["solutions_found"] == 1 for r in records)
+    assert finished_job_ids(results) == {j.id for j in jobs}
+
+    again = run_batch(jobs, results, workers=2)
+    assert again["skipped"] == 2 and again["done"] == 0
+    assert len(open(results, encoding="utf-8").readlines()) == 2
+
+
+def test_batch_budget_cuts_running_and_queued_jobs(tmp_path):
+    results = str(tmp_path / "results.jsonl")
+    jobs = _jobs(SHAPE100, [("dfs", {"seed": 1}), ("dfs", {"seed": 2})])
+    t0 = time.time()
+    summary = run_batch(jobs, results, workers=1, budget_s=1.0)
+    assert time.time() - t0 < 15
+    assert summary["budget"] == 1 and summary["not_started"] == 1
+    assert finished_job_ids(results) == set()  # budget-cut jobs are re-run on resume
@@ -0,0 +1,58 @@
+from src.pieces.compiled import compiled_library
+from src.solver.components import RegionTilings, empty_components, split_fills
+from src.solver.registry import get_engine
+
+
+def _block(origin, length):
+    return [(origin[0] + i, origin[1] + j, origin[2] + k) for i in range(2) for j in range(2) for k in range(length)]
+
+
+def test_empty_components_smallest_first():
+    # cells 0-1-2 in a line, 3 alone, 4-5 paired
+    neighbours = [0b10, 0b101, 0b10, 0, 0b100000, 0b10000]
+    assert empty_components(0b111111, neighbours) == [0b1000, 0b110000, 0b111]
+    assert empty_components(0b101101, neighbours) == [0b1, 0b100, 0b1000, 0b100000]
+
+
+def test_region_tilings_are_memoized_by_shape():
+    regions = RegionTilings(compiled_library().orientations, {p: 2 for p in "ABCDEFKL"})
+    bag = tuple(2 for _ in regions.pieces)
+    here = regions.tilings(_block((0, 0, 0), 4), bag)
+    there = regions.tilings(_block((7, -3, 5), 4), bag)
+    assert here and set(here) == set(there)
+    assert regions.solved == 1 and regions.hits == 1
+    for usage, found in there.items():
+        (rows,) = found
+        assert sorted(c for r in rows for c in r[3]) == sorted(_block((7, -3, 5), 4))
+        assert sum(usage) == len(rows) == 4
+    fills = list(split_fills([_block((0, 0, 0), 4), _block((7, -3, 5), 4)], bag, regions))
+    assert fills and all(max(u) <= 2 and sum(u) == 8 for u, _ in fills)
+    assert len({u for u, _ in fills}) == len(fills)
+
+
+def test_dfs_solves_disconnected_container_by_parts(one_each):
+    cells = _block((0, 0, 0), 4) + _block((10, 10, 10), 4)
+    container = {"cid_sha256": "two_blocks", "coordinates": [list(c) for c in cells]}
+    events = list(get_engine("dfs").solve(container, {"pieces": one_each}, {},
+                                          {"split_components": True, "time_limit": 30}))
+    sols = [e["solution"] for e in events if e["type"] == "solution"]
+    done = events[-1]["metrics"]
+    assert len(sols) == 1 and done["split_nodes"] >= 1
+    covered = sorted(tuple(c) for p in sols[0]["placements"] for c in p["cells_ijk"])
+    assert covered == sorted(cells)
+    assert all(n == 1 for n in sols[0]["piecesUsed"].values())
+
+
+def test_split_mode_finds_the_same_solutions():
+    cells = _block((0, 0, 0), 4) + _block((10, 0, 0), 4)
+    container = {"cid_sha256": "two_blocks", "coordinates": [list(c) for c in cells]}
+
+    def distinct(split):
+        return {frozenset((p["piece"], tuple(sorted(map(tuple, p["cells_ijk"])))) for p in ev["solution"]["placements"])
+                for ev in get_engine("dfs").solve(container, {"pieces": {p: 2 for p in "CFLY"}}, {},
+                                                  {"max_results": 50, "pivot_cycle": False,
+                                                   "split_components": split})
+                if ev["type"] == "solution"}
+
+    plain = distinct(False)
+    assert len(plain) > 1 and distinct(True) == plain
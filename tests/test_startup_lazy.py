@@ -0,0 +1,69 @@
+import json, subprocess, sys
+from pathlib import Path
+
+import pytest
+from jsonschema import ValidationError
+
+from src.io.schema import validate_instance, get_validator
+from src.io.schema.compiled import FAST_CHECKS
+from src.solver.registry import get_engine, available_engines
+
+ROOT = Path(__file__).parent.parent
+SHAPE = ROOT / "data" / "containers" / "v1" / "16 cell container.fcc.json"
+
+
+def test_cli_import_is_lazy():
+    """Importing the CLI must not pull in NumPy, jsonschema or any engine."""
+    code = (
+        "import sys, cli.solve; "
+        "mods = ['numpy', 'jsonschema', 'src.solver.engines.dfs_engine', 'src.solver.engines.dlx_engine']; "
+        "print([m for m in mods if m in sys.modules])"
+    )
+    out = subprocess.check_output([sys.executable, "-c", code], cwd=ROOT, text=True)
+    assert out.strip() == "[]"
+
+
+def test_registry_resolves_and_caches():
+    assert {"dfs", "dlx"} <= set(available_engines())
+    eng = get_engine("dfs")
+    assert eng.name == "dfs"
+    assert get_engine("dfs") is eng
+    with pytest.raises(SystemExit):
+        get_engine("nope")
+
+
+def test_fast_container_check_matches_schema():
+    data = json.loads(SHAPE.read_text(encoding="utf-8"))
+    assert FAST_CHECKS["container.schema.json"](data)
+    get_validator("container.schema.json").validate(data)
+
+    bad = dict(data, cells=[[0, 0]])
+    assert not FAST_CHECKS["container.schema.json"](bad)
+    with pytest.raises(ValidationError):
+        validate_instance("container.schema.json", bad)
+
+
+def test_fast_event_check_falls_back_for_errors():
+    ok = {"v": 1, "t_ms": 5, "type": "done", "metrics": {}}
+    validate_instance("snapshot.schema.json", ok)
+    with pytest.raises(ValidationError):
+        validate_instance("snapshot.schema.json", {"v": 1, "t_ms": -1, "type": "done"})
+    with pytest.raises(ValidationError):
+        validate_instance("snapshot.schema.json", {"v": 1, "t_ms": 0, "type": "bogus"})
+
+
+def test_fast_inventory_check():
+    validate_instance("inventory.schema.json", {"pieces": {"A": 1, "B": 0}})
+    with pytest.raises(ValidationError):
+        validate_instance("inventory.schema.json", {"pieces": {"AA": 1}})
+
+
+def test_startup_profile_flag(tmp_path):
+    res = subprocess.run([
+        sys.executable, "-m", "cli.solve", str(SHAPE), "--engine", "dlx",
+        "--eventlog", str(tmp_path / "e.jsonl"), "--solution", str(tmp_path / "s.json"),
+        "--time-limit", "5", "--startup-profile",
+    ], cwd=ROOT, capture_output=True, text=True)
+    assert res.returncode == 0, res.stderr
+    assert "[startup] load container" in res.stderr
+    assert "[startup] total" in res.stderr
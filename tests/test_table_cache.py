@@ -0,0 +1,30 @@
+from pathlib import Path
+
+from src.io.container import load_container
+from src.pieces.library_fcc_v1 import load_fcc_A_to_Y
+from src.solver.registry import get_engine
+from src.solver.table_cache import TableCache
+
+ROOT = Path(__file__).parent.parent
+SHAPE16 = str(ROOT / "data" / "containers" / "v1" / "16 cell container.fcc.json")
+
+
+def test_repeated_solves_reuse_container_tables(one_each):
+    container = load_container(SHAPE16)
+    pieces = load_fcc_A_to_Y()
+    cache = TableCache(max_containers=1)
+    runs = [("dfs", {"target_policy": "coverage", "time_limit": 2}), ("frontier", {}), ("engine-c", {})]
+
+    def solutions(engine, options):
+        events = get_engine(engine).solve(container, {"pieces": one_each}, pieces,
+                                          dict(options, seed=3, table_cache=cache))
+        return [e["solution"]["placements"] for e in events if e["type"] == "solution"]
+
+    first = [solutions(e, o) for e, o in runs]
+    misses = cache.misses
+    assert misses >= 4 and cache.hits >= 2  # the preflight result is shared by all three engines
+    assert [solutions(e, o) for e, o in runs] == first
+    assert cache.misses == misses
+    get_engine("frontier").solve(dict(container, cid_sha256="other"), {"pieces": one_each}, pieces,
+                                 {"table_cache": cache}).__next__()
+    assert len(cache) == 1
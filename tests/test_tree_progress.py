@@ -0,0 +1,37 @@
+import pytest
+
+from src.solver.registry import get_engine
+from src.solver.tree_progress import SubtreeProgress
+
+
+
+def test_mixed_radix_fraction_and_eta():
+    p = SubtreeProgress(3)
+    assert p.fraction() == 0.0 and p.eta_ms(1000) is None
+    p.branch(0, 4)
+    p.at(0, 1)          # one of four root children done
+    p.branch(1, 2)
+    p.at(1, 1)          # plus half of the second
+    assert p.fraction() == pytest.approx(0.25 + 0.125)
+    p.at(0, 2)          # back at the root: deeper levels no longer count
+    assert p.fraction() == pytest.approx(0.5)
+    assert p.eta_ms(1000) == 1000
+    p.at(0, 4)
+    assert p.fraction() == 1.0 and p.eta_ms(1000) == 0
+
+
+@pytest.mark.parametrize("engine", ["dfs", "dlx"])
+def test_exhausted_search_reports_full_progress(engine, slab):
+    done = list(get_engine(engine).solve(slab(4), {"pieces": {"M": 4}}, {},
+                                         {"max_results": 1000, "pivot_cycle": False}))[-1]
+    assert done["metrics"]["progress"] == 1.0
+
+
+def test_dfs_progress_partial_when_stopped_early(slab):
+    events = list(get_engine("dfs").solve(slab(4), {"pieces": {"M": 4}}, {},
+                                          {"max_results": 2, "pivot_cycle": False, "progress_interval_ms": 1}))
+    assert 0.0 < events[-1]["metrics"]["progress"] < 1.0
+    ticks = [ev["metrics"] for ev in events if ev["type"] == "tick"]
+    assert ticks and all(0.0 <= t["progress"] <= 1.0 for t in ticks)
+    fractions = [t["progress"] for t in ticks]
+    assert fractions == sorted(fractions)
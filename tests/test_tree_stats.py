@@ -0,0 +1,42 @@
+import pytest
+
+from src.io.container import load_container
+from src.solver.registry import get_engine
+from src.solver.tree_stats import TreeStats, render
+
+SHAPE16 = "data/containers/v1/16 cell container.fcc.json"
+
+
+def test_to_dict_trims_and_reports_branching():
+    tree = TreeStats(4)
+    tree.nodes[:3] = [1, 4, 6]
+    tree.generated[:2] = [5, 9]
+    tree.tried[:2] = [4, 6]
+    tree.prune("overlap", 0, 7)
+    tree.prune("hole", 2)
+    d = tree.to_dict()
+    assert d["nodes"] == [1, 4, 6] and d["generated"] == [5, 9, 0]
+    assert d["branching"] == [4.0, 1.5, 0.0]
+    assert d["prunes"] == {"hole": [0, 0, 1], "overlap": [7, 0, 0]}
+    text = render([d, d], ["a", "b"])
+    assert "a:nodes" in text and "b:overlap" in text and "total" in text
+
+
+@pytest.mark.parametrize("engine", ["dfs", "dlx"])
+def test_engine_tree_stats_are_consistent(engine, one_each):
+    done = list(get_engine(engine).solve(load_container(SHAPE16), {"pieces": one_each}, {},
+                                         {"tree_stats": True, "time_limit": 1}))[-1]
+    m = done["metrics"]
+    stats = m["tree_stats"]
+    assert sum(stats["nodes"]) == m["nodes_explored"]
+    assert all(t <= g for t, g in zip(stats["tried"], stats["generated"]))
+    assert stats["prunes"]
+
+
+def test_dfs_ticks_carry_tree_stats(one_each):
+    events = list(get_engine("dfs").solve(load_container(SHAPE16), {"pieces": one_each}, {},
+                                          {"tree_stats": True, "time_limit": 1, "progress_interval_ms": 100}))
+    ticks = [ev for ev in events if ev["type"] == "tick"]
+    assert ticks and all("tree_stats" in ev["metrics"] for ev in ticks)
+    assert "tree_stats" not in list(get_engine("dfs").solve(load_container(SHAPE16), {"pieces": one_each}, {},
+                                                            {"time_limit": 1}))[-1]["metrics"]
@@ -0,0 +1,65 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from src.io.container import load_container
+from src.solver.registry import get_engine
+from src.solver.verify import ContainerVerifier, index_containers, iter_stored_solutions, verify_many
+
+CELLS = [[i, j, k] for i in range(2) for j in range(2) for k in range(4)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    cpath = tmp_path / "slab.fcc.json"
+    cpath.write_text(json.dumps({"version": "1.0", "lattice": "fcc", "cells": CELLS, "cid": "sha256:" + "0" * 64,
+                                 "designer": {"name": "test", "date": "2025-01-01"}}))
+    container = load_container(str(cpath))
+    sols = [ev["solution"] for ev in get_engine("dfs").solve(container, {"pieces": {"M": 4}}, {},
+                                                            {"max_results": 3, "pivot_cycle": False})
+            if ev["type"] == "solution"]
+    return cpath, container, sols
+
+
+def test_verifier_reports_each_failure(store):
+    _cpath, container, sols = store
+    v = ContainerVerifier(container)
+    good = sols[0]
+    assert v.check(good) is None
+    pl = good["placements"]
+    assert v.check(dict(good, placements=pl + pl[:1])).startswith("overlap at")
+    assert v.check(dict(good, placements=pl[1:])).startswith("missing cells:")
+    assert v.check(dict(good, sid_state_canon_sha256="x")).startswith("canonical sid mismatch")
+    assert v.check(dict(good, placements=[dict(pl[0], t=[9, 9, 9])])).startswith("cell (")
+    assert v.check(dict(good, containerCidSha256="other")).startswith("container cid mismatch")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_verify_many_over_jsonl_store(store, tmp_path, workers):
+    cpath, _container, sols = store
+    lines = [dict(s) for s in sols] * 4 + [dict(sols[0], placements=sols[0]["placements"][1:])]
+    lines.append({"container": str(cpath), "status": "done", "solutions": sols})  # solve-batch record
+    path = tmp_path / "store.jsonl"
+    path.write_text("".join(json.dumps(s) + "\n" for s in lines))
+    results = list(verify_many(iter_stored_solutions(str(path)), index_containers([str(cpath)]),
+                               workers=workers, chunk=5))
+    assert len(results) == 4 * len(sols) + 1 + len(sols)
+    failed = [r for r in results if not r["ok"]]
+    assert [r["source"] for r in failed] == [f"{path}:{4 * len(sols) + 1}"]
+
+
+def test_cli_batch_over_directory(store, tmp_path):
+    cpath, _container, sols = store
+    d = tmp_path / "solutions"
+    d.mkdir()
+    for i, s in enumerate(sols):
+        (d / f"s{i}.json").write_text(json.dumps(s))
+    (d / "bad.json").write_text(json.dumps(dict(sols[0], containerCidSha256="unknown")))
+    r = subprocess.run([sys.executable, "-m", "cli.verify", "--batch", str(d), "--containers", str(cpath),
+                        "--workers", "1", "--failures-only"], capture_output=True, text=True)
+    assert r.returncode == 2
+    report = [json.loads(line) for line in r.stdout.splitlines()]
+    assert len(report) == 1 and report[0]["error"] == "container not found"
+    assert f"{len(sols) + 1} solutions: {len(sols)} ok, 1 failed" in r.stderr
@@ -17,6 +17,29 @@ function formatDuration(ms: number): string {
   return `${seconds}s`;
 }
 
+function formatEta(ms: number): string {
+  const s = Math.round(ms / 1000);
+  if (s < 120) return `${s}s`;
+  if (s < 7200) return `${Math.round(s / 60)}min`;
+  if (s < 172800) return `${(s / 3600).toFixed(1)}h`;
+  return `${(s / 86400).toFixed(1)}d`;
+}
+
+function ProgressBar({ fraction, etaMs }: { fraction: number; etaMs?: number | null }) {
+  const pct = Math.min(100, Math.max(0, fraction * 100));
+  return (
+    <div className="status-progress" style={{ margin: '12px 0' }}>
+      <div style={{ display: 'flex', justifyContent: 'space-between', fontSize: '0.75rem', opacity: 0.75 }}>
+        <span>Search tree {pct < 1 ? pct.toFixed(3) : pct.toFixed(1)}% done</span>
+        <span>{etaMs != null ? `ETA ${formatEta(etaMs)}` : 'ETA —'}</span>
+      </div>
+      <div style={{ height: 6, borderRadius: 3, background: 'rgba(127,127,127,.25)', overflow: 'hidden' }}>
+        <div style={{ width: `${pct}%`, height: '100%', background: '#4caf50' }} />
+      </div>
+    </div>
+  );
+}
+
 export default function StatusPanel() {
   const { data, error, lastOkAt } = useStatus();
   
@@ -48,6 +71,8 @@ export default function StatusPanel() {
         <KPI label="Phase" value={data ? data.phase : "—"} />
       </div>
 
+      {data.metrics.progress != null && <ProgressBar fraction={data.metrics.progress} etaMs={data.metrics.eta_ms} />}
+
       <div className="meta">
         <div>Container: <code title={data.container.cid}>{data.container.cid.length > 20 ? data.container.cid.substring(0, 20) + '...' : data.container.cid}</code> ({data.container.cells} cells)</div>
         <div>Run ID: <code>{data.run_id}</code></div>
@@ -20,6 +20,8 @@ export interface Metrics {
   solutions: number;
   elapsed_ms: number;
   best_depth?: number;
+  progress?: number;   // completed fraction of the search tree, 0..1
+  eta_ms?: number;
 }
 
 export interface ContainerInfo {